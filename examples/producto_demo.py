@@ -0,0 +1,88 @@
+"""
+Ejemplo de uso de la clase Producto: pre-procesamiento de los campos leídos del CSV
+y construcción de productos. Ejecutar desde la raíz del proyecto:
+
+    python examples/producto_demo.py
+"""
+import sys
+from pathlib import Path
+
+root_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(root_dir))
+
+from datetime import time
+from decimal import Decimal
+
+from src.modelos.producto import Producto
+
+
+if __name__ == '__main__':
+    try:
+        # Para instanciar Producto ahora, se necesita pre-procesar algunos datos
+
+        # Pre-procesamiento para producto1
+        hm1_str = "21:49.2"
+        ea1_str = "Unknown"
+        
+        hm1_obj = Producto._parse_modify_date_str(hm1_str)
+        ea1_bool = Producto._parse_es_alergenico_str(ea1_str)
+
+        producto1 = Producto(
+            id_producto=1,
+            nombre_producto="Flour - Whole Wheat".strip(), # Asegurar que está limpio
+            precio="74.2988", 
+            id_categoria=3, # Asumir validado
+            clase_producto="Medium", # Asumir validado
+            hora_modificacion=hm1_obj, # Pasar objeto time
+            resistente="Durable", # Asumir validado
+            es_alergenico=ea1_bool, # Pasar bool|None
+            dias_vitalidad=0
+        )
+        print(producto1)
+        print(producto1.obtener_descripcion_detallada())
+        print(repr(producto1))
+
+        # Pre-procesamiento para producto2
+        hm2_obj = time(0, 13, 35, 400000) # Ya es un objeto time
+        ea2_bool = True # Ya es un booleano
+
+        producto2 = Producto(
+            id_producto=5,
+            nombre_producto="Artichokes - Jerusalem".strip(),
+            precio=Decimal('65.4771'), 
+            id_categoria=2,
+            clase_producto="Low",
+            hora_modificacion=hm2_obj,
+            resistente="Durable",
+            es_alergenico=ea2_bool,
+            dias_vitalidad=27
+        )
+        print(producto2)
+        print(producto2.obtener_descripcion_detallada())
+        
+        # Pre-procesamiento para producto_clase_precio
+        hm3_str = "23:48.2"
+        ea3_str = "TRUE"
+        hm3_obj = Producto._parse_modify_date_str(hm3_str)
+        ea3_bool = Producto._parse_es_alergenico_str(ea3_str)
+
+        producto_clase_precio = Producto(
+             id_producto=28,
+             nombre_producto="Sobe - Tropical Energy".strip(),
+             precio="12.3153",
+             id_categoria=9,
+             clase_producto="High", 
+             hora_modificacion=hm3_obj,
+             resistente="Durable",
+             es_alergenico=ea3_bool,
+             dias_vitalidad=0
+        )
+        print(producto_clase_precio.obtener_descripcion_detallada())
+
+        print("\nProbando hora_modificacion con solo segundos:")
+        p_test_time = Producto(1000, "Test Time", "10", 1, hora_modificacion=Producto._parse_modify_date_str("15:30"))
+        print(p_test_time.obtener_descripcion_detallada())
+        assert p_test_time.hora_modificacion == time(0, 15, 30, 0)
+
+    except (TypeError, ValueError) as e:
+        print(f"\nError durante la creación del producto o prueba: {e}")
@@ -1,11 +1,22 @@
-import pymysql
 from sqlalchemy import create_engine, text 
+import asyncio
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+import importlib
+import importlib.util
+import logging
 import os
+import re
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
 import pandas as pd
 from datetime import datetime
-import psutil
+from functools import cache, lru_cache
+
+# mysqlclient (MySQLdb) se detecta sin importarlo; SQLAlchemy carga el driver al crear el motor
+DRIVER_MYSQL_POR_DEFECTO = 'mysqldb' if importlib.util.find_spec('MySQLdb') else 'pymysql'
 
 from src.utils.sistema_logging import (
     ConfiguradorLogging,
@@ -14,7 +25,72 @@ from src.utils.sistema_logging import (
     RegistradorEstadisticas,
     ManejadorErrores
 )
-from src.utils.cache_consultas import GestorCacheConsultas, cache_consulta
+from src.utils.cache_consultas import GestorCacheConsultas, cache_consulta, _tablas_de_escritura
+
+# Sentencias que modifican datos o esquema y, por tanto, dejan obsoletos los resultados cacheados.
+# LOAD cubre LOAD DATA; CALL se incluye porque un procedimiento almacenado puede escribir cualquier tabla
+VERBOS_ESCRITURA = frozenset({'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'TRUNCATE', 'DROP', 'ALTER', 'LOAD', 'CALL'})
+
+# Intervalo del muestreo de métricas del sistema, que corre en un hilo aparte de las consultas
+INTERVALO_METRICAS_SEGUNDOS = 5.0
+
+# Vigencia de la última instantánea de obtener_estadisticas_completas para sondeos muy seguidos
+VIGENCIA_ESTADISTICAS_SEGUNDOS = 2.0
+
+# Solo se inspecciona el primer token; evita partir consultas de varios KB en una lista de palabras
+_PATRON_VERBO_SQL = re.compile(r"\s*(\w+)")
+# Tras un WITH se recorren paréntesis y verbos para hallar la sentencia principal fuera de los CTE
+_PATRON_VERBO_PRINCIPAL = re.compile(r"[()]|\b(?:SELECT|INSERT|UPDATE|DELETE|REPLACE)\b", re.IGNORECASE)
+
+
+# Las consultas suelen repetirse literalmente; el hash del str queda cacheado en el propio objeto
+@lru_cache(maxsize=512)
+def _verbo_sql(consulta_sql: str) -> str:
+    coincidencia = _PATRON_VERBO_SQL.match(consulta_sql)
+    if not coincidencia:
+        return ''
+    verbo = coincidencia.group(1).upper()
+    if verbo == 'WITH':
+        profundidad = 0
+        for token in _PATRON_VERBO_PRINCIPAL.finditer(consulta_sql, coincidencia.end()):
+            texto = token.group(0)
+            if texto == '(':
+                profundidad += 1
+            elif texto == ')':
+                profundidad -= 1
+            elif profundidad == 0:
+                return texto.upper()
+    return verbo
+
+
+@lru_cache(maxsize=None)
+def _modulo_opcional(nombre_modulo: str):
+    """
+    Importa bajo demanda una dependencia opcional y pesada (connectorx, pyarrow, psutil, orjson).
+    Retorna None si no está instalada. El resultado queda cacheado, por lo que el costo
+    de importación solo se paga la primera vez que realmente se necesita.
+    """
+    try:
+        return importlib.import_module(nombre_modulo)
+    except ImportError:
+        return None
+
+
+# Mismo criterio que usa text() de SQLAlchemy para reconocer parámetros ligados ":nombre"
+_PATRON_PARAMETRO_LIGADO = re.compile(r"(?<![:\w\\]):\w+(?!:)")
+
+
+@lru_cache(maxsize=256)
+def _sentencia_compilada(consulta_sql: str):
+    """
+    Devuelve el TextClause de SQLAlchemy para una consulta, reutilizando el ya construido
+    para textos repetidos. Así SQLAlchemy también reaprovecha su cache de compilación.
+    Retorna None si el texto contiene algo con forma de ":nombre" (p. ej. dentro de un literal
+    'hora :fin'), que text() tomaría como parámetro; esas consultas se envían crudas al driver.
+    """
+    if _PATRON_PARAMETRO_LIGADO.search(consulta_sql):
+        return None
+    return text(consulta_sql)
 
 
 class ConexionBD:
@@ -25,29 +101,52 @@ class ConexionBD:
     __instancia = None
     __motor = None
     __sesion = None
+    __fabrica_sesiones = None
+    __uri_connectorx = None
     __contador_consultas = 0
+    __proceso = None
+    __version_servidor = None
+    __limite_memoria_alerta_mb = 500
+    __estadisticas_memorizadas = None
+    __momento_estadisticas = 0.0
+
+    __lock = threading.Lock()
 
     def __new__(cls):
+        # Doble verificación: el camino rápido no toma el lock una vez creada la instancia.
         if cls.__instancia is None:
-            cls.__instancia = super(ConexionBD, cls).__new__(cls)
-            cls.__instancia.logger = ConfiguradorLogging.obtener_logger("ConexionBD")
-            cls.__instancia.estadisticas = RegistradorEstadisticas()
-            cls.__instancia.manejador_errores = ManejadorErrores("ConexionBD")
-            cls.__instancia.gestor_cache = GestorCacheConsultas()
-            cls.__instancia.__inicializar_conexion()
+            with cls.__lock:
+                if cls.__instancia is None:
+                    instancia = super(ConexionBD, cls).__new__(cls)
+                    instancia.logger = ConfiguradorLogging.obtener_logger("ConexionBD")
+                    instancia.estadisticas = RegistradorEstadisticas()
+                    instancia.manejador_errores = ManejadorErrores("ConexionBD")
+                    instancia.gestor_cache = GestorCacheConsultas()
+                    psutil = _modulo_opcional('psutil')
+                    if psutil is not None:
+                        instancia.__proceso = psutil.Process()
+                        # La primera lectura no bloqueante de cpu_percent solo fija la referencia de muestreo
+                        instancia.__proceso.cpu_percent(interval=None)
+                    instancia.__inicializar_conexion()
+                    # Publicar solo tras completar la inicialización para no exponer instancias a medio construir
+                    cls.__instancia = instancia
         return cls.__instancia
 
     @registrar_operacion("inicialización de conexión a base de datos")
     def __inicializar_conexion(self):
         try:
-            load_dotenv()
-            self.logger.debug("Variables de entorno cargadas desde .env")
-
-            usuario = os.getenv("DB_USER")
-            contrasena = os.getenv("DB_PASSWORD")
-            host = os.getenv("DB_HOST")
-            puerto = os.getenv("DB_PORT", "3306")
-            nombre_bd = os.getenv("DB_NAME")
+            # El .env se parsea una sola vez por proceso; la marca sobrevive a recargas del módulo
+            if os.environ.get("_DB_ENV_LOADED") != "1":
+                load_dotenv()
+                os.environ["_DB_ENV_LOADED"] = "1"
+                self.logger.debug("Variables de entorno cargadas desde .env")
+            env = os.environ
+
+            usuario = env.get("DB_USER")
+            contrasena = env.get("DB_PASSWORD")
+            host = env.get("DB_HOST")
+            puerto = env.get("DB_PORT", "3306")
+            nombre_bd = env.get("DB_NAME")
             self.logger.debug(f"Configuración BD - Host: {host}:{puerto}, BD: {nombre_bd}, Usuario: {usuario}")
 
             if not all([usuario, contrasena, host, nombre_bd]):
@@ -59,50 +158,85 @@ class ConexionBD:
                 ]
                 raise ValueError(f"Faltan variables de entorno para BD: {', '.join(credenciales_faltantes)}")
 
-            pool_size = int(os.getenv('DB_POOL_SIZE', '5'))
-            max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '10'))
-            query_timeout_seconds = int(os.getenv('DB_QUERY_TIMEOUT', '30'))
-
-            cadena_conexion = f"mysql+pymysql://{usuario}:{contrasena}@{host}:{puerto}/{nombre_bd}"
-            connect_args_dict = {
-                "charset": "utf8mb4",
-                "use_unicode": True,
-                "autocommit": True
-            }
+            # pool_size debería aproximarse al número máximo de hilos consumidores concurrentes;
+            # sin configuración explícita se usa 2 conexiones por CPU, con un mínimo de 5
+            pool_size = int(env.get('DB_POOL_SIZE', max(5, (os.cpu_count() or 1) * 2)))
+            max_overflow = int(env.get('DB_MAX_OVERFLOW', '30'))
+            pool_timeout = int(env.get('DB_POOL_TIMEOUT', '10'))
+            pool_recycle = int(env.get('DB_POOL_RECYCLE', '1800'))
+            query_timeout_seconds = int(env.get('DB_QUERY_TIMEOUT', '30'))
+            # Se lee una vez aquí (ya cargado el .env) en lugar de en cada muestreo de métricas
+            self.__limite_memoria_alerta_mb = int(env.get('MEMORIA_LIMITE_ALERTA', '500'))
+
+            # mysqlclient (mysqldb) decodifica las filas en C; pymysql queda como alternativa en Python puro
+            driver = env.get('DB_DRIVER', DRIVER_MYSQL_POR_DEFECTO).lower()
+            if driver not in ('mysqldb', 'pymysql'):
+                raise ValueError(f"DB_DRIVER '{driver}' no soportado. Use 'mysqldb' o 'pymysql'.")
+
+            # Ambos drivers leen el charset desde la URL
+            cadena_conexion = f"mysql+{driver}://{usuario}:{contrasena}@{host}:{puerto}/{nombre_bd}?charset=utf8mb4"
+            # connectorx no entiende el sufijo de driver de SQLAlchemy (+pymysql / +mysqldb)
+            self.__uri_connectorx = f"mysql://{usuario}:{contrasena}@{host}:{puerto}/{nombre_bd}"
+            connect_args_dict = {}
+            # Compresión del protocolo MySQL: reduce los bytes transferidos en resultados anchos contra un
+            # servidor remoto. Solo mysqlclient la soporta (pymysql la rechaza) y en conexiones locales es puro costo.
+            if (driver == 'mysqldb' and env.get('DB_COMPRESS', '1') == '1'
+                    and host not in ('localhost', '127.0.0.1', '::1')):
+                connect_args_dict['compress'] = True
 
             self.__motor = create_engine(
                 cadena_conexion,
                 echo=False,
+                poolclass=QueuePool,
                 pool_size=pool_size,
                 max_overflow=max_overflow,
+                pool_timeout=pool_timeout,
                 pool_pre_ping=True,
-                pool_recycle=3600,
+                pool_recycle=pool_recycle,
+                # LIFO reutiliza las conexiones recién usadas; las ociosas envejecen y pool_recycle las renueva
+                pool_use_lifo=True,
+                # Más espacio que el default (500) para las sentencias compiladas de consultas analíticas repetidas
+                query_cache_size=1200,
                 connect_args=connect_args_dict
             )
+            # La fábrica de sesiones se construye una sola vez; expire_on_commit=False evita recargar atributos tras commit
+            self.__fabrica_sesiones = sessionmaker(bind=self.__motor, expire_on_commit=False)
 
-            # Probar la conexión usando text()
-            with self.__motor.connect() as conexion_prueba:
-                conexion_prueba.execute(text("SELECT 1")) 
-            self.logger.debug("Prueba de conexión directa al motor exitosa.")
+            # pool_pre_ping ya valida cada conexión al tomarla del pool; la prueba al arrancar es opcional
+            if env.get('DB_STARTUP_PROBE', '0') == '1':
+                # Un solo viaje reúne la prueba de vida y los datos de diagnóstico del servidor
+                with self.__motor.connect() as conexion_prueba:
+                    diagnostico = conexion_prueba.execute(
+                        _sentencia_compilada("SELECT 1 AS ok, VERSION() AS version, DATABASE() AS base_datos")).one()
+                self.__version_servidor = diagnostico.version
+                self.logger.debug(f"Prueba de conexión directa al motor exitosa (MySQL {diagnostico.version}, "
+                                  f"BD activa: {diagnostico.base_datos}).")
 
-            Session = sessionmaker(bind=self.__motor)
-            self.__sesion = Session()
+            self.__sesion = self.__fabrica_sesiones()
 
             self.logger.info("Conexión a la base de datos establecida exitosamente.")
-            self.logger.info(f"Pool configurado: size={pool_size}, overflow={max_overflow}, query_timeout_config={query_timeout_seconds}s")
+            self.logger.info(f"Driver MySQL: {driver} (compresión: {'sí' if connect_args_dict.get('compress') else 'no'})")
+            self.logger.info(f"Pool configurado: size={pool_size}, overflow={max_overflow}, timeout={pool_timeout}s, "
+                             f"recycle={pool_recycle}s, query_timeout_config={query_timeout_seconds}s")
             self.__registrar_metricas_iniciales()
+            self.__programar_muestreo_metricas()
+            # El finalizador no guarda referencia a self: se ejecuta al recolectar la instancia o al salir
+            # del intérprete, sin depender del orden en que se desmontan logging y SQLAlchemy
+            weakref.finalize(self, ConexionBD._liberar_recursos, self.__motor)
 
         except Exception as e:
             self.manejador_errores.manejar_error_critico(e)
             self.__motor = None
             self.__sesion = None
+            self.__fabrica_sesiones = None
             raise
 
     def __registrar_metricas_iniciales(self):
         try:
-            proceso = psutil.Process()
-            memoria_mb = proceso.memory_info().rss / (1024 * 1024)
-            self.estadisticas.registrar_uso_memoria(memoria_mb)
+            # Sin psutil no hay lectura de memoria, pero el resto de las métricas se registra igual
+            if self.__proceso is not None:
+                memoria_mb = self.__proceso.memory_info().rss / (1024 * 1024)
+                self.estadisticas.registrar_uso_memoria(memoria_mb)
             self.estadisticas.registrar_metricas_base_datos(
                 conexiones_activas=1,
                 consultas_ejecutadas=self.__contador_consultas
@@ -120,8 +254,7 @@ class ConexionBD:
     def obtener_sesion(self):
         if self.__sesion is None and self.__motor is not None:
             try:
-                Session = sessionmaker(bind=self.__motor)
-                self.__sesion = Session()
+                self.__sesion = self.__fabrica_sesiones()
                 self.logger.debug("Nueva sesión de BD creada.")
             except Exception as e:
                 self.manejador_errores.manejar_error_bd(e)
@@ -129,8 +262,7 @@ class ConexionBD:
         elif self.__sesion and not self.__sesion.is_active and self.__motor:
             self.logger.warning("Sesión de BD detectada como inactiva, reabriendo.")
             try:
-                Session = sessionmaker(bind=self.__motor)
-                self.__sesion = Session()
+                self.__sesion = self.__fabrica_sesiones()
             except Exception as e:
                 self.manejador_errores.manejar_error_bd(e, "Intentando reabrir sesión inactiva")
                 return None
@@ -147,36 +279,130 @@ class ConexionBD:
             finally:
                 self.__sesion = None
 
-    @registrar_consulta_sql
-    def ejecutar_consulta(self, consulta_sql: str, params: dict = None, usar_cache: bool = True) -> pd.DataFrame | None:
+    def __leer_consulta(self, consulta_sql: str, params: dict = None, tipo_consulta: str = None,
+                        partition_on: str = None, partition_num: int = None) -> pd.DataFrame:
+        """
+        Lee el resultado de una consulta como DataFrame.
+        Los SELECT sin parámetros se leen con connectorx (si está instalado), que vuelca las filas
+        directamente en los buffers de pandas sin pasar por objetos Python fila a fila.
+        Cualquier otro caso, o un fallo de connectorx, toma una única conexión del pool y construye el
+        DataFrame con from_records, sin la capa de pandas.io.sql que re-inspecciona el motor en cada llamada.
+        """
+        if tipo_consulta == 'SELECT' and not params and self.__uri_connectorx and (cx := _modulo_opcional('connectorx')):
+            try:
+                opciones_particion = {}
+                if partition_on and partition_num:
+                    opciones_particion = {'partition_on': partition_on, 'partition_num': partition_num}
+                return cx.read_sql(self.__uri_connectorx, consulta_sql, return_type="pandas", **opciones_particion)
+            except Exception as e:
+                self.logger.debug(f"connectorx no pudo ejecutar la consulta, usando el motor SQLAlchemy: {e}")
+        # begin() confirma al salir, igual que hacía pandas, para que las sentencias de escritura persistan
+        with self.__motor.begin() as conexion:
+            # Sin parámetros la consulta se envía como TextClause cacheado; con parámetros se conserva
+            # el texto crudo para respetar el estilo %(nombre)s del driver que usan los llamadores.
+            sentencia = None if params else _sentencia_compilada(consulta_sql)
+            if sentencia is not None:
+                resultado = conexion.execute(sentencia)
+            else:
+                resultado = conexion.exec_driver_sql(consulta_sql, params)
+            if not resultado.returns_rows:
+                return pd.DataFrame()
+            return pd.DataFrame.from_records(resultado.fetchall(), columns=list(resultado.keys()),
+                                             coerce_float=True)
+
+    def __ejecutar_escalar(self, consulta_sql: str, params: dict = None):
+        """
+        Devuelve la primera celda del resultado como valor Python, sin construir un DataFrame.
+        Pensado para sondeos y conteos internos; las consultas de datos usan ejecutar_consulta.
+        """
+        with self.__motor.connect() as conexion:
+            sentencia = None if params else _sentencia_compilada(consulta_sql)
+            if sentencia is None:
+                return conexion.exec_driver_sql(consulta_sql, params).scalar()
+            return conexion.execute(sentencia).scalar()
+
+    def ejecutar_consulta(self, consulta_sql: str, params: dict = None, usar_cache: bool = True,
+                          partition_on: str = None, partition_num: int = None) -> pd.DataFrame | None:
+        # Camino crítico: el registro se hace aquí (sin @registrar_consulta_sql) con una sola medición
+        # de tiempo, y el formateo de mensajes se omite cuando el nivel de log no está habilitado
+        logger = self.logger
         if self.__motor is None:
-            self.logger.error("No hay conexión (motor) establecida con la base de datos.")
+            logger.error("No hay conexión (motor) establecida con la base de datos.")
             return None
 
-        inicio_operacion = datetime.now()
-        tipo_consulta_simple = consulta_sql.strip().split(None, 1)[0].upper()
+        inicio_operacion_ns = time.perf_counter_ns()
+        tipo_consulta_simple = _verbo_sql(consulta_sql)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Ejecutando SQL: %s", consulta_sql[:200] + "..." if len(consulta_sql) > 200 else consulta_sql)
 
-        if usar_cache and tipo_consulta_simple == 'SELECT':
-            resultado_cache = self.gestor_cache.obtener_desde_cache(consulta_sql, params)
-            if resultado_cache is not None:
-                duracion_total = (datetime.now() - inicio_operacion).total_seconds()
-                self.logger.info(f"HIT DE CACHE para consulta: {consulta_sql[:60]}... ({duracion_total:.4f}s)")
-                return resultado_cache
+        leido_de_bd = False
 
-        df_resultado = None
-        try:
+        def leer_desde_bd() -> pd.DataFrame:
+            nonlocal leido_de_bd
+            leido_de_bd = True
             self.__contador_consultas += 1
-            df_resultado = pd.read_sql_query(consulta_sql, self.__motor, params=params)
-
-            if usar_cache and tipo_consulta_simple == 'SELECT' and df_resultado is not None and not df_resultado.empty:
-                self.gestor_cache.guardar_en_cache(consulta_sql, df_resultado, params)
+            return self.__leer_consulta(consulta_sql, params, tipo_consulta_simple, partition_on, partition_num)
 
-            if self.__contador_consultas % 20 == 0:
-                self.__registrar_metricas_sistema()
+        df_resultado = None
+        try:
+            if usar_cache and tipo_consulta_simple == 'SELECT':
+                # Búsqueda y almacenamiento en cache comparten una única clave calculada
+                df_resultado = self.gestor_cache.obtener_o_calcular(consulta_sql, params, leer_desde_bd)
+                if not leido_de_bd:
+                    if logger.isEnabledFor(logging.INFO):
+                        duracion_total = (time.perf_counter_ns() - inicio_operacion_ns) * 1e-9
+                        logger.info("HIT DE CACHE para consulta: %s... (%.4fs)", consulta_sql[:60], duracion_total)
+                    return df_resultado
+            else:
+                df_resultado = leer_desde_bd()
+
+            if logger.isEnabledFor(logging.INFO):
+                duracion_total = (time.perf_counter_ns() - inicio_operacion_ns) * 1e-9
+                if df_resultado is not None:
+                    logger.info("Consulta exitosa: %d filas en %.3fs", len(df_resultado), duracion_total)
+                else:
+                    logger.warning("Consulta retornó None en %.3fs", duracion_total)
             return df_resultado
         except Exception as e:
             self.manejador_errores.manejar_error_bd(e, consulta_sql)
             return None
+        finally:
+            if tipo_consulta_simple in VERBOS_ESCRITURA:
+                # Solo se invalidan las consultas de las tablas escritas; un CALL (puede tocar cualquier
+                # tabla) o una sentencia sin tabla reconocible vacía todo el cache
+                tablas = _tablas_de_escritura(consulta_sql) if tipo_consulta_simple != 'CALL' else frozenset()
+                if tablas:
+                    for tabla in tablas:
+                        self.invalidar_cache_tabla(tabla)
+                else:
+                    self.invalidar_cache()
+
+    async def ejecutar_consulta_async(self, consulta_sql: str, params: dict = None,
+                                      usar_cache: bool = True) -> pd.DataFrame | None:
+        """
+        Versión awaitable de ejecutar_consulta. La consulta corre en un hilo del executor por defecto
+        con su propia conexión del pool, de modo que varias consultas independientes se solapan en la
+        red en lugar de esperar una tras otra.
+        """
+        return await asyncio.to_thread(self.ejecutar_consulta, consulta_sql, params, usar_cache)
+
+    async def ejecutar_consultas_concurrentes(self, consultas: list) -> list:
+        """
+        Ejecuta en paralelo una lista de consultas independientes y devuelve sus resultados en el mismo orden.
+        Cada elemento puede ser el texto SQL o una tupla (consulta_sql, params).
+        La concurrencia efectiva queda limitada por pool_size + max_overflow.
+
+        Uso:
+            resultados = asyncio.run(conexion.ejecutar_consultas_concurrentes([
+                "SELECT COUNT(*) FROM sales",
+                ("SELECT * FROM products WHERE CategoryID = %(id)s", {'id': 3}),
+            ]))
+        """
+        tareas = []
+        for consulta in consultas:
+            consulta_sql, params = consulta if isinstance(consulta, tuple) else (consulta, None)
+            tareas.append(self.ejecutar_consulta_async(consulta_sql, params))
+        return await asyncio.gather(*tareas)
 
     @cache_consulta(duracion_minutos=30)
     def ejecutar_consulta_analisis(self, consulta_sql: str, params: dict = None) -> pd.DataFrame | None:
@@ -187,18 +413,112 @@ class ConexionBD:
         self.logger.debug(f"Ejecutando consulta explícitamente sin cache: {consulta_sql[:60]}...")
         return self.ejecutar_consulta(consulta_sql, params, usar_cache=False)
 
+    def ejecutar_consulta_streaming(self, consulta_sql: str, params: dict = None, chunksize: int = 50_000,
+                                    usar_arrow: bool = False):
+        """
+        Ejecuta una consulta usando un cursor del lado del servidor (SSCursor en pymysql) y produce
+        el resultado en bloques de `chunksize` filas. El pico de memoria queda acotado a un bloque,
+        por lo que es el camino indicado para SELECT que devuelven millones de filas. No usa el cache.
+
+        Con `usar_arrow=True` (requiere pyarrow) cada bloque usa dtype_backend="pyarrow": las columnas
+        de texto ocupan bastante menos que con dtype object y los groupby posteriores son más rápidos.
+
+        Uso:
+            for bloque in conexion.ejecutar_consulta_streaming("SELECT * FROM sales"):
+                procesar(bloque)
+        """
+        if self.__motor is None:
+            self.logger.error("No hay conexión (motor) establecida con la base de datos.")
+            return
+
+        opciones_lectura = {}
+        if usar_arrow:
+            if _modulo_opcional('pyarrow') is not None:
+                opciones_lectura['dtype_backend'] = "pyarrow"
+            else:
+                self.logger.warning("pyarrow no está instalado; los bloques se entregan con tipos NumPy.")
+
+        self.__contador_consultas += 1
+        self.logger.debug(f"Ejecutando consulta en streaming (bloques de {chunksize} filas): {consulta_sql[:60]}...")
+        try:
+            with self.__motor.connect() as conexion:
+                conexion_streaming = conexion.execution_options(stream_results=True)
+                yield from pd.read_sql_query(consulta_sql, conexion_streaming, params=params, chunksize=chunksize,
+                                             **opciones_lectura)
+        except Exception as e:
+            # A diferencia de ejecutar_consulta, se relanza: un generador cortado en silencio ocultaría datos faltantes
+            self.manejador_errores.manejar_error_bd(e, consulta_sql)
+            raise
+
+    @registrar_consulta_sql
+    def ejecutar_consulta_arrow(self, consulta_sql: str, params: dict = None, como_tabla_arrow: bool = False):
+        """
+        Ejecuta una consulta y devuelve el resultado en formato columnar Arrow.
+        Con como_tabla_arrow=True retorna un pyarrow.Table; si no, un DataFrame respaldado por
+        pd.ArrowDtype, que evita duplicar strings y encajonar decimales como objetos Python.
+        No usa el cache de consultas.
+        """
+        if self.__motor is None:
+            self.logger.error("No hay conexión (motor) establecida con la base de datos.")
+            return None
+        pa = _modulo_opcional('pyarrow')
+        if pa is None:
+            self.logger.error("pyarrow no está instalado; no se puede ejecutar la consulta en formato Arrow.")
+            return None
+
+        try:
+            self.__contador_consultas += 1
+            cx = _modulo_opcional('connectorx')
+            if cx is not None and not params and self.__uri_connectorx:
+                tabla = cx.read_sql(self.__uri_connectorx, consulta_sql, return_type="arrow")
+                if como_tabla_arrow:
+                    return tabla
+                return tabla.to_pandas(types_mapper=pd.ArrowDtype, self_destruct=True)
+
+            df_resultado = pd.read_sql_query(consulta_sql, self.__motor, params=params, dtype_backend="pyarrow")
+            if como_tabla_arrow:
+                return pa.Table.from_pandas(df_resultado, preserve_index=False)
+            return df_resultado
+        except Exception as e:
+            self.manejador_errores.manejar_error_bd(e, consulta_sql)
+            return None
+
+    def invalidar_cache(self):
+        """Invalida todos los resultados cacheados (memoria y disco)."""
+        self.logger.info("Invalidando todo el cache de consultas.")
+        self.gestor_cache.invalidar_cache()
+
     def invalidar_cache_tabla(self, nombre_tabla: str):
         self.logger.info(f"Solicitando invalidación de cache para la tabla: {nombre_tabla}")
-        self.gestor_cache.invalidar_cache(patron=nombre_tabla.lower())
+        self.gestor_cache.invalidar_cache_tabla(nombre_tabla)
+
+    def __programar_muestreo_metricas(self):
+        """
+        Programa el muestreo periódico de métricas (psutil, pool, cache) en un Timer daemon, de modo que
+        ese trabajo no recaiga sobre el hilo que ejecuta la consulta.
+        """
+        def muestreo_periodico():
+            # La cadena se detiene si esta instancia dejó de ser el Singleton vigente o perdió el motor
+            if ConexionBD.__instancia is not self or self.__motor is None:
+                return
+            self.__registrar_metricas_sistema()
+            timer = threading.Timer(INTERVALO_METRICAS_SEGUNDOS, muestreo_periodico)
+            timer.daemon = True
+            timer.start()
+
+        timer_inicial = threading.Timer(INTERVALO_METRICAS_SEGUNDOS, muestreo_periodico)
+        timer_inicial.daemon = True
+        timer_inicial.start()
+        self.logger.debug(f"Muestreo de métricas programado cada {INTERVALO_METRICAS_SEGUNDOS}s.")
 
     def __registrar_metricas_sistema(self):
         try:
-            proceso = psutil.Process()
-            memoria_mb = proceso.memory_info().rss / (1024 * 1024)
-            limite_memoria_alerta = int(os.getenv('MEMORIA_LIMITE_ALERTA', '500'))
-            if memoria_mb > limite_memoria_alerta:
-                self.logger.warning(f"Uso de memoria ALTO: {memoria_mb:.1f}MB (Límite de alerta: {limite_memoria_alerta}MB)")
-            self.estadisticas.registrar_uso_memoria(memoria_mb)
+            if self.__proceso is not None:
+                memoria_mb = self.__proceso.memory_info().rss / (1024 * 1024)
+                limite_memoria_alerta = self.__limite_memoria_alerta_mb
+                if memoria_mb > limite_memoria_alerta:
+                    self.logger.warning(f"Uso de memoria ALTO: {memoria_mb:.1f}MB (Límite de alerta: {limite_memoria_alerta}MB)")
+                self.estadisticas.registrar_uso_memoria(memoria_mb)
 
             conexiones_pool = self.__motor.pool.size() if self.__motor and hasattr(self.__motor.pool, 'size') else 0
             self.estadisticas.registrar_metricas_base_datos(
@@ -218,24 +538,30 @@ class ConexionBD:
             self.logger.warning("Motor de BD no disponible para validación de salud.")
             return False
         try:
-            sesion_prueba = self.obtener_sesion()
-            if sesion_prueba and sesion_prueba.is_active:
-                resultado_df = self.ejecutar_consulta_sin_cache("SELECT 1 AS salud")
-                if resultado_df is not None and not resultado_df.empty and resultado_df.iloc[0]['salud'] == 1:
-                    self.logger.debug("Validación de salud de conexión (con sesión y consulta) exitosa.")
-                    return True
-            self.logger.error("Validación de salud de conexión falló (sesión inactiva o consulta fallida).")
+            # Un único viaje a la BD leído como escalar; pool_pre_ping ya descarta las conexiones caídas
+            if self.__ejecutar_escalar("SELECT 1") == 1:
+                self.logger.debug("Validación de salud de conexión exitosa.")
+                return True
+            self.logger.error("Validación de salud de conexión falló (SELECT 1 no devolvió 1).")
             return False
         except Exception as e:
             self.manejador_errores.manejar_error_bd(e, "SELECT 1 (Validación de salud)")
             return False
 
-    def obtener_estadisticas_completas(self) -> dict:
+    def obtener_estadisticas_completas(self, forzar: bool = False) -> dict:
+        """
+        Reúne métricas de BD, proceso y cache. Las llamadas repetidas dentro de
+        VIGENCIA_ESTADISTICAS_SEGUNDOS reciben la última instantánea salvo que se pida `forzar`.
+        """
+        if (not forzar and self.__estadisticas_memorizadas is not None
+                and time.monotonic() - self.__momento_estadisticas < VIGENCIA_ESTADISTICAS_SEGUNDOS):
+            return self.__estadisticas_memorizadas
         try:
             estadisticas_bd = {
                 'consultas_ejecutadas_bd': self.__contador_consultas,
                 'motor_disponible': self.__motor is not None,
                 'sesion_disponible': self.__sesion is not None and self.__sesion.is_active,
+                'version_servidor': self.__version_servidor or 'N/A',
             }
             if self.__motor and hasattr(self.__motor, 'pool'):
                 pool = self.__motor.pool
@@ -246,12 +572,17 @@ class ConexionBD:
                     'pool_overflow': pool.overflow(),
                 })
 
-            try:
-                proceso = psutil.Process()
-                estadisticas_bd['memoria_proceso_mb'] = round(proceso.memory_info().rss / (1024 * 1024), 2)
-                estadisticas_bd['cpu_proceso_percent'] = round(proceso.cpu_percent(interval=0.1), 2)
-            except Exception as e_psutil:
-                self.logger.debug(f"No se pudo obtener info de psutil: {e_psutil}")
+            if self.__proceso is not None:
+                try:
+                    # MB enteros por desplazamiento de bits; el sondeo de monitoreo no necesita decimales
+                    estadisticas_bd['memoria_proceso_mb'] = self.__proceso.memory_info().rss >> 20
+                    # Sin intervalo: devuelve el uso desde la lectura anterior en lugar de bloquear 0.1s
+                    estadisticas_bd['cpu_proceso_percent'] = round(self.__proceso.cpu_percent(interval=None), 2)
+                except Exception as e_psutil:
+                    self.logger.debug(f"No se pudo obtener info de psutil: {e_psutil}")
+                    estadisticas_bd['memoria_proceso_mb'] = 'N/A'
+                    estadisticas_bd['cpu_proceso_percent'] = 'N/A'
+            else:
                 estadisticas_bd['memoria_proceso_mb'] = 'N/A'
                 estadisticas_bd['cpu_proceso_percent'] = 'N/A'
 
@@ -262,6 +593,8 @@ class ConexionBD:
                 'info_cache_consultas': estadisticas_cache,
             }
             self.logger.debug("Estadísticas completas del sistema generadas.")
+            self.__estadisticas_memorizadas = todas_las_estadisticas
+            self.__momento_estadisticas = time.monotonic()
             return todas_las_estadisticas
         except Exception as e:
             self.logger.error(f"Error crítico al obtener estadísticas completas: {e}", exc_info=True)
@@ -274,20 +607,36 @@ class ConexionBD:
             self.gestor_cache.limpiar_cache_expirado()
             if not self.validar_salud_conexion():
                 self.logger.warning("Conexión a BD no saludable detectada durante optimización.")
-            stats_post_opt = self.obtener_estadisticas_completas()
+            stats_post_opt = self.obtener_estadisticas_completas(forzar=True)
             self.logger.info(f"Optimización completada. Memoria actual: {stats_post_opt.get('info_base_datos', {}).get('memoria_proceso_mb', 'N/A')}MB. "
                              f"Entradas cache memoria: {stats_post_opt.get('info_cache_consultas', {}).get('entradas_en_memoria', 'N/A')}.")
         except Exception as e:
             self.logger.error(f"Error durante la optimización de rendimiento: {e}", exc_info=True)
 
-    def __del__(self):
+    @staticmethod
+    def _liberar_recursos(motor):
+        """Cierra las conexiones del pool del motor. Registrado con weakref.finalize."""
         try:
-            if self.__sesion:
-                self.cerrar_sesion()
-            self.logger.debug("Recursos de ConexionBD liberados en __del__ (sesión cerrada).")
-        except:
+            motor.dispose()
+        except Exception:
             pass
 
+
+@cache
+def obtener_conexion() -> ConexionBD:
+    """
+    Accesor de módulo a la instancia única de ConexionBD. Tras la primera llamada devuelve
+    la instancia cacheada sin pasar por __new__ (ni el lock del Singleton). Si se reinicia
+    el Singleton (p. ej. en pruebas), invocar obtener_conexion.cache_clear().
+    """
+    return ConexionBD()
+
+
+def obtener_motor_bd():
+    """Atajo para obtener el motor SQLAlchemy compartido desde bucles intensivos."""
+    return obtener_conexion().obtener_motor()
+
+
 if __name__ == "__main__":
     # Ejecuta como módulo: python -m src.conexion_bd desde la raíz del proyecto.
     try:
@@ -330,8 +679,13 @@ if __name__ == "__main__":
 
             print("\n--- Obteniendo estadísticas completas ---")
             estadisticas = conector_bd.obtener_estadisticas_completas()
-            import json
-            print(json.dumps(estadisticas, indent=2, default=str))
+            orjson = _modulo_opcional('orjson')
+            if orjson is not None:
+                print(orjson.dumps(estadisticas, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                                   default=str).decode())
+            else:
+                import json
+                print(json.dumps(estadisticas, indent=2, default=str))
 
             print("\n--- Realizando optimización ---")
             conector_bd.optimizar_rendimiento()
@@ -2,6 +2,8 @@ class Categoria:
     """
     Representa una categoría de producto en el sistema.
     """
+    __slots__ = ('_id_categoria', '_nombre_categoria')
+
     def __init__(self, id_categoria: int, nombre_categoria: str):
         """
         Constructor de la clase Categoria.
@@ -33,10 +35,10 @@ class Categoria:
         """
         Representación en cadena de texto de un objeto Categoria.
         """
-        return f"Categoría(ID: {self.id_categoria}, Nombre: '{self.nombre_categoria}')"
+        return f"Categoría(ID: {self._id_categoria}, Nombre: '{self._nombre_categoria}')"
 
     def __repr__(self) -> str:
         """
         Representación oficial del objeto, útil para debugging.
         """
-        return f"Categoria(id_categoria={self.id_categoria!r}, nombre_categoria={self.nombre_categoria!r})"
\ No newline at end of file
+        return f"Categoria(id_categoria={self._id_categoria!r}, nombre_categoria={self._nombre_categoria!r})"
\ No newline at end of file
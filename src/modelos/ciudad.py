@@ -2,6 +2,8 @@ class Ciudad:
     """
     Representa una ciudad en el sistema.
     """
+    __slots__ = ('_id_ciudad', '_nombre_ciudad', '_codigo_postal', '_id_pais')
+
     def __init__(self, id_ciudad: int, nombre_ciudad: str, id_pais: int, codigo_postal: str = None):
         """
         Constructor de la clase Ciudad.
@@ -50,8 +52,8 @@ class Ciudad:
         self._id_pais = nuevo_id_pais
         
     def __str__(self) -> str:
-        return f"Ciudad(ID: {self.id_ciudad}, Nombre: '{self.nombre_ciudad}', CP: '{self.codigo_postal or ''}', ID País: {self.id_pais})"
+        return f"Ciudad(ID: {self._id_ciudad}, Nombre: '{self._nombre_ciudad}', CP: '{self._codigo_postal or ''}', ID País: {self._id_pais})"
 
     def __repr__(self) -> str:
-        return (f"Ciudad(id_ciudad={self.id_ciudad!r}, nombre_ciudad={self.nombre_ciudad!r}, "
-                f"id_pais={self.id_pais!r}, codigo_postal={self.codigo_postal!r})")
\ No newline at end of file
+        return (f"Ciudad(id_ciudad={self._id_ciudad!r}, nombre_ciudad={self._nombre_ciudad!r}, "
+                f"id_pais={self._id_pais!r}, codigo_postal={self._codigo_postal!r})")
\ No newline at end of file
@@ -1,7 +1,21 @@
+import sys
+from collections.abc import Iterator
+from itertools import repeat
+
+
+def _internar(valor):
+    # Nombres y apellidos se repiten mucho entre clientes; sys.intern comparte una única copia
+    return sys.intern(valor) if isinstance(valor, str) else valor
+
+
 class Cliente:
     """
     Representa un cliente en el sistema.
     """
+    # Sin __dict__ por instancia: menos memoria al materializar muchas filas
+    __slots__ = ('_id_cliente', '_primer_nombre', '_inicial_segundo_nombre', '_apellido',
+                 '_direccion', '_id_ciudad', '_nombre_completo')
+
     def __init__(self, id_cliente: int, primer_nombre: str, apellido: str, 
                  id_ciudad: int, inicial_segundo_nombre: str = None, direccion: str = None):
         """
@@ -16,11 +30,12 @@ class Cliente:
             direccion (str, optional): La dirección del cliente. Defaults to None.
         """
         self._id_cliente = id_cliente
-        self._primer_nombre = primer_nombre
+        self._primer_nombre = _internar(primer_nombre)
         self._inicial_segundo_nombre = inicial_segundo_nombre
-        self._apellido = apellido
+        self._apellido = _internar(apellido)
         self._direccion = direccion
         self._id_ciudad = id_ciudad # Foreign Key a Ciudad
+        self._nombre_completo = None # Se calcula en el primer uso y se descarta al cambiar el nombre
 
     @property
     def id_cliente(self) -> int:
@@ -34,7 +49,8 @@ class Cliente:
     def primer_nombre(self, nuevo_nombre: str):
         if not nuevo_nombre or len(nuevo_nombre.strip()) == 0:
             raise ValueError("El primer nombre del cliente no puede estar vacío.")
-        self._primer_nombre = nuevo_nombre.strip()
+        self._primer_nombre = _internar(nuevo_nombre.strip())
+        self._nombre_completo = None
 
     @property
     def inicial_segundo_nombre(self) -> str | None:
@@ -49,6 +65,7 @@ class Cliente:
              self._inicial_segundo_nombre = nueva_inicial.strip()
         else:
             self._inicial_segundo_nombre = None
+        self._nombre_completo = None
 
 
     @property
@@ -59,7 +76,8 @@ class Cliente:
     def apellido(self, nuevo_apellido: str):
         if not nuevo_apellido or len(nuevo_apellido.strip()) == 0:
             raise ValueError("El apellido del cliente no puede estar vacío.")
-        self._apellido = nuevo_apellido.strip()
+        self._apellido = _internar(nuevo_apellido.strip())
+        self._nombre_completo = None
 
     @property
     def direccion(self) -> str | None:
@@ -77,21 +95,49 @@ class Cliente:
     def id_ciudad(self, nuevo_id_ciudad: int):
         self._id_ciudad = nuevo_id_ciudad
 
+    @classmethod
+    def desde_dataframe(cls, df) -> Iterator["Cliente"]:
+        """
+        Genera objetos Cliente de forma perezosa a partir de un DataFrame con las columnas de la
+        tabla customers (CustomerID, FirstName, LastName, CityID y, opcionalmente, MiddleInitial
+        y Address).
+
+        Para análisis conviene seguir trabajando con el DataFrame; este método es para cuando se
+        necesita la semántica de objeto. Recorre las columnas en paralelo con zip en lugar de
+        acceder fila a fila con iloc/iterrows.
+
+        Args:
+            df (pd.DataFrame): Resultado de una consulta sobre customers.
+        """
+        def columna(nombre: str, opcional: bool = False):
+            if opcional and nombre not in df.columns:
+                return repeat(None)
+            serie = df[nombre]
+            # Los nulos de pandas (NaN) pasan a None para que nombre_completo() no los concatene
+            return serie.astype(object).where(serie.notna(), None).tolist() if opcional else serie.tolist()
+
+        for id_cliente, primer_nombre, apellido, id_ciudad, inicial, direccion in zip(
+                columna('CustomerID'), columna('FirstName'), columna('LastName'), columna('CityID'),
+                columna('MiddleInitial', opcional=True), columna('Address', opcional=True)):
+            yield cls(id_cliente, primer_nombre, apellido, id_ciudad,
+                      inicial_segundo_nombre=inicial, direccion=direccion)
+
     def nombre_completo(self) -> str:
         """
         Devuelve el nombre completo del cliente.
         Este es un ejemplo de un método personalizado relevante para el negocio.
         """
-        partes_nombre = [self.primer_nombre]
-        if self.inicial_segundo_nombre:
-            partes_nombre.append(self.inicial_segundo_nombre + ".")
-        partes_nombre.append(self.apellido)
-        return " ".join(partes_nombre)
+        if self._nombre_completo is None:
+            if self._inicial_segundo_nombre:
+                self._nombre_completo = f"{self._primer_nombre} {self._inicial_segundo_nombre}. {self._apellido}"
+            else:
+                self._nombre_completo = f"{self._primer_nombre} {self._apellido}"
+        return self._nombre_completo
 
     def __str__(self) -> str:
-        return f"Cliente(ID: {self.id_cliente}, Nombre: '{self.nombre_completo()}')"
+        return f"Cliente(ID: {self._id_cliente}, Nombre: '{self.nombre_completo()}')"
 
     def __repr__(self) -> str:
-        return (f"Cliente(id_cliente={self.id_cliente!r}, primer_nombre={self.primer_nombre!r}, "
-                f"inicial_segundo_nombre={self.inicial_segundo_nombre!r}, apellido={self.apellido!r}, "
-                f"id_ciudad={self.id_ciudad!r}, direccion={self.direccion!r})")
\ No newline at end of file
+        return (f"Cliente(id_cliente={self._id_cliente!r}, primer_nombre={self._primer_nombre!r}, "
+                f"inicial_segundo_nombre={self._inicial_segundo_nombre!r}, apellido={self._apellido!r}, "
+                f"id_ciudad={self._id_ciudad!r}, direccion={self._direccion!r})")
\ No newline at end of file
@@ -1,9 +1,14 @@
 from datetime import date
 
+import numpy as np
+
 class Empleado:
     """
     Representa un empleado en el sistema.
     """
+    __slots__ = ('_id_empleado', '_primer_nombre', '_inicial_segundo_nombre', '_apellido',
+                 '_fecha_nacimiento', '_genero', '_id_ciudad', '_fecha_contratacion')
+
     def __init__(self, id_empleado: int, primer_nombre: str, apellido: str, id_ciudad: int,
                  fecha_contratacion: date | None = None, inicial_segundo_nombre: str | None = None,
                  fecha_nacimiento: date | None = None, genero: str | None = None):
@@ -111,34 +116,51 @@ class Empleado:
         """
         Devuelve el nombre completo del empleado.
         """
-        partes = [self.primer_nombre]
-        if self.inicial_segundo_nombre:
-            partes.append(self.inicial_segundo_nombre + ".")
-        partes.append(self.apellido)
-        return " ".join(partes)
+        inicial = self._inicial_segundo_nombre
+        if inicial:
+            return f"{self._primer_nombre} {inicial}. {self._apellido}"
+        return f"{self._primer_nombre} {self._apellido}"
 
-    def calcular_antiguedad_anos(self) -> int | None:
+    def calcular_antiguedad_anos(self, hoy: date | None = None) -> int | None:
         """
         Calcula la antigüedad del empleado en años completos.
         Devuelve None si la fecha de contratación no está definida.
+        En reportes masivos conviene obtener `hoy` una sola vez y pasarlo a cada llamada.
         """
-        if not self.fecha_contratacion:
+        contratacion = self._fecha_contratacion
+        if not contratacion:
             return None
-        
-        hoy = date.today() # Obtiene la fecha actual
-        anos = hoy.year - self.fecha_contratacion.year
-        
-        # Ajustar si aún no ha llegado el aniversario de contratación este año
-        if (hoy.month, hoy.day) < (self.fecha_contratacion.month, self.fecha_contratacion.day):
-            anos -= 1
-        
-        return anos if anos >= 0 else 0 
 
-    def describir_antiguedad(self) -> str:
+        if hoy is None:
+            hoy = date.today()
+        # Mes y día codificados como un entero (mes*32 + día): se resta 1 si aún no llegó el aniversario
+        anos = hoy.year - contratacion.year - ((hoy.month * 32 + hoy.day) < (contratacion.month * 32 + contratacion.day))
+
+        return anos if anos >= 0 else 0
+
+    @staticmethod
+    def calcular_antiguedades_anos(fechas_contratacion, hoy: date | None = None) -> np.ndarray:
+        """
+        Versión vectorizada de calcular_antiguedad_anos para una columna completa de fechas
+        (lista, arreglo o Serie convertible a datetime64[D]). Devuelve un arreglo de enteros con
+        -1 donde la fecha falta (NaT).
+        """
+        if hoy is None:
+            hoy = date.today()
+        fechas = np.asarray(fechas_contratacion, dtype='datetime64[D]')
+        inicio_mes = fechas.astype('datetime64[M]')
+        anos = fechas.astype('datetime64[Y]').astype(np.int64) + 1970
+        meses = inicio_mes.astype(np.int64) % 12 + 1
+        dias = (fechas - inicio_mes).astype(np.int64) + 1
+
+        antiguedades = hoy.year - anos - ((hoy.month * 32 + hoy.day) < (meses * 32 + dias))
+        return np.where(np.isnat(fechas), -1, np.maximum(antiguedades, 0))
+
+    def describir_antiguedad(self, hoy: date | None = None) -> str:
         """
         Devuelve una descripción textual de la antigüedad del empleado.
         """
-        anos = self.calcular_antiguedad_anos()
+        anos = self.calcular_antiguedad_anos(hoy)
         
         if anos is None:
             return "Fecha de contratación no especificada."
@@ -151,18 +173,29 @@ class Empleado:
             return f"{anos} años de antigüedad."
 
     # --- Métodos Especiales ---
+    def __eq__(self, otro) -> bool:
+        """
+        Dos empleados son iguales si tienen el mismo ID.
+        """
+        if type(otro) is not Empleado:
+            return NotImplemented
+        return self._id_empleado == otro._id_empleado
+
+    def __hash__(self) -> int:
+        return hash(self._id_empleado)
+
     def __str__(self) -> str:
         """
         Representación en cadena de texto de un objeto Empleado.
         """
-        return f"Empleado(ID: {self.id_empleado}, Nombre: '{self.nombre_completo()}', Contratación: {self.fecha_contratacion})"
+        return f"Empleado(ID: {self._id_empleado}, Nombre: '{self.nombre_completo()}', Contratación: {self._fecha_contratacion})"
 
     def __repr__(self) -> str:
         """
         Representación oficial del objeto, útil para debugging.
         """
-        return (f"Empleado(id_empleado={self.id_empleado!r}, primer_nombre={self.primer_nombre!r}, "
-                f"apellido={self.apellido!r}, id_ciudad={self.id_ciudad!r}, "
-                f"fecha_contratacion={self.fecha_contratacion!r}, "
-                f"inicial_segundo_nombre={self.inicial_segundo_nombre!r}, "
-                f"fecha_nacimiento={self.fecha_nacimiento!r}, genero={self.genero!r})")
\ No newline at end of file
+        return (f"Empleado(id_empleado={self._id_empleado!r}, primer_nombre={self._primer_nombre!r}, "
+                f"apellido={self._apellido!r}, id_ciudad={self._id_ciudad!r}, "
+                f"fecha_contratacion={self._fecha_contratacion!r}, "
+                f"inicial_segundo_nombre={self._inicial_segundo_nombre!r}, "
+                f"fecha_nacimiento={self._fecha_nacimiento!r}, genero={self._genero!r})")
\ No newline at end of file
@@ -1,7 +1,10 @@
 class Pais:
     """
     Representa un país en el sistema.
+    Es inmutable y hashable, por lo que puede usarse como clave en diccionarios y agrupaciones.
     """
+    __slots__ = ('_id_pais', '_nombre_pais', '_codigo_pais')
+
     def __init__(self, id_pais: int, nombre_pais: str, codigo_pais: str = None):
         """
         Constructor de la clase Pais.
@@ -11,9 +14,39 @@ class Pais:
             nombre_pais (str): El nombre del país.
             codigo_pais (str, optional): El código de dos letras del país. Defaults to None.
         """
-        self._id_pais = id_pais
-        self._nombre_pais = nombre_pais
-        self._codigo_pais = codigo_pais
+        object.__setattr__(self, '_id_pais', id_pais)
+        object.__setattr__(self, '_nombre_pais', nombre_pais)
+        object.__setattr__(self, '_codigo_pais', codigo_pais)
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f"Pais es inmutable; use reemplazar() en lugar de asignar '{nombre}'.")
+
+    def __delattr__(self, nombre):
+        raise AttributeError(f"Pais es inmutable; no se puede borrar '{nombre}'.")
+
+    def __reduce__(self):
+        # pickle restauraría los slots con setattr; se reconstruye por el constructor
+        return (type(self), self._clave())
+
+    @classmethod
+    def crear(cls, id_pais: int, nombre_pais: str, codigo_pais: str | None = None) -> 'Pais':
+        """
+        Crea un país validando y normalizando sus datos; pensado para la carga desde CSV o BD.
+        """
+        if not nombre_pais or len(nombre_pais.strip()) == 0:
+            raise ValueError("El nombre del país no puede estar vacío.")
+        if codigo_pais and len(codigo_pais.strip()) > 2: # Ejemplo de validación simple
+            raise ValueError("El código del país no debe exceder los 2 caracteres.")
+        return cls(id_pais, nombre_pais.strip(), codigo_pais.strip() if codigo_pais else None)
+
+    def reemplazar(self, **cambios) -> 'Pais':
+        """
+        Devuelve un nuevo país con los campos indicados cambiados, p. ej. pais.reemplazar(nombre_pais='Chile').
+        Los países son inmutables una vez cargados.
+        """
+        datos = {'id_pais': self._id_pais, 'nombre_pais': self._nombre_pais, 'codigo_pais': self._codigo_pais}
+        datos.update(cambios)
+        return type(self).crear(**datos)
 
     @property
     def id_pais(self) -> int:
@@ -23,24 +56,24 @@ class Pais:
     def nombre_pais(self) -> str:
         return self._nombre_pais
 
-    @nombre_pais.setter
-    def nombre_pais(self, nuevo_nombre: str):
-        if not nuevo_nombre or len(nuevo_nombre.strip()) == 0:
-            raise ValueError("El nombre del país no puede estar vacío.")
-        self._nombre_pais = nuevo_nombre.strip()
-
     @property
     def codigo_pais(self) -> str | None: 
         return self._codigo_pais
 
-    @codigo_pais.setter
-    def codigo_pais(self, nuevo_codigo: str | None):
-        if nuevo_codigo and len(nuevo_codigo.strip()) > 2: # Ejemplo de validación simple
-            raise ValueError("El código del país no debe exceder los 2 caracteres.")
-        self._codigo_pais = nuevo_codigo.strip() if nuevo_codigo else None
+    def _clave(self) -> tuple:
+        return (self._id_pais, self._nombre_pais, self._codigo_pais)
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, Pais):
+            return NotImplemented
+        return self._clave() == otro._clave()
+
+    def __hash__(self) -> int:
+        # Países iguales tienen el mismo ID, así que basta con hashear el entero
+        return hash(self._id_pais)
 
     def __str__(self) -> str:
-        return f"País(ID: {self.id_pais}, Nombre: '{self.nombre_pais}', Código: '{self.codigo_pais or ''}')"
+        return f"País(ID: {self._id_pais}, Nombre: '{self._nombre_pais}', Código: '{self._codigo_pais or ''}')"
 
     def __repr__(self) -> str:
-        return f"Pais(id_pais={self.id_pais!r}, nombre_pais={self.nombre_pais!r}, codigo_pais={self.codigo_pais!r})"
\ No newline at end of file
+        return f"Pais(id_pais={self._id_pais!r}, nombre_pais={self._nombre_pais!r}, codigo_pais={self._codigo_pais!r})"
\ No newline at end of file
@@ -1,11 +1,85 @@
+import re
+import sys
 from datetime import time
-from decimal import Decimal, InvalidOperation
+from decimal import Context, Decimal, InvalidOperation
+
+import numpy as np
+import pandas as pd
+
+# Escala del precio en representación entera: 4 decimales, el máximo que admite el setter de precio
+ESCALA_PRECIO = 10_000
+
+# Valores admitidos por los setters; se construyen una sola vez en lugar de en cada asignación
+_CATEGORIAS_VALIDAS = frozenset(range(1, 12))
+_CATEGORIAS_VALIDAS_ORDENADAS = sorted(_CATEGORIAS_VALIDAS)
+_CLASES_VALIDAS = frozenset(('Low', 'Medium', 'High'))
+_RESISTENCIAS_VALIDAS = frozenset(('Durable', 'Weak', 'Unknown'))
+# Cada texto válido apunta a una única instancia compartida: todos los productos reutilizan el mismo
+# objeto str y las comparaciones como clase_producto == 'High' se resuelven por identidad
+_CLASES_CANONICAS = {sys.intern(clase): sys.intern(clase) for clase in _CLASES_VALIDAS}
+_RESISTENCIAS_CANONICAS = {sys.intern(resistencia): sys.intern(resistencia) for resistencia in _RESISTENCIAS_VALIDAS}
+_CATEGORIAS_PERECEDERAS = frozenset((2, 4, 6, 7, 10))
+
+# Formato "MM:SS.f" de ModifyDate y multiplicador de microsegundos según la cantidad de dígitos fraccionarios
+_PATRON_HORA_MODIFICACION = re.compile(r'(\d{1,2}):(\d{1,2})(?:\.(\d*))?$')
+_ESCALA_MICROSEGUNDOS = (0, 100_000, 10_000, 1_000, 100, 10, 1)
+
+# Valores aceptados para es_alergenico. Las grafías habituales se resuelven con una sola búsqueda;
+# el resto se normaliza con strip().upper() y se busca en la forma canónica.
+_ALERGENICO_CANONICO = {'TRUE': True, 'FALSE': False, 'UNKNOWN': None, '': None}
+_ALERGENICO_POR_TEXTO = {
+    **_ALERGENICO_CANONICO,
+    'True': True, 'true': True,
+    'False': False, 'false': False,
+    'Unknown': None, 'unknown': None,
+}
+
+# Límites del setter de precio
+_PRECIO_MINIMO = Decimal('0')
+_PRECIO_MAXIMO = Decimal('999999.99')
+# 10 dígitos bastan para cualquier precio válido (6 enteros + 4 decimales); pasar el contexto
+# explícitamente evita además consultar el contexto decimal del hilo en cada operación
+_CONTEXTO_PRECIO = Context(prec=10)
+
+# Límites de los setters expresados sobre las representaciones numéricas, para validar lotes completos
+_PRECIO_ESCALADO_MAXIMO = 999_999_99 * ESCALA_PRECIO // 100
+_DIAS_VITALIDAD_MAXIMO = 3650
+
+# Fragmentos de obtener_descripcion_detallada; los textos fijos se comparten entre llamadas
+_VITALIDAD_NO_PERECEDERO = "Vitalidad: Producto no perecedero"
+_VITALIDAD_MUY_PERECEDERO_TPL = "Vitalidad: %d días (muy perecedero)"
+_VITALIDAD_PERECEDERO_TPL = "Vitalidad: %d días (perecedero)"
+_VITALIDAD_LARGA_DURACION_TPL = "Vitalidad: %d días (larga duración)"
+_DESCRIPCION_ALERGENICO = {True: "⚠️ PRODUCTO ALERGÉNICO", False: "No alergénico"}
+
+# Códigos enteros para los campos categóricos; 0 representa None
+CODIGOS_CLASE_PRODUCTO = {None: 0, 'Low': 1, 'Medium': 2, 'High': 3}
+CODIGOS_RESISTENCIA = {None: 0, 'Durable': 1, 'Weak': 2, 'Unknown': 3}
+_CLASES_POR_CODIGO = {codigo: clase for clase, codigo in CODIGOS_CLASE_PRODUCTO.items()}
+_RESISTENCIAS_POR_CODIGO = {codigo: resistencia for resistencia, codigo in CODIGOS_RESISTENCIA.items()}
+
+# Registro numérico de un producto para análisis vectorizado sobre arreglos estructurados de NumPy.
+# Los valores ausentes de es_alergenico, dias_vitalidad y hora_modificacion_us se guardan como -1.
+PRODUCTO_DTYPE = np.dtype([
+    ('id_producto', 'i4'),
+    ('id_categoria', 'i1'),
+    ('precio_escalado', 'i8'),
+    ('dias_vitalidad', 'i2'),
+    ('es_alergenico', 'i1'),
+    ('clase_producto', 'u1'),
+    ('resistente', 'u1'),
+    ('hora_modificacion_us', 'i8'),
+])
+
 
 class Producto:
     """
     Representa un producto en el sistema de análisis de ventas.
     Incluye validaciones mejoradas para integridad de datos.
     """
+    __slots__ = ('_id_producto', '_nombre_producto', '_precio_escalado', '_id_categoria', '_clase_producto',
+                 '_hora_modificacion', '_resistente', '_es_alergenico', '_dias_vitalidad')
+
 
     def __init__(self, id_producto: int, nombre_producto: str, precio: Decimal | float | str, id_categoria: int,
                  clase_producto: str | None = None, 
@@ -35,9 +109,9 @@ class Producto:
         self._nombre_producto = nombre_producto
         self.precio = precio  # Utiliza el setter para validación y conversión
         self._id_categoria = id_categoria
-        self._clase_producto = clase_producto
+        self._clase_producto = _CLASES_CANONICAS.get(clase_producto, clase_producto)
         self._hora_modificacion = hora_modificacion
-        self._resistente = resistente
+        self._resistente = _RESISTENCIAS_CANONICAS.get(resistente, resistente)
         self._es_alergenico = es_alergenico
         self.dias_vitalidad = dias_vitalidad # Utiliza el setter para validación y conversión
 
@@ -49,28 +123,50 @@ class Producto:
         Este método es útil si se necesita procesar el string ANTES de pasarlo al constructor.
         """
         try:
-            parts = time_str.split(':')
-            if len(parts) != 2:
+            coincidencia = _PATRON_HORA_MODIFICACION.match(time_str.strip())
+            if coincidencia is None:
                 raise ValueError("Formato debe ser MM:SS.f o MM:SS")
 
-            minutes = int(parts[0])
-            
-            seconds_parts = parts[1].split('.')
-            seconds = int(seconds_parts[0])
-            
-            microseconds = 0
-            if len(seconds_parts) > 1:
-                tenths_str = seconds_parts[1]
-                if len(tenths_str) > 0: 
-                    microseconds = int(tenths_str.ljust(6, '0')[:6])
-
-            if not (0 <= minutes <= 59 and 0 <= seconds <= 59):
+            minutos_str, segundos_str, fraccion = coincidencia.groups()
+            minutes = int(minutos_str)
+            seconds = int(segundos_str)
+            if minutes > 59 or seconds > 59:
                 raise ValueError("Minutos o segundos fuera de rango para un objeto time.")
 
+            microseconds = 0
+            if fraccion:
+                fraccion = fraccion[:6]
+                microseconds = int(fraccion) * _ESCALA_MICROSEGUNDOS[len(fraccion)]
+
             return time(hour=0, minute=minutes, second=seconds, microsecond=microseconds)
         except ValueError as e:
             raise ValueError(f"Formato de ModifyDate '{time_str}' no es válido para convertir a time: {e}") from e
 
+    @staticmethod
+    def parsear_horas_modificacion(serie: pd.Series) -> pd.Series:
+        """
+        Versión vectorizada de `_parse_modify_date_str` para columnas completas de un CSV.
+        Devuelve los microsegundos desde la medianoche (int64), con -1 para valores nulos o vacíos,
+        igual que el campo `hora_modificacion_us` de PRODUCTO_DTYPE.
+        """
+        texto = serie.astype('string').str.strip()
+        vacios = texto.isna() | (texto == '')
+        partes = texto.str.extract(_PATRON_HORA_MODIFICACION)
+
+        invalidos = ~vacios & partes[0].isna()
+        minutos = partes[0].fillna('0').astype('int64')
+        segundos = partes[1].fillna('0').astype('int64')
+        invalidos |= (minutos > 59) | (segundos > 59)
+        if invalidos.any():
+            primero = serie[invalidos].iloc[0]
+            raise ValueError(f"Formato de ModifyDate '{primero}' no es válido para convertir a time "
+                             f"({int(invalidos.sum())} valores inválidos).")
+
+        # Se completa la fracción a 6 dígitos para leerla directamente como microsegundos
+        fraccion = partes[2].fillna('').str.slice(0, 6).str.pad(6, side='right', fillchar='0').astype('int64')
+        microsegundos = (minutos * 60 + segundos) * 1_000_000 + fraccion
+        return microsegundos.where(~vacios, -1).astype('int64')
+
     @staticmethod
     def _parse_es_alergenico_str(alergenico_str: str | None) -> bool | None:
         """
@@ -79,16 +175,33 @@ class Producto:
         """
         if alergenico_str is None:
             return None
-        
+
+        if alergenico_str in _ALERGENICO_POR_TEXTO:
+            return _ALERGENICO_POR_TEXTO[alergenico_str]
+
         valor_limpio_upper = alergenico_str.strip().upper()
-        if valor_limpio_upper == 'TRUE':
-            return True
-        elif valor_limpio_upper == 'FALSE':
-            return False
-        elif valor_limpio_upper == 'UNKNOWN' or valor_limpio_upper == '':
-            return None
-        else:
-            raise ValueError(f"El valor alergénico '{alergenico_str}' no es válido. Use 'TRUE', 'FALSE', 'Unknown'.")
+        if valor_limpio_upper in _ALERGENICO_CANONICO:
+            return _ALERGENICO_CANONICO[valor_limpio_upper]
+        raise ValueError(f"El valor alergénico '{alergenico_str}' no es válido. Use 'TRUE', 'FALSE', 'Unknown'.")
+
+    @staticmethod
+    def parsear_es_alergenico(serie: pd.Series) -> pd.Series:
+        """
+        Versión vectorizada de `_parse_es_alergenico_str` para columnas completas de un CSV.
+        Devuelve una serie de tipo 'boolean' de pandas, con <NA> para 'Unknown', vacíos y nulos.
+        """
+        texto = serie.astype('string')
+        conocidos = texto.isin(_ALERGENICO_POR_TEXTO.keys())
+        # Solo las grafías poco habituales pasan por la normalización de strings
+        normalizado = texto.where(conocidos, texto.str.strip().str.upper())
+
+        invalidos = texto.notna() & ~normalizado.isin(_ALERGENICO_POR_TEXTO.keys())
+        if invalidos.any():
+            primero = serie[invalidos].iloc[0]
+            raise ValueError(f"El valor alergénico '{primero}' no es válido. Use 'TRUE', 'FALSE', 'Unknown' "
+                             f"({int(invalidos.sum())} valores inválidos).")
+
+        return normalizado.map(_ALERGENICO_POR_TEXTO, na_action='ignore').astype('boolean')
 
 
     @property
@@ -122,22 +235,46 @@ class Producto:
 
     @property
     def precio(self) -> Decimal:
-        return self._precio
+        # Se reconstruye desde el entero escalado; siempre con 4 decimales
+        return Decimal(self._precio_escalado).scaleb(-4, _CONTEXTO_PRECIO)
+
+    @property
+    def precio_escalado(self) -> int:
+        """Precio como entero en diezmilésimas (precio * ESCALA_PRECIO), para sumas y comparaciones rápidas."""
+        return self._precio_escalado
 
     @precio.setter
     def precio(self, valor: Decimal | float | str):
+        tipo = type(valor)
+        if tipo is int:
+            # Los enteros no necesitan pasar por Decimal: se escalan directamente
+            if valor < 0:
+                raise ValueError("El precio no puede ser negativo.")
+            if valor > 999999:
+                raise ValueError("El precio no puede exceder $999,999.99.")
+            self._precio_escalado = valor * ESCALA_PRECIO
+            return
+
         try:
-            nuevo_precio = Decimal(str(valor))
+            if tipo is Decimal:
+                nuevo_precio = valor
+            elif tipo is str:
+                nuevo_precio = Decimal(valor)
+            elif isinstance(valor, float):
+                # repr da el decimal más corto que representa al float (25.5 y no 25.499999...)
+                nuevo_precio = Decimal(repr(float(valor)))
+            else:
+                nuevo_precio = Decimal(str(valor))
         except (InvalidOperation, TypeError) as e:
             raise ValueError(f"El precio debe ser un valor numérico válido: {e}")
 
-        if nuevo_precio < Decimal('0'):
+        if nuevo_precio < _PRECIO_MINIMO:
             raise ValueError("El precio no puede ser negativo.")
-        if nuevo_precio > Decimal('999999.99'):
+        if nuevo_precio > _PRECIO_MAXIMO:
             raise ValueError("El precio no puede exceder $999,999.99.")
         if nuevo_precio.as_tuple().exponent < -4:
             raise ValueError("El precio no puede tener más de 4 decimales.")
-        self._precio = nuevo_precio
+        self._precio_escalado = int(nuevo_precio.scaleb(4, _CONTEXTO_PRECIO))
 
     @property
     def id_categoria(self) -> int:
@@ -150,9 +287,8 @@ class Producto:
         if valor <= 0:
             raise ValueError("El ID de categoría debe ser un número positivo.")
         
-        categorias_validas = set(range(1, 12)) 
-        if valor not in categorias_validas:
-            raise ValueError(f"El ID de categoría {valor} no es válido. IDs válidos: {sorted(list(categorias_validas))}")
+        if valor not in _CATEGORIAS_VALIDAS:
+            raise ValueError(f"El ID de categoría {valor} no es válido. IDs válidos: {_CATEGORIAS_VALIDAS_ORDENADAS}")
         self._id_categoria = valor
 
     @property
@@ -169,10 +305,10 @@ class Producto:
         
         valor_limpio = valor.strip()
         if valor_limpio:
-            clases_validas = {'Low', 'Medium', 'High'}
-            if valor_limpio not in clases_validas:
-                raise ValueError(f"La clase '{valor_limpio}' no es válida. Clases válidas: {clases_validas}")
-            self._clase_producto = valor_limpio
+            canonica = _CLASES_CANONICAS.get(valor_limpio)
+            if canonica is None:
+                raise ValueError(f"La clase '{valor_limpio}' no es válida. Clases válidas: {set(_CLASES_VALIDAS)}")
+            self._clase_producto = canonica
         else:
             self._clase_producto = None
 
@@ -203,10 +339,10 @@ class Producto:
         
         valor_limpio = valor.strip()
         if valor_limpio:
-            resistencias_validas = {'Durable', 'Weak', 'Unknown'}
-            if valor_limpio not in resistencias_validas:
-                raise ValueError(f"La resistencia '{valor_limpio}' no es válida. Valores válidos: {resistencias_validas}")
-            self._resistente = valor_limpio
+            canonica = _RESISTENCIAS_CANONICAS.get(valor_limpio)
+            if canonica is None:
+                raise ValueError(f"La resistencia '{valor_limpio}' no es válida. Valores válidos: {set(_RESISTENCIAS_VALIDAS)}")
+            self._resistente = canonica
         else:
             self._resistente = None
 
@@ -232,21 +368,109 @@ class Producto:
         if valor is None:
             self._dias_vitalidad = None
             return
-        
-        try:
-            valor_entero = int(valor)
-        except (ValueError, TypeError):
-            raise TypeError("Los días de vitalidad deben ser un número entero o None.")
+
+        if type(valor) is int:
+            valor_entero = valor
+        else:
+            try:
+                valor_entero = int(valor)
+            except (ValueError, TypeError):
+                raise TypeError("Los días de vitalidad deben ser un número entero o None.")
 
         if valor_entero < 0:
             raise ValueError("Los días de vitalidad no pueden ser negativos.")
-        if valor_entero > 3650:
+        if valor_entero > _DIAS_VITALIDAD_MAXIMO:
             raise ValueError("Los días de vitalidad no pueden exceder 3650 días (10 años).")
         self._dias_vitalidad = valor_entero
 
+    def a_registro(self) -> tuple:
+        """Devuelve el producto como tupla compatible con PRODUCTO_DTYPE (sin el nombre)."""
+        hora = self._hora_modificacion
+        return (
+            self._id_producto,
+            self._id_categoria,
+            self._precio_escalado,
+            -1 if self._dias_vitalidad is None else self._dias_vitalidad,
+            -1 if self._es_alergenico is None else int(self._es_alergenico),
+            CODIGOS_CLASE_PRODUCTO.get(self._clase_producto, 0),
+            CODIGOS_RESISTENCIA.get(self._resistente, 0),
+            -1 if hora is None else ((hora.hour * 60 + hora.minute) * 60 + hora.second) * 1_000_000 + hora.microsecond,
+        )
+
+    @staticmethod
+    def a_arreglo(productos) -> np.ndarray:
+        """
+        Convierte una colección de productos en un arreglo estructurado con PRODUCTO_DTYPE.
+        Las sumas y filtros se hacen luego por columna, p. ej. arreglo['precio_escalado'].sum() / ESCALA_PRECIO
+        o arreglo[arreglo['id_categoria'] == 3], sin recorrer objetos Python.
+        """
+        return np.array([producto.a_registro() for producto in productos], dtype=PRODUCTO_DTYPE)
+
+    @staticmethod
+    def validar_lote(id_categoria, dias_vitalidad, precio_escalado) -> np.ndarray:
+        """
+        Aplica en bloque las reglas de los setters de id_categoria, dias_vitalidad y precio
+        sobre columnas numéricas (p. ej. las de un arreglo con PRODUCTO_DTYPE) y devuelve una
+        máscara booleana con las filas válidas. Los días de vitalidad ausentes se codifican como -1.
+        """
+        id_categoria = np.asarray(id_categoria)
+        dias_vitalidad = np.asarray(dias_vitalidad)
+        precio_escalado = np.asarray(precio_escalado)
+
+        mascara = (id_categoria >= 1) & (id_categoria <= 11)
+        mascara &= (precio_escalado >= 0) & (precio_escalado <= _PRECIO_ESCALADO_MAXIMO)
+        mascara &= (dias_vitalidad >= -1) & (dias_vitalidad <= _DIAS_VITALIDAD_MAXIMO)
+        return mascara
+
+    @classmethod
+    def _sin_validar(cls, id_producto: int, nombre_producto: str, precio_escalado: int, id_categoria: int,
+                     clase_producto: str | None = None, hora_modificacion: time | None = None,
+                     resistente: str | None = None, es_alergenico: bool | None = None,
+                     dias_vitalidad: int | None = None) -> 'Producto':
+        """
+        Construye un producto asignando los atributos directamente, sin pasar por los setters.
+        Solo para cargas masivas cuyos datos ya se validaron (p. ej. con `validar_lote`);
+        el precio se recibe ya escalado por ESCALA_PRECIO.
+        """
+        producto = cls.__new__(cls)
+        producto._id_producto = id_producto
+        producto._nombre_producto = nombre_producto
+        producto._precio_escalado = precio_escalado
+        producto._id_categoria = id_categoria
+        producto._clase_producto = _CLASES_CANONICAS.get(clase_producto, clase_producto)
+        producto._hora_modificacion = hora_modificacion
+        producto._resistente = _RESISTENCIAS_CANONICAS.get(resistente, resistente)
+        producto._es_alergenico = es_alergenico
+        producto._dias_vitalidad = dias_vitalidad
+        return producto
+
+    @classmethod
+    def desde_registro(cls, registro, nombre_producto: str) -> 'Producto':
+        """Reconstruye un Producto a partir de un elemento de un arreglo con PRODUCTO_DTYPE."""
+        hora_us = int(registro['hora_modificacion_us'])
+        hora = None
+        if hora_us >= 0:
+            segundos, microsegundos = divmod(hora_us, 1_000_000)
+            minutos, segundos = divmod(segundos, 60)
+            horas, minutos = divmod(minutos, 60)
+            hora = time(horas, minutos, segundos, microsegundos)
+        es_alergenico = int(registro['es_alergenico'])
+        dias_vitalidad = int(registro['dias_vitalidad'])
+        # Los registros provienen de productos ya validados, así que no se repiten las validaciones
+        return cls._sin_validar(
+            id_producto=int(registro['id_producto']),
+            nombre_producto=nombre_producto,
+            precio_escalado=int(registro['precio_escalado']),
+            id_categoria=int(registro['id_categoria']),
+            clase_producto=_CLASES_POR_CODIGO[int(registro['clase_producto'])],
+            hora_modificacion=hora,
+            resistente=_RESISTENCIAS_POR_CODIGO[int(registro['resistente'])],
+            es_alergenico=None if es_alergenico < 0 else bool(es_alergenico),
+            dias_vitalidad=None if dias_vitalidad < 0 else dias_vitalidad,
+        )
+
     def validar_integridad_completa(self) -> bool:
-        categorias_perecederas = {2, 4, 6, 7, 10} 
-        if self.id_categoria in categorias_perecederas and self.dias_vitalidad is None:
+        if self.id_categoria in _CATEGORIAS_PERECEDERAS and self.dias_vitalidad is None:
             raise ValueError(
                 f"Productos de categoría perecedera (ID: {self.id_categoria}) "
                 f"deberían tener días de vitalidad definidos."
@@ -258,105 +482,51 @@ class Producto:
         return True
 
     def obtener_descripcion_detallada(self) -> str:
-        partes = [
-            f"Producto: {self.nombre_producto}",
-            f"Precio: ${self.precio:.2f}",
-            f"Categoría ID: {self.id_categoria}"
-        ]
-        if self.clase_producto: partes.append(f"Clase: {self.clase_producto}")
-        if self.dias_vitalidad is not None:
-            if self.dias_vitalidad == 0: partes.append("Vitalidad: Producto no perecedero")
-            elif self.dias_vitalidad <= 7: partes.append(f"Vitalidad: {self.dias_vitalidad} días (muy perecedero)")
-            elif self.dias_vitalidad <= 30: partes.append(f"Vitalidad: {self.dias_vitalidad} días (perecedero)")
-            else: partes.append(f"Vitalidad: {self.dias_vitalidad} días (larga duración)")
-        if self.es_alergenico is True: partes.append("⚠️ PRODUCTO ALERGÉNICO")
-        elif self.es_alergenico is False: partes.append("No alergénico")
-        if self.hora_modificacion:
-            formatted_time = self.hora_modificacion.strftime('%M:%S')
-            if self.hora_modificacion.microsecond > 0:
-                decima_segundo = self.hora_modificacion.microsecond // 100000
-                if decima_segundo > 0: formatted_time += f".{decima_segundo}"
-            partes.append(f"Modificado: {formatted_time}")
-        return " | ".join(partes)
+        # Como máximo hay 7 fragmentos: se reserva la lista completa y se recorta al final
+        partes = [None] * 7
+        partes[0] = "Producto: %s" % self._nombre_producto
+        partes[1] = "Precio: ${:.2f}".format(self.precio)
+        partes[2] = "Categoría ID: %s" % self._id_categoria
+        k = 3
+        if self._clase_producto:
+            partes[k] = "Clase: %s" % self._clase_producto
+            k += 1
+        dias = self._dias_vitalidad
+        if dias is not None:
+            if dias == 0: partes[k] = _VITALIDAD_NO_PERECEDERO
+            elif dias <= 7: partes[k] = _VITALIDAD_MUY_PERECEDERO_TPL % dias
+            elif dias <= 30: partes[k] = _VITALIDAD_PERECEDERO_TPL % dias
+            else: partes[k] = _VITALIDAD_LARGA_DURACION_TPL % dias
+            k += 1
+        if self._es_alergenico is not None:
+            partes[k] = _DESCRIPCION_ALERGENICO[self._es_alergenico]
+            k += 1
+        hora = self._hora_modificacion
+        if hora:
+            decima_segundo = hora.microsecond // 100000 if hora.microsecond else 0
+            if decima_segundo:
+                partes[k] = "Modificado: %02d:%02d.%d" % (hora.minute, hora.second, decima_segundo)
+            else:
+                partes[k] = "Modificado: %02d:%02d" % (hora.minute, hora.second)
+            k += 1
+        return " | ".join(partes[:k])
+
+    def __eq__(self, otro) -> bool:
+        """Dos productos son iguales si tienen el mismo ID; permite deduplicar con set() o usarlos como clave."""
+        if type(otro) is not Producto:
+            return NotImplemented
+        return self._id_producto == otro._id_producto
+
+    def __hash__(self) -> int:
+        # No cambiar id_producto mientras el producto esté dentro de un set o como clave de un dict
+        return hash(self._id_producto)
 
     def __str__(self) -> str:
-        return f"Producto(ID: {self.id_producto}, Nombre: '{self.nombre_producto}', Precio: ${self.precio:.2f})"
+        return f"Producto(ID: {self._id_producto}, Nombre: '{self._nombre_producto}', Precio: ${self.precio:.2f})"
 
     def __repr__(self) -> str:
-        return (f"Producto(id_producto={self.id_producto!r}, nombre_producto={self.nombre_producto!r}, "
-                f"precio={self.precio!r}, id_categoria={self.id_categoria!r}, "
-                f"clase_producto={self.clase_producto!r}, hora_modificacion={self.hora_modificacion!r}, "
-                f"resistente={self.resistente!r}, es_alergenico={self.es_alergenico!r}, "
-                f"dias_vitalidad={self.dias_vitalidad!r})")
-
-# --- Ejemplo de uso (para probar la clase) ---
-if __name__ == '__main__':
-    try:
-        # Para instanciar Producto ahora, se necesita pre-procesar algunos datos
-
-        # Pre-procesamiento para producto1
-        hm1_str = "21:49.2"
-        ea1_str = "Unknown"
-        
-        hm1_obj = Producto._parse_modify_date_str(hm1_str)
-        ea1_bool = Producto._parse_es_alergenico_str(ea1_str)
-
-        producto1 = Producto(
-            id_producto=1,
-            nombre_producto="Flour - Whole Wheat".strip(), # Asegurar que está limpio
-            precio="74.2988", 
-            id_categoria=3, # Asumir validado
-            clase_producto="Medium", # Asumir validado
-            hora_modificacion=hm1_obj, # Pasar objeto time
-            resistente="Durable", # Asumir validado
-            es_alergenico=ea1_bool, # Pasar bool|None
-            dias_vitalidad=0
-        )
-        print(producto1)
-        print(producto1.obtener_descripcion_detallada())
-        print(repr(producto1))
-
-        # Pre-procesamiento para producto2
-        hm2_obj = time(0, 13, 35, 400000) # Ya es un objeto time
-        ea2_bool = True # Ya es un booleano
-
-        producto2 = Producto(
-            id_producto=5,
-            nombre_producto="Artichokes - Jerusalem".strip(),
-            precio=Decimal('65.4771'), 
-            id_categoria=2,
-            clase_producto="Low",
-            hora_modificacion=hm2_obj,
-            resistente="Durable",
-            es_alergenico=ea2_bool,
-            dias_vitalidad=27
-        )
-        print(producto2)
-        print(producto2.obtener_descripcion_detallada())
-        
-        # Pre-procesamiento para producto_clase_precio
-        hm3_str = "23:48.2"
-        ea3_str = "TRUE"
-        hm3_obj = Producto._parse_modify_date_str(hm3_str)
-        ea3_bool = Producto._parse_es_alergenico_str(ea3_str)
-
-        producto_clase_precio = Producto(
-             id_producto=28,
-             nombre_producto="Sobe - Tropical Energy".strip(),
-             precio="12.3153",
-             id_categoria=9,
-             clase_producto="High", 
-             hora_modificacion=hm3_obj,
-             resistente="Durable",
-             es_alergenico=ea3_bool,
-             dias_vitalidad=0
-        )
-        print(producto_clase_precio.obtener_descripcion_detallada())
-
-        print("\nProbando hora_modificacion con solo segundos:")
-        p_test_time = Producto(1000, "Test Time", "10", 1, hora_modificacion=Producto._parse_modify_date_str("15:30"))
-        print(p_test_time.obtener_descripcion_detallada())
-        assert p_test_time.hora_modificacion == time(0, 15, 30, 0)
-
-    except (TypeError, ValueError) as e:
-        print(f"\nError durante la creación del producto o prueba: {e}")
\ No newline at end of file
+        return (f"Producto(id_producto={self._id_producto!r}, nombre_producto={self._nombre_producto!r}, "
+                f"precio={self.precio!r}, id_categoria={self._id_categoria!r}, "
+                f"clase_producto={self._clase_producto!r}, hora_modificacion={self._hora_modificacion!r}, "
+                f"resistente={self._resistente!r}, es_alergenico={self._es_alergenico!r}, "
+                f"dias_vitalidad={self._dias_vitalidad!r})")
@@ -1,10 +1,19 @@
 from datetime import time
 from decimal import Decimal, InvalidOperation
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+_CERO = Decimal(0)
 
 class Venta:
     """
     Representa una transacción de venta en el sistema.
     """
+    __slots__ = ('_id_venta', '_id_empleado_vendedor', '_id_producto', '_id_cliente', '_cantidad',
+                 '_descuento', '_precio_total', '_hora_venta', '_numero_transaccion')
+
     def __init__(self, id_venta: int, id_producto: int, id_cliente: int, cantidad: int, 
                  precio_total: Decimal, id_empleado_vendedor: int | None = None, 
                  descuento: Decimal | None = None, hora_venta: time | None = None, # Cambiado SalesDate a hora_venta
@@ -33,6 +42,79 @@ class Venta:
         self._hora_venta = hora_venta
         self._numero_transaccion = numero_transaccion
 
+    @classmethod
+    def desde_dataframe(cls, df) -> list['Venta']:
+        """
+        Crea objetos Venta a partir de un DataFrame con las columnas de la tabla sales (SalesID,
+        ProductID, CustomerID, Quantity, TotalPrice y, opcionalmente, SalesPersonID, Discount,
+        SalesDate y TransactionNumber).
+
+        Las validaciones de los setters se aplican una sola vez sobre columnas completas y luego
+        los objetos se arman asignando los atributos directamente, sin pasar por los setters.
+        Si alguna fila no es válida se lanza ValueError y no se crea ninguna venta.
+
+        Args:
+            df (pd.DataFrame): Resultado de una consulta sobre sales.
+        """
+        def columna(nombre: str, opcional: bool = False):
+            if opcional and nombre not in df.columns:
+                return repeat(None)
+            serie = df[nombre]
+            return serie.astype(object).where(serie.notna(), None).tolist()
+
+        cantidades = df['Quantity'].to_numpy()
+        if cantidades.dtype.kind not in 'iu':
+            # Columnas object (ints de Python, Decimal de MySQL DECIMAL) o nullable se convierten una sola vez;
+            # solo se rechazan los valores nulos, no enteros o booleanos
+            try:
+                numericas = pd.to_numeric(df['Quantity'])
+            except (ValueError, TypeError):
+                raise ValueError("La cantidad debe ser un entero positivo.")
+            if pd.api.types.is_bool_dtype(numericas):
+                raise ValueError("La cantidad debe ser un entero positivo.")
+            cantidades = numericas.to_numpy(dtype=np.float64, na_value=np.nan)
+            if not np.all(np.isfinite(cantidades) & (cantidades == np.floor(cantidades))):
+                raise ValueError("La cantidad debe ser un entero positivo.")
+            cantidades = cantidades.astype(np.int64)
+        if not (cantidades > 0).all():
+            raise ValueError("La cantidad debe ser un entero positivo.")
+
+        try:
+            precios = [valor if type(valor) is Decimal else Decimal(valor) for valor in df['TotalPrice'].tolist()]
+            # Sin columna Discount no se recorre nada: columna() devolvería un repeat(None) infinito
+            descuentos = repeat(None)
+            if 'Discount' in df.columns:
+                descuentos = [valor if valor is None or type(valor) is Decimal else Decimal(valor)
+                              for valor in columna('Discount')]
+        except (InvalidOperation, TypeError):
+            raise ValueError("El precio total y el descuento deben ser valores numéricos válidos.")
+        if 'Discount' in df.columns and any(descuento is not None and descuento < _CERO for descuento in descuentos):
+            raise ValueError("El descuento no puede ser negativo.")
+
+        # Con nulos, pandas guarda SalesPersonID como float: se vuelve a int para igualar al constructor
+        if 'SalesPersonID' in df.columns:
+            ids_empleado = [None if valor is None else int(valor) for valor in columna('SalesPersonID')]
+        else:
+            ids_empleado = repeat(None)
+
+        ventas = []
+        for id_venta, id_producto, id_cliente, cantidad, precio_total, id_empleado, descuento, hora, numero in zip(
+                df['SalesID'].tolist(), df['ProductID'].tolist(), df['CustomerID'].tolist(), cantidades.tolist(),
+                precios, ids_empleado, descuentos,
+                columna('SalesDate', opcional=True), columna('TransactionNumber', opcional=True)):
+            venta = cls.__new__(cls)
+            venta._id_venta = id_venta
+            venta._id_empleado_vendedor = id_empleado
+            venta._id_producto = id_producto
+            venta._id_cliente = id_cliente
+            venta._cantidad = cantidad
+            venta._descuento = descuento
+            venta._precio_total = precio_total
+            venta._hora_venta = hora
+            venta._numero_transaccion = numero
+            ventas.append(venta)
+        return ventas
+
     @property
     def id_venta(self) -> int:
         return self._id_venta
@@ -80,11 +162,15 @@ class Venta:
         if valor is None:
             self._descuento = None
             return
-        try:
-            nuevo_descuento = Decimal(valor)
-        except InvalidOperation:
-            raise ValueError("El descuento debe ser un valor numérico válido o None.")
-        if nuevo_descuento < Decimal(0): # Asumiendo que el descuento no puede ser negativo
+        if type(valor) is Decimal:
+            # Los valores leídos de la BD ya llegan como Decimal: no hace falta reconstruirlos
+            nuevo_descuento = valor
+        else:
+            try:
+                nuevo_descuento = Decimal(valor)
+            except InvalidOperation:
+                raise ValueError("El descuento debe ser un valor numérico válido o None.")
+        if nuevo_descuento < _CERO: # Asumiendo que el descuento no puede ser negativo
             raise ValueError("El descuento no puede ser negativo.")
         self._descuento = nuevo_descuento
 
@@ -94,6 +180,9 @@ class Venta:
 
     @precio_total.setter
     def precio_total(self, valor: Decimal | float | str):
+        if type(valor) is Decimal:
+            self._precio_total = valor
+            return
         try:
             nuevo_precio_total = Decimal(valor)
         except InvalidOperation:
@@ -121,10 +210,10 @@ class Venta:
         self._numero_transaccion = valor.strip() if valor else None
 
     def __str__(self) -> str:
-        return (f"Venta(ID: {self.id_venta}, ProductoID: {self.id_producto}, ClienteID: {self.id_cliente}, "
-                f"Total: {self.precio_total:.2f}, Hora: {self.hora_venta})")
+        return (f"Venta(ID: {self._id_venta}, ProductoID: {self._id_producto}, ClienteID: {self._id_cliente}, "
+                f"Total: {self._precio_total:.2f}, Hora: {self._hora_venta})")
 
     def __repr__(self) -> str:
-        return (f"Venta(id_venta={self.id_venta!r}, id_producto={self.id_producto!r}, "
-                f"id_cliente={self.id_cliente!r}, precio_total={self.precio_total!r}, "
-                f"hora_venta={self.hora_venta!r})")
\ No newline at end of file
+        return (f"Venta(id_venta={self._id_venta!r}, id_producto={self._id_producto!r}, "
+                f"id_cliente={self._id_cliente!r}, precio_total={self._precio_total!r}, "
+                f"hora_venta={self._hora_venta!r})")
\ No newline at end of file
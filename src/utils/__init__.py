@@ -1,4 +1,5 @@
 from .fabrica_modelo import FabricaModelos
-from .constructor_consulta import ConstructorConsultaSQL
+from .constructor_consulta import ConstructorConsultaSQL, ConsultaPreparada
+from .pool_objetos import PoolObjetos
 
-__all__ = ['FabricaModelos', 'ConstructorConsultaSQL']
\ No newline at end of file
+__all__ = ['FabricaModelos', 'ConstructorConsultaSQL', 'ConsultaPreparada', 'PoolObjetos']
\ No newline at end of file
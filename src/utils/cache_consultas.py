@@ -1,14 +1,19 @@
+import atexit
 import hashlib
+import importlib.util
+import re
 import pickle
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable
 from pathlib import Path
 import pandas as pd
-from functools import wraps
+from functools import lru_cache, wraps
 import threading
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Importar sistema de logging
 # Se asume que sistema_logging.py está en src/utils/
@@ -28,6 +33,130 @@ except ImportError:
     )
 
 
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Con pyarrow instalado el cache en disco usa Feather (Arrow IPC columnar con LZ4); si no, pickle.
+# pyarrow se importa recién al leer o escribir un archivo para no encarecer el arranque.
+_FEATHER_DISPONIBLE = importlib.util.find_spec('pyarrow') is not None
+# Sin pyarrow, el pickle se comprime con blosc2 (LZ4 + shuffle) si está instalado: archivos varias veces
+# más chicos a cambio de una descompresión de varios GB/s
+_BLOSC2_DISPONIBLE = importlib.util.find_spec('blosc2') is not None
+_EXTENSIONES_CACHE = ('.pkl', '.pkl.blc', '.feather')
+
+# La clave de caché no necesita resistencia criptográfica: se usa xxh3 si está instalado y, si no,
+# blake2b de 8 bytes (más rápido que sha256 en CPUs de 64 bits). CACHE_HASH_SEGURO=true mantiene sha256.
+if os.getenv('CACHE_HASH_SEGURO', 'False').lower() == 'true':
+    def _digerir(contenido: bytes) -> str:
+        return hashlib.sha256(contenido).hexdigest()[:16]
+elif xxhash is not None:
+    def _digerir(contenido: bytes) -> str:
+        return xxhash.xxh3_64_hexdigest(contenido)
+else:
+    def _digerir(contenido: bytes) -> str:
+        return hashlib.blake2b(contenido, digest_size=8).hexdigest()
+
+
+# Las mismas consultas llegan una y otra vez: la normalización y el hash se calculan una sola vez.
+# La normalización (ya codificada en UTF-8) se memoriza aparte para reutilizarla cuando cambian
+# solo los parámetros.
+@lru_cache(maxsize=2048)
+def _normalizar_consulta(consulta_sql: str) -> bytes:
+    return ' '.join(consulta_sql.lower().split()).encode('utf-8')
+
+
+# Tipos cuya representación JSON no puede confundirse con la de otro tipo (1 y 1.0 y true se
+# distinguen). Fechas, Decimal, numpy, etc. se codifican como texto en JSON y chocarían con un str.
+_TIPOS_ESCALARES_JSON = frozenset((str, int, float, bool, type(None)))
+
+
+def _serializar_parametros(parametros: dict) -> bytes:
+    """
+    Serializa los parámetros en forma canónica (claves ordenadas) para la clave de cache.
+    Con orjson se obtienen los bytes directamente, pero solo cuando todas las claves son str y todos
+    los valores son escalares JSON; en cualquier otro caso se usa el repr de los pares ordenados,
+    que conserva el tipo de cada clave y valor (date(2020, 1, 1) no equivale a '2020-01-01').
+    """
+    if orjson is not None and all(
+            type(clave) is str and type(valor) in _TIPOS_ESCALARES_JSON for clave, valor in parametros.items()):
+        try:
+            return orjson.dumps(parametros, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            pass # p. ej. enteros de más de 64 bits
+    # Ordenar por (tipo, repr) evita el TypeError de comparar claves de tipos distintos
+    pares = sorted(parametros.items(), key=lambda par: (type(par[0]).__name__, repr(par[0])))
+    return repr(pares).encode('utf-8')
+
+
+@lru_cache(maxsize=1024)
+def _hash_consulta(consulta_sql: str, parametros_serializados: bytes) -> str:
+    contenido = _normalizar_consulta(consulta_sql)
+    if parametros_serializados:
+        contenido += parametros_serializados
+    return _digerir(contenido) # 16 caracteres hexadecimales
+
+
+@lru_cache(maxsize=1024)
+def _motivo_no_cacheable(consulta_sql: str) -> Optional[str]:
+    """Retorna por qué una consulta no es cacheable, o None si lo es."""
+    consulta_upper = consulta_sql.upper().strip()
+    if not consulta_upper.startswith('SELECT'):
+        return ''
+    funciones_tiempo = ['NOW()', 'CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME', 'RAND()']
+    if any(funcion in consulta_upper for funcion in funciones_tiempo):
+        return "contiene funciones de tiempo/aleatorias"
+    if len(consulta_sql) > 5000: # Evitar cachear consultas SQL extremadamente largas
+        return "demasiado grande"
+    return None
+
+# Tablas tras FROM/JOIN, incluidas las listas separadas por comas ("FROM a x, b y")
+_PATRON_TABLAS = re.compile(r"\b(?:FROM|JOIN)\s+((?:[\w.`]+(?:\s+(?:AS\s+)?\w+)?\s*,\s*)*[\w.`]+)", re.IGNORECASE)
+
+
+# Un nombre de tabla, opcionalmente con esquema y backticks: `ventas`, Sales, `db`.`Sales`
+_PATRON_NOMBRE_TABLA = re.compile(r"`?\w+`?(?:\.`?\w+`?)?")
+
+
+def _normalizar_tabla(referencia: str) -> str:
+    """Nombre de tabla en minúsculas, sin esquema ni backticks."""
+    return referencia.strip('`').rsplit('.', 1)[-1].strip('`').lower()
+
+
+@lru_cache(maxsize=1024)
+def _tablas_de_consulta(consulta_sql: str) -> frozenset:
+    """Extrae en minúsculas los nombres de tabla (sin esquema ni backticks) que referencia la consulta."""
+    tablas = set()
+    for lista in _PATRON_TABLAS.findall(consulta_sql):
+        for referencia in lista.split(','):
+            tablas.add(_normalizar_tabla(referencia.split()[0]))
+    return frozenset(tablas)
+
+
+# Destino de una escritura: UPDATE t, INSERT/REPLACE INTO t, LOAD DATA ... INTO TABLE t,
+# TRUNCATE [TABLE] t, ALTER TABLE t y DROP TABLE [IF EXISTS] t1, t2
+_PATRON_TABLAS_DESTINO = re.compile(
+    r"\b(?:UPDATE(?:\s+(?:LOW_PRIORITY|IGNORE))*|INTO(?:\s+TABLE)?|TRUNCATE(?:\s+TABLE)?"
+    r"|(?:ALTER|DROP)\s+TABLE(?:\s+IF\s+EXISTS)?)\s+((?:[\w.`]+\s*,\s*)*[\w.`]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=1024)
+def _tablas_de_escritura(consulta_sql: str) -> frozenset:
+    """
+    Tablas que puede modificar una sentencia de escritura: su destino más las que referencia por
+    FROM/JOIN (DELETE FROM t, UPDATE multitabla). Un conjunto vacío indica que no se reconoció ninguna.
+    """
+    destinos = {_normalizar_tabla(referencia.strip())
+                for lista in _PATRON_TABLAS_DESTINO.findall(consulta_sql) for referencia in lista.split(',')}
+    return frozenset(destinos) | _tablas_de_consulta(consulta_sql)
+
+
 class GestorCacheConsultas:
     """
     Gestor de cache para consultas SQL que mejora el rendimiento
@@ -49,7 +178,8 @@ class GestorCacheConsultas:
         return cls._instancia
 
     def __init__(self):
-        if not getattr(self, '_inicializado', False):
+        # __new__ siempre deja definido _inicializado, así que basta con leer el atributo
+        if not self._inicializado:
             self._inicializar_cache()
             self._inicializado = True
 
@@ -62,22 +192,55 @@ class GestorCacheConsultas:
         self.cache_habilitado = os.getenv('CACHE_CONSULTAS_HABILITADO', 'True').lower() == 'true'
         self.duracion_cache_minutos = int(os.getenv('CACHE_DURACION_MINUTOS', '15'))
         self.tamaño_maximo_cache = int(os.getenv('CACHE_TAMAÑO_MAXIMO', '100')) # Default 100 si no está en .env
+        # En False los HIT devuelven el mismo objeto cacheado (O(1)); el llamador no debe modificarlo
+        self.copia_al_obtener = os.getenv('CACHE_COPIA_AL_OBTENER', 'True').lower() == 'true'
+        self.limite_tamaño_mb = int(os.getenv('CACHE_LIMITE_TAMAÑO_MB', '50')) # Default 50MB si no está en .env
 
         # Directorio para cache persistente
         self.directorio_cache = Path("cache") # Relativo al directorio de ejecución
         self.directorio_cache.mkdir(exist_ok=True)
-
-        # Cache en memoria (más rápido)
-        self._cache_memoria: Dict[str, Tuple[pd.DataFrame, datetime, int]] = {}
-
-        # Estadísticas
-        self.hits_cache = 0
-        self.misses_cache = 0
-        self.consultas_cacheadas = 0
+        if _FEATHER_DISPONIBLE:
+            self.extension_cache = '.feather'
+        elif _BLOSC2_DISPONIBLE:
+            self.extension_cache = '.pkl.blc'
+        else:
+            self.extension_cache = '.pkl'
+
+        # Cache en memoria (más rápido), en orden LRU: cada HIT mueve la clave al final
+        # y al superar el tamaño máximo se desaloja desde el principio.
+        # Cada entrada es (resultado, vencimiento en ns de time.monotonic_ns(), tamaño en bytes).
+        self._cache_memoria: 'OrderedDict[str, Tuple[pd.DataFrame, int, int]]' = OrderedDict()
+        # Además del número de entradas se acota el total de bytes: un resultado de 50MB no debe
+        # contar lo mismo que uno de una fila
+        self._bytes_en_memoria = 0
+        self._bytes_max = int(os.getenv('CACHE_MEMORIA_MAX_MB', '512')) * 1024 * 1024
+        # Protege solo las mutaciones del OrderedDict y del total de bytes; las lecturas con .get() no lo
+        # toman. Se mantiene aparte de self._lock para no retenerlo durante logging, serialización o E/S.
+        self._mem_lock = threading.Lock()
+        # Se incrementa (bajo _mem_lock) en cada invalidación. Una escritura encolada antes de una
+        # invalidación no debe publicar su archivo después de ella.
+        self._generacion = 0
+
+        # Índice tabla -> claves para invalidar solo lo que depende de una tabla, y su inverso
+        # clave -> consulta para sacar la clave del índice cuando la entrada deja la memoria. Ambos solo
+        # cubren las entradas en memoria y se modifican bajo _mem_lock. Para los archivos en disco que el
+        # índice no conoce se anota cuándo se invalidó cada tabla.
+        self._claves_por_tabla: Dict[str, set] = {}
+        self._consulta_por_clave: Dict[str, str] = {}
+        self._tablas_invalidadas: Dict[str, datetime] = {}
+
+        # Estadísticas. `+= 1` no es atómico entre hilos, así que los contadores se incrementan bajo _mem_lock
+        self._contadores = {'hits': 0, 'misses': 0, 'cacheadas': 0}
         self.ultimo_cleanup = datetime.now()
+        # La limpieza de expirados se dispara desde los accesos al cache, como mucho una vez por hora
+        self._intervalo_limpieza_ns = 3600 * 1_000_000_000
+        self._proxima_limpieza_ns = time.monotonic_ns() + self._intervalo_limpieza_ns
+        self._limpieza_en_curso = False
 
-        # Configurar limpieza automática cada hora
-        self._programar_limpieza_automatica()
+        # La escritura en disco se hace en un único hilo de fondo: el llamador recupera el control tras
+        # guardar en memoria. Un solo worker mantiene el orden de escritura; al salir se vacía la cola.
+        self._io_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='cache-io')
+        atexit.register(self._io_executor.shutdown, wait=True)
 
         self.logger.info(f"Cache de consultas inicializado - Habilitado: {self.cache_habilitado}")
         self.logger.info(f"Configuración: duración={self.duracion_cache_minutos}min, tamaño_max={self.tamaño_maximo_cache}")
@@ -91,15 +254,10 @@ class GestorCacheConsultas:
         Returns:
             str: Clave hash única para el cache
         """
-        consulta_normalizada = ' '.join(consulta_sql.lower().split())
-        contenido_cache = consulta_normalizada
-        if parametros:
-            params_ordenados = sorted(parametros.items())
-            contenido_cache += str(params_ordenados)
-
-        hash_objeto = hashlib.sha256(contenido_cache.encode('utf-8'))
-        clave_cache = hash_objeto.hexdigest()[:16] # Usar solo primeros 16 caracteres
-        self.logger.debug(f"Clave de cache generada: {clave_cache} para consulta: {consulta_sql[:50]}...")
+        parametros_serializados = _serializar_parametros(parametros) if parametros else b''
+        clave_cache = _hash_consulta(consulta_sql, parametros_serializados)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Clave de cache generada: {clave_cache} para consulta: {consulta_sql[:50]}...")
         return clave_cache
 
     def _es_consulta_cacheable(self, consulta_sql: str) -> bool:
@@ -110,179 +268,349 @@ class GestorCacheConsultas:
         Returns:
             bool: True si la consulta puede ser cacheada
         """
-        consulta_upper = consulta_sql.upper().strip()
-        if not consulta_upper.startswith('SELECT'):
-            return False
-        funciones_tiempo = ['NOW()', 'CURRENT_TIMESTAMP', 'CURRENT_DATE', 'CURRENT_TIME', 'RAND()']
-        if any(funcion in consulta_upper for funcion in funciones_tiempo):
-            self.logger.debug("Consulta no cacheable: contiene funciones de tiempo/aleatorias")
-            return False
-        if len(consulta_sql) > 5000: # Evitar cachear consultas SQL extremadamente largas
-            self.logger.debug("Consulta no cacheable: demasiado grande")
-            return False
-        return True
+        motivo = _motivo_no_cacheable(consulta_sql)
+        if motivo:
+            self.logger.debug("Consulta no cacheable: %s", motivo)
+        return motivo is None
+
+    def _contar(self, nombre: str):
+        """Incrementa un contador de estadísticas ('hits', 'misses' o 'cacheadas')."""
+        with self._mem_lock:
+            self._contadores[nombre] += 1
+
+    @property
+    def hits_cache(self) -> int:
+        return self._contadores['hits']
+
+    @property
+    def misses_cache(self) -> int:
+        return self._contadores['misses']
+
+    @property
+    def consultas_cacheadas(self) -> int:
+        return self._contadores['cacheadas']
+
+    def _vencimiento_ns(self) -> int:
+        """Momento (en ns de time.monotonic_ns) en que vence una entrada guardada ahora en memoria."""
+        return time.monotonic_ns() + self.duracion_cache_minutos * 60_000_000_000
+
+    def _archivo_cache(self, clave_cache: str) -> Path:
+        """Ruta del archivo persistente de una clave en el formato activo."""
+        return self.directorio_cache / f"{clave_cache}{self.extension_cache}"
+
+    def _archivos_cache(self) -> list:
+        """
+        Todos los archivos de cache en disco (os.DirEntry), incluidos los de un formato usado en
+        ejecuciones anteriores. Una sola pasada de os.scandir evita crear un Path por archivo, y
+        cada entrada guarda su stat() tras la primera llamada.
+        """
+        try:
+            with os.scandir(self.directorio_cache) as entradas:
+                return [entrada for entrada in entradas if entrada.name.endswith(_EXTENSIONES_CACHE)]
+        except FileNotFoundError:
+            return []
+
+    def _leer_archivo_cache(self, archivo_cache: Path) -> pd.DataFrame:
+        if archivo_cache.suffix == '.feather':
+            import pyarrow.feather as feather
+            return feather.read_feather(archivo_cache)
+        if archivo_cache.suffix == '.blc':
+            import blosc2
+            return pickle.loads(blosc2.decompress2(archivo_cache.read_bytes()))
+        with open(archivo_cache, 'rb') as f:
+            return pickle.load(f)
+
+    def _escribir_archivo_cache(self, archivo_cache: Path, resultado: pd.DataFrame, datos_serializados: bytes = None,
+                                destino: Path = None):
+        """Escribe la entrada en el formato de `archivo_cache`, en `destino` si se indica (p. ej. un temporal)."""
+        destino = destino or archivo_cache
+        if archivo_cache.suffix == '.feather':
+            import pyarrow.feather as feather
+            feather.write_feather(resultado, destino, compression='lz4')
+            return
+        if archivo_cache.suffix == '.blc':
+            import blosc2
+            datos_serializados = blosc2.compress2(datos_serializados, cparams={'codec': blosc2.Codec.LZ4, 'clevel': 1})
+        with open(destino, 'wb') as f:
+            f.write(datos_serializados)
+
+    def _copia_para_llamador(self, resultado: pd.DataFrame) -> pd.DataFrame:
+        """
+        Devuelve la copia del resultado cacheado que se entrega al llamador.
+        Si la aplicación ya activó copy-on-write basta una copia superficial: los buffers se comparten
+        y pandas solo copia si el llamador modifica el DataFrame. Sin copy-on-write se mantiene la copia
+        profunda. El cache nunca cambia esa opción global de pandas.
+        Si `copia_al_obtener` está desactivado se entrega el objeto cacheado sin copiar; quien
+        necesite modificarlo debe llamar a .copy() explícitamente.
+        """
+        if not self.copia_al_obtener:
+            return resultado
+        return resultado.copy(deep=not pd.get_option("mode.copy_on_write"))
 
     @registrar_operacion("búsqueda en cache de consulta")
-    def obtener_desde_cache(self, consulta_sql: str, parametros: dict = None) -> Optional[pd.DataFrame]:
+    def obtener_desde_cache(self, consulta_sql: str, parametros: dict = None,
+                            clave_cache: str = None) -> Optional[pd.DataFrame]:
         """
         Intenta obtener el resultado de una consulta desde el cache.
+        `clave_cache` permite reutilizar una clave ya calculada por el llamador.
         """
         if not self.cache_habilitado:
             return None
         if not self._es_consulta_cacheable(consulta_sql):
             return None
-
-        clave_cache = self._generar_clave_cache(consulta_sql, parametros)
-
-        # Buscar en cache de memoria primero
-        if clave_cache in self._cache_memoria:
-            resultado, timestamp, _ = self._cache_memoria[clave_cache]
-            if datetime.now() - timestamp < timedelta(minutes=self.duracion_cache_minutos):
-                self.hits_cache += 1
+        self._limpiar_si_corresponde()
+
+        if clave_cache is None:
+            clave_cache = self._generar_clave_cache(consulta_sql, parametros)
+
+        # Buscar en cache de memoria primero: una búsqueda y una comparación de enteros contra el vencimiento
+        entrada = self._cache_memoria.get(clave_cache)
+        if entrada is not None:
+            if entrada[1] > time.monotonic_ns():
+                with self._mem_lock:
+                    if clave_cache in self._cache_memoria: # Pudo desalojarse tras el .get()
+                        self._cache_memoria.move_to_end(clave_cache)
+                    self._contadores['hits'] += 1
+                resultado = entrada[0]
                 self.logger.debug(f"HIT de cache en memoria: {clave_cache}")
                 self.estadisticas.registrar_rendimiento_consulta("CACHE_HIT_MEMORIA", 0.001, len(resultado))
-                return resultado.copy() # Retornar copia
+                return self._copia_para_llamador(resultado)
             else:
-                del self._cache_memoria[clave_cache]
+                self._quitar_de_memoria(clave_cache)
                 self.logger.debug(f"Cache en memoria expirado eliminado: {clave_cache}")
 
         # Buscar en cache persistente
-        archivo_cache = self.directorio_cache / f"{clave_cache}.pkl"
-        if archivo_cache.exists():
+        archivo_cache = self._archivo_cache(clave_cache)
+        try:
+            # Un solo stat() responde si el archivo existe y da su mtime y tamaño
+            estado_archivo = archivo_cache.stat()
+        except FileNotFoundError:
+            estado_archivo = None
+        if estado_archivo is not None:
             try:
-                tiempo_archivo = datetime.fromtimestamp(archivo_cache.stat().st_mtime)
-                if datetime.now() - tiempo_archivo < timedelta(minutes=self.duracion_cache_minutos):
-                    with open(archivo_cache, 'rb') as f:
-                        resultado_disco = pickle.load(f)
-                    # Agregar de vuelta al cache de memoria
-                    tamaño_bytes_disco = archivo_cache.stat().st_size
-                    self._cache_memoria[clave_cache] = (resultado_disco, datetime.now(), tamaño_bytes_disco)
-                    self.hits_cache += 1
+                tiempo_archivo = datetime.fromtimestamp(estado_archivo.st_mtime)
+                if (datetime.now() - tiempo_archivo < timedelta(minutes=self.duracion_cache_minutos)
+                        and not self._invalidado_despues_de(consulta_sql, tiempo_archivo)):
+                    resultado_disco = self._leer_archivo_cache(archivo_cache)
+                    # Agregar de vuelta al cache de memoria; el presupuesto se cobra con el tamaño en RAM,
+                    # no con el del archivo (Feather/blosc2 están comprimidos)
+                    tamaño_bytes_memoria = int(resultado_disco.memory_usage(deep=True).sum())
+                    self._guardar_en_memoria(clave_cache, resultado_disco, tamaño_bytes_memoria, consulta_sql)
+                    self._contar('hits')
                     self.logger.debug(f"HIT de cache persistente y cargado a memoria: {clave_cache}")
                     self.estadisticas.registrar_rendimiento_consulta("CACHE_HIT_DISCO", 0.005, len(resultado_disco))
-                    return resultado_disco.copy()
+                    return self._copia_para_llamador(resultado_disco)
                 else:
-                    archivo_cache.unlink()
+                    archivo_cache.unlink(missing_ok=True)
                     self.logger.debug(f"Archivo de cache persistente expirado eliminado: {archivo_cache}")
             except Exception as e:
                 self.logger.warning(f"Error leyendo cache persistente {clave_cache}: {e}")
-                try:
-                    archivo_cache.unlink(missing_ok=True) # Python 3.8+
-                except FileNotFoundError: # Para Python < 3.8
-                    if archivo_cache.exists(): archivo_cache.unlink()
+                archivo_cache.unlink(missing_ok=True)
 
 
-        self.misses_cache += 1
+        self._contar('misses')
         return None
 
     @registrar_operacion("almacenamiento en cache de consulta")
-    def guardar_en_cache(self, consulta_sql: str, resultado: pd.DataFrame, parametros: dict = None):
+    def guardar_en_cache(self, consulta_sql: str, resultado: pd.DataFrame, parametros: dict = None,
+                         clave_cache: str = None):
         """
         Guarda el resultado de una consulta en el cache.
+        `clave_cache` permite reutilizar una clave ya calculada por el llamador.
         """
         if not self.cache_habilitado or not self._es_consulta_cacheable(consulta_sql) or resultado is None or resultado.empty:
             if resultado is None or resultado.empty:
                  self.logger.debug("No se cachea resultado vacío o None.")
             return
 
-        clave_cache = self._generar_clave_cache(consulta_sql, parametros)
+        self._limpiar_si_corresponde()
+        if clave_cache is None:
+            clave_cache = self._generar_clave_cache(consulta_sql, parametros)
         try:
-            datos_serializados = pickle.dumps(resultado)
-            tamaño_bytes = len(datos_serializados)
-            limite_tamaño_mb = int(os.getenv('CACHE_LIMITE_TAMAÑO_MB', '50')) # Default 50MB si no está en .env
-            if tamaño_bytes > limite_tamaño_mb * 1024 * 1024:
+            if self.extension_cache == '.feather':
+                # Feather serializa directamente al escribir; el tamaño se estima sin una pasada previa
+                datos_serializados = None
+                tamaño_bytes = int(resultado.memory_usage(deep=True).sum())
+            else:
+                # Una sola serialización sirve para medir el tamaño y escribir el archivo; el protocolo 5
+                # guarda los arreglos de NumPy de las columnas como bloques contiguos
+                datos_serializados = pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)
+                tamaño_bytes = len(datos_serializados)
+            if tamaño_bytes > self.limite_tamaño_mb * 1024 * 1024:
                 self.logger.debug(f"Resultado demasiado grande para cache: {tamaño_bytes / (1024*1024):.1f}MB")
                 return
 
-            timestamp = datetime.now()
-            self._cache_memoria[clave_cache] = (resultado.copy(), timestamp, tamaño_bytes)
+            # El llamador conserva `resultado`; con copy-on-write una copia superficial basta para aislarlo
+            copia_cacheada = resultado.copy(deep=not pd.get_option("mode.copy_on_write"))
+            self._guardar_en_memoria(clave_cache, copia_cacheada, tamaño_bytes, consulta_sql)
 
-            archivo_cache = self.directorio_cache / f"{clave_cache}.pkl"
-            with open(archivo_cache, 'wb') as f:
-                f.write(datos_serializados)
+            self._io_executor.submit(self._persistir, clave_cache, self._archivo_cache(clave_cache),
+                                     copia_cacheada, datos_serializados, self._generacion)
 
-            self.consultas_cacheadas += 1
+            self._contar('cacheadas')
             self.logger.debug(f"Resultado cacheado: {clave_cache} ({tamaño_bytes / 1024:.1f}KB, {len(resultado)} filas)")
-
-            if len(self._cache_memoria) > self.tamaño_maximo_cache:
-                self._limpiar_cache_exceso()
         except Exception as e:
             self.logger.warning(f"Error guardando en cache {clave_cache}: {e}")
 
-    def _limpiar_cache_exceso(self):
-        """Limpia entradas más antiguas del cache cuando excede el tamaño máximo."""
-        if len(self._cache_memoria) <= self.tamaño_maximo_cache:
+    def _persistir(self, clave_cache: str, archivo_cache: Path, resultado: pd.DataFrame,
+                   datos_serializados: Optional[bytes], generacion: int):
+        """
+        Escribe una entrada en disco; se ejecuta en el hilo 'cache-io'.
+        Se escribe primero a un temporal y se publica con un rename bajo `_mem_lock`, solo si desde que
+        se encoló no hubo invalidaciones y la entrada sigue en memoria. Así una invalidación concurrente
+        nunca queda seguida de un archivo con datos anteriores a ella.
+        """
+        if generacion != self._generacion or clave_cache not in self._cache_memoria:
             return
-        self.logger.info(f"Limpiando cache por exceso de tamaño. Actual: {len(self._cache_memoria)}, Máximo: {self.tamaño_maximo_cache}")
-        items_ordenados = sorted(self._cache_memoria.items(), key=lambda x: x[1][1]) # x[1][1] es el timestamp
-        
-        # Eliminar 20% de las entradas más antiguas o al menos el exceso.
-        cantidad_a_eliminar = max(
-            len(self._cache_memoria) - self.tamaño_maximo_cache,
-            int(len(self._cache_memoria) * 0.2)
-        )
-        cantidad_a_eliminar = min(cantidad_a_eliminar, len(items_ordenados)) # No eliminar más de lo que hay
-
-
-        eliminados_count = 0
-        for i in range(cantidad_a_eliminar):
-            clave_antigua = items_ordenados[i][0]
-            if clave_antigua in self._cache_memoria:
-                del self._cache_memoria[clave_antigua]
-                eliminados_count +=1
-                archivo_cache = self.directorio_cache / f"{clave_antigua}.pkl"
-                try:
-                    archivo_cache.unlink(missing_ok=True) # Python 3.8+
-                except FileNotFoundError: # Para Python < 3.8
-                    if archivo_cache.exists(): archivo_cache.unlink()
-                except Exception as e_unlink:
-                    self.logger.warning(f"Error eliminando archivo de cache {archivo_cache} durante limpieza por exceso: {e_unlink}")
+        archivo_temporal = archivo_cache.with_name(archivo_cache.name + '.tmp')
+        try:
+            self._escribir_archivo_cache(archivo_cache, resultado, datos_serializados, destino=archivo_temporal)
+            with self._mem_lock:
+                publicar = generacion == self._generacion and clave_cache in self._cache_memoria
+                if publicar:
+                    os.replace(archivo_temporal, archivo_cache)
+                    # El mtime marca el inicio de la vigencia en disco; se fija explícitamente al publicar
+                    # para no depender de cuándo lo actualice el sistema de archivos (p. ej. NFS)
+                    os.utime(archivo_cache, None)
+            if not publicar:
+                archivo_temporal.unlink(missing_ok=True)
+        except Exception as e:
+            archivo_temporal.unlink(missing_ok=True)
+            self.logger.warning(f"Error persistiendo en disco la entrada de cache {clave_cache}: {e}")
+
+    def esperar_persistencia(self):
+        """Bloquea hasta que se hayan escrito en disco todas las entradas encoladas hasta ahora."""
+        self._io_executor.submit(lambda: None).result()
+
+    def obtener_o_calcular(self, consulta_sql: str, parametros: dict, calcular: Callable[[], Any]):
+        """
+        Devuelve el resultado cacheado o, si no existe, lo obtiene con `calcular()` y lo guarda.
+        La clave se calcula una sola vez para la búsqueda y el almacenamiento.
+        Solo se guardan DataFrames no vacíos; cualquier otro resultado se devuelve tal cual.
+        """
+        if not self.cache_habilitado or not self._es_consulta_cacheable(consulta_sql):
+            return calcular()
 
+        clave_cache = self._generar_clave_cache(consulta_sql, parametros)
+        resultado = self.obtener_desde_cache(consulta_sql, parametros, clave_cache=clave_cache)
+        if resultado is not None:
+            return resultado
+
+        resultado = calcular()
+        if isinstance(resultado, pd.DataFrame) and not resultado.empty:
+            self.guardar_en_cache(consulta_sql, resultado, parametros, clave_cache=clave_cache)
+        return resultado
 
-        if eliminados_count > 0:
-            self.logger.info(f"Cache limpiado por exceso: eliminadas {eliminados_count} entradas más antiguas.")
+    def _guardar_en_memoria(self, clave_cache: str, resultado: pd.DataFrame, tamaño_bytes: int,
+                            consulta_sql: str = None):
+        """
+        Inserta (o reemplaza) una entrada como la más reciente, la registra en el índice de tablas de
+        `consulta_sql` y desaloja el exceso, todo bajo el mismo bloqueo para que ningún otro hilo observe
+        el cache por encima de sus límites ni el índice desalineado con la memoria.
+        """
+        with self._mem_lock:
+            self._quitar_entrada(clave_cache)
+            self._cache_memoria[clave_cache] = (resultado, self._vencimiento_ns(), tamaño_bytes)
+            self._bytes_en_memoria += tamaño_bytes
+            if consulta_sql is not None:
+                self._indexar_clave(clave_cache, consulta_sql)
+            claves_desalojadas = self._extraer_exceso()
+        self._eliminar_desalojadas(claves_desalojadas)
+
+    def _quitar_de_memoria(self, clave_cache: str) -> Optional[Tuple[pd.DataFrame, int, int]]:
+        """Quita una entrada del cache en memoria, descontando su tamaño; None si no estaba."""
+        with self._mem_lock:
+            return self._quitar_entrada(clave_cache)
+
+    def _quitar_entrada(self, clave_cache: str) -> Optional[Tuple[pd.DataFrame, int, int]]:
+        """Quita la entrada de la memoria y del índice de tablas. Requiere `_mem_lock`."""
+        entrada = self._cache_memoria.pop(clave_cache, None)
+        if entrada is not None:
+            self._bytes_en_memoria -= entrada[2]
+        self._desindexar_clave(clave_cache)
+        return entrada
+
+    def _extraer_exceso(self) -> list:
+        """
+        Saca las entradas usadas hace más tiempo (O(1) por entrada) hasta que el total de bytes quede
+        dentro del presupuesto y el número de entradas no supere el máximo. Requiere `_mem_lock`.
+        """
+        claves_desalojadas = []
+        while self._cache_memoria and (self._bytes_en_memoria > self._bytes_max
+                                       or len(self._cache_memoria) > self.tamaño_maximo_cache):
+            clave_antigua, (_, _, tamaño_bytes) = self._cache_memoria.popitem(last=False)
+            self._bytes_en_memoria -= tamaño_bytes
+            self._desindexar_clave(clave_antigua)
+            claves_desalojadas.append(clave_antigua)
+        return claves_desalojadas
+
+    def _eliminar_desalojadas(self, claves_desalojadas: list):
+        """Borra del disco los archivos de las entradas desalojadas, fuera del bloqueo de memoria."""
+        for clave_antigua in claves_desalojadas:
+            archivo_cache = self._archivo_cache(clave_antigua)
+            try:
+                archivo_cache.unlink(missing_ok=True)
+            except Exception as e_unlink:
+                self.logger.warning(f"Error eliminando archivo de cache {archivo_cache} durante limpieza por exceso: {e_unlink}")
 
+        if claves_desalojadas:
+            self.logger.debug(f"Cache LRU: desalojadas {len(claves_desalojadas)} entradas por exceso de tamaño.")
+
+    def _desalojar_exceso(self):
+        """Desaloja el exceso del cache en memoria, p. ej. tras reducir sus límites."""
+        with self._mem_lock:
+            claves_desalojadas = self._extraer_exceso()
+        self._eliminar_desalojadas(claves_desalojadas)
+
+    def _limpiar_si_corresponde(self):
+        """
+        Lanza la limpieza de entradas expiradas en segundo plano si pasó el intervalo desde la última.
+        Con el cache inactivo no se hace ningún trabajo ni se mantiene un hilo vivo.
+        """
+        if self._limpieza_en_curso or time.monotonic_ns() < self._proxima_limpieza_ns:
+            return
+        with self._lock:
+            if self._limpieza_en_curso:
+                return
+            self._limpieza_en_curso = True
 
-    def _programar_limpieza_automatica(self):
-        """Programa limpieza automática del cache."""
-        def limpieza_periodica():
+        def limpiar():
             try:
                 self.limpiar_cache_expirado()
-                # Reprogramar para la próxima hora, asegurando que sea un hilo daemon
-                timer = threading.Timer(3600, limpieza_periodica)
-                timer.daemon = True # Para que no impida que el programa termine
-                timer.start()
             except Exception as e:
                 self.logger.error(f"Error en limpieza automática de cache: {e}")
+            finally:
+                self.ultimo_cleanup = datetime.now()
+                self._proxima_limpieza_ns = time.monotonic_ns() + self._intervalo_limpieza_ns
+                self._limpieza_en_curso = False
 
-        # Iniciar timer para limpieza cada hora
-        timer_inicial = threading.Timer(3600, limpieza_periodica)
-        timer_inicial.daemon = True
-        timer_inicial.start()
-        self.logger.debug("Limpieza automática de cache programada cada hora.")
+        threading.Thread(target=limpiar, name="LimpiezaCache", daemon=True).start()
 
     @registrar_operacion("limpieza de cache expirado")
     def limpiar_cache_expirado(self):
         """Limpia todas las entradas expiradas del cache."""
         ahora = datetime.now()
         limite_expiracion = timedelta(minutes=self.duracion_cache_minutos)
+        ahora_ns = time.monotonic_ns()
+        with self._mem_lock:
+            entradas = list(self._cache_memoria.items())
         claves_expiradas_memoria = [
-            clave for clave, (_, timestamp, _) in self._cache_memoria.items()
-            if ahora - timestamp > limite_expiracion
+            clave for clave, (_, vencimiento_ns, _) in entradas
+            if vencimiento_ns <= ahora_ns
         ]
         for clave in claves_expiradas_memoria:
-            if clave in self._cache_memoria: # Doble check por si fue eliminado por otra operación
-                del self._cache_memoria[clave]
+            # pop tolera que otra operación ya la haya eliminado
+            self._quitar_de_memoria(clave)
 
         archivos_eliminados_disco = 0
-        for archivo_cache in self.directorio_cache.glob("*.pkl"):
+        limite_mtime = (ahora - limite_expiracion).timestamp()
+        for archivo_cache in self._archivos_cache():
             try:
-                tiempo_archivo = datetime.fromtimestamp(archivo_cache.stat().st_mtime)
-                if ahora - tiempo_archivo > limite_expiracion:
-                    archivo_cache.unlink()
+                if archivo_cache.stat().st_mtime < limite_mtime:
+                    os.unlink(archivo_cache.path)
                     archivos_eliminados_disco += 1
             except Exception as e:
-                self.logger.warning(f"Error eliminando archivo de cache expirado {archivo_cache}: {e}")
+                self.logger.warning(f"Error eliminando archivo de cache expirado {archivo_cache.path}: {e}")
         self.ultimo_cleanup = ahora
         self.logger.info(f"Limpieza de cache expirado completada: {len(claves_expiradas_memoria)} en memoria, {archivos_eliminados_disco} en disco.")
 
@@ -290,16 +618,17 @@ class GestorCacheConsultas:
         """
         Retorna estadísticas del cache.
         """
-        total_consultas_intentadas = self.hits_cache + self.misses_cache
-        ratio_hit = (self.hits_cache / total_consultas_intentadas * 100) if total_consultas_intentadas > 0 else 0
-        tamaño_total_memoria_bytes = sum(tamaño for _, _, tamaño in self._cache_memoria.values())
-        tamaño_total_memoria_mb = tamaño_total_memoria_bytes / (1024 * 1024)
-        archivos_cache_persistente = len(list(self.directorio_cache.glob("*.pkl")))
+        hits_cache = self.hits_cache
+        misses_cache = self.misses_cache
+        total_consultas_intentadas = hits_cache + misses_cache
+        ratio_hit = (hits_cache / total_consultas_intentadas * 100) if total_consultas_intentadas > 0 else 0
+        tamaño_total_memoria_mb = self._bytes_en_memoria / (1024 * 1024)
+        archivos_cache_persistente = len(self._archivos_cache())
 
         return {
             'cache_habilitado': self.cache_habilitado,
-            'hits_cache': self.hits_cache,
-            'misses_cache': self.misses_cache,
+            'hits_cache': hits_cache,
+            'misses_cache': misses_cache,
             'ratio_hit_porcentaje': round(ratio_hit, 2),
             'consultas_cacheadas_exitosamente': self.consultas_cacheadas,
             'entradas_en_memoria': len(self._cache_memoria),
@@ -309,56 +638,127 @@ class GestorCacheConsultas:
             'configuracion': {
                 'duracion_minutos': self.duracion_cache_minutos,
                 'tamaño_maximo_entradas_memoria': self.tamaño_maximo_cache,
-                'limite_tamaño_individual_mb': int(os.getenv('CACHE_LIMITE_TAMAÑO_MB', '50')),
+                'limite_tamaño_individual_mb': self.limite_tamaño_mb,
+                'limite_memoria_total_mb': self._bytes_max // (1024 * 1024),
                 'directorio_cache_disco': str(self.directorio_cache.resolve())
             }
         }
 
+    def _indexar_clave(self, clave_cache: str, consulta_sql: str):
+        """Registra la clave en el índice de cada tabla que referencia la consulta. Requiere `_mem_lock`."""
+        self._consulta_por_clave[clave_cache] = consulta_sql
+        for tabla in _tablas_de_consulta(consulta_sql):
+            self._claves_por_tabla.setdefault(tabla, set()).add(clave_cache)
+
+    def _desindexar_clave(self, clave_cache: str):
+        """Saca la clave del índice de sus tablas, borrando las tablas que quedan sin claves. Requiere `_mem_lock`."""
+        consulta_sql = self._consulta_por_clave.pop(clave_cache, None)
+        if consulta_sql is None:
+            return
+        for tabla in _tablas_de_consulta(consulta_sql):
+            claves = self._claves_por_tabla.get(tabla)
+            if claves is not None:
+                claves.discard(clave_cache)
+                if not claves:
+                    del self._claves_por_tabla[tabla]
+
+    def _invalidado_despues_de(self, consulta_sql: str, momento: datetime) -> bool:
+        """Indica si alguna tabla de la consulta se invalidó después de `momento`."""
+        if not self._tablas_invalidadas:
+            return False
+        return any(self._tablas_invalidadas.get(tabla, datetime.min) > momento
+                   for tabla in _tablas_de_consulta(consulta_sql))
+
+    def invalidar_cache_tabla(self, nombre_tabla: str):
+        """
+        Invalida solo las entradas cuyas consultas referencian la tabla indicada (FROM/JOIN),
+        usando el índice tabla -> claves en lugar de recorrer todo el cache.
+        """
+        tabla = _normalizar_tabla(nombre_tabla.strip())
+        with self._lock:
+            with self._mem_lock:
+                self._generacion += 1
+                self._tablas_invalidadas[tabla] = datetime.now()
+                claves = list(self._claves_por_tabla.get(tabla, ()))
+                for clave in claves:
+                    self._quitar_entrada(clave)
+            for clave in claves:
+                archivo_cache = self._archivo_cache(clave)
+                try:
+                    archivo_cache.unlink(missing_ok=True)
+                except Exception as e_unlink:
+                    self.logger.warning(f"Error al eliminar archivo de cache {archivo_cache.name} durante invalidación de tabla: {e_unlink}")
+        self.logger.info(f"Cache invalidado para la tabla '{tabla}': {len(claves)} entradas.")
+
     def invalidar_cache(self, patron: str = None):
         """
         Invalida entradas del cache.
         Args:
-            patron (str): Si se provee, invalida claves que contengan este patrón (case-insensitive).
+            patron (str): Si es un nombre de tabla (con o sin esquema), se invalidan solo las consultas que
+                          la referencian (FROM/JOIN), a través del índice tabla -> claves. Cualquier otro
+                          texto se busca (sin distinguir mayúsculas) en las consultas cacheadas.
                           Si es None, invalida todo el cache.
         """
-        with self._lock: # Asegurar operación atómica en el diccionario de memoria
-            if patron:
-                patron_lower = patron.lower()
-                claves_a_eliminar_memoria = [
-                    clave for clave in self._cache_memoria.keys()
-                    if patron_lower in self._generar_clave_cache(clave.split('_#_')[0] if '_#_' in clave else clave).lower() # Asume que la clave original es parte de la consulta
-                                                                                                                            # o una heurística más simple: if patron_lower in clave.lower()
-                ]
-                # Para archivos, la clave es el hash. Invalidar por patrón de consulta es más complejo
-                # aquí se invalidará si el patrón está en el nombre del archivo (que es el hash).
-                # Lo ideal sería guardar metadatos consulta->hash para invalidar por consulta.
-                # Por ahora, si hay patrón, limpiamos memoria y dejamos que el disco expire o se limpie después.
-                # Una implementación más robusta requeriría un índice inverso.
-                # O, si la clave del caché es el hash de la consulta, podemos re-generar hashes de consultas conocidas que matcheen el patron.
-                # Simplificación: por ahora, patrón solo afecta memoria de forma precisa. Para disco, es más complejo
-                # sin un mapeo. La forma más segura es limpiar todo si el patrón es crítico.
-
-                for clave in claves_a_eliminar_memoria:
-                    if clave in self._cache_memoria:
-                        del self._cache_memoria[clave]
-                    archivo_cache_a_eliminar = self.directorio_cache / f"{clave}.pkl"
-                    try:
-                        archivo_cache_a_eliminar.unlink(missing_ok=True)
-                    except Exception as e_unlink:
-                         self.logger.warning(f"Error al intentar eliminar archivo de cache {archivo_cache_a_eliminar} durante invalidación por patrón: {e_unlink}")
-
-
-                self.logger.info(f"Cache de memoria invalidado para patrón '{patron}': {len(claves_a_eliminar_memoria)} entradas. Revisar cache en disco manualmente si es necesario.")
+        if patron:
+            if _PATRON_NOMBRE_TABLA.fullmatch(patron.strip()):
+                self.invalidar_cache_tabla(patron)
             else:
+                self._invalidar_por_texto(patron)
+            return
+
+        with self._lock: # Asegurar operación atómica en el diccionario de memoria
+            with self._mem_lock:
+                self._generacion += 1
                 self._cache_memoria.clear()
-                archivos_eliminados_disco_total = 0
-                for archivo_cache in self.directorio_cache.glob("*.pkl"):
-                    try:
-                        archivo_cache.unlink()
-                        archivos_eliminados_disco_total +=1
-                    except Exception as e:
-                        self.logger.warning(f"Error eliminando archivo de cache {archivo_cache} durante invalidación total: {e}")
-                self.logger.info(f"Todo el cache ha sido invalidado (memoria y {archivos_eliminados_disco_total} archivos en disco).")
+                self._bytes_en_memoria = 0
+                self._claves_por_tabla.clear()
+                self._consulta_por_clave.clear()
+            archivos_eliminados_disco_total = 0
+            for archivo_cache in self._archivos_cache():
+                try:
+                    os.unlink(archivo_cache.path)
+                    archivos_eliminados_disco_total +=1
+                except Exception as e:
+                    self.logger.warning(f"Error eliminando archivo de cache {archivo_cache.path} durante invalidación total: {e}")
+            self.logger.info(f"Todo el cache ha sido invalidado (memoria y {archivos_eliminados_disco_total} archivos en disco).")
+
+    def _invalidar_por_texto(self, patron: str):
+        """
+        Invalida las entradas en memoria cuya consulta contiene `patron` (sin distinguir mayúsculas ni
+        espacios). Los archivos en disco sin entrada en memoria no tienen consulta asociada, así que no
+        se puede saber si coinciden: se eliminan también, por seguridad.
+        """
+        patron_normalizado = ' '.join(patron.lower().split())
+        with self._lock:
+            with self._mem_lock:
+                self._generacion += 1
+                claves = [clave for clave, consulta_sql in self._consulta_por_clave.items()
+                          if patron_normalizado in ' '.join(consulta_sql.lower().split())]
+                for clave in claves:
+                    self._quitar_entrada(clave)
+                claves_vigentes = set(self._cache_memoria)
+            archivos_eliminados = 0
+            for archivo_cache in self._archivos_cache():
+                if archivo_cache.name.split('.', 1)[0] in claves_vigentes:
+                    continue
+                try:
+                    os.unlink(archivo_cache.path)
+                    archivos_eliminados += 1
+                except Exception as e:
+                    self.logger.warning(f"Error eliminando archivo de cache {archivo_cache.path} durante invalidación por patrón: {e}")
+        self.logger.info(f"Cache invalidado para el patrón '{patron}': {len(claves)} entradas en memoria, "
+                         f"{archivos_eliminados} archivos en disco.")
+
+
+def obtener_gestor_cache() -> GestorCacheConsultas:
+    """
+    Devuelve el Singleton del cache sin pasar por __new__/__init__ cuando ya existe.
+    Pensado para caminos que se ejecutan en cada consulta, como el decorador `cache_consulta`.
+    """
+    gestor = GestorCacheConsultas._instancia
+    if gestor is None or not gestor._inicializado:
+        gestor = GestorCacheConsultas()
+    return gestor
 
 
 def cache_consulta(duracion_minutos: int = None): # El default vendrá de la config del gestor
@@ -369,7 +769,7 @@ def cache_consulta(duracion_minutos: int = None): # El default vendrá de la con
         @wraps(func)
         def wrapper(self_obj, consulta_sql: str, parametros: dict = None, *args, **kwargs):
             # self_obj es la instancia de la clase donde se aplica el decorador (ej. ConexionBD)
-            gestor_cache = GestorCacheConsultas() # Obtiene el Singleton
+            gestor_cache = obtener_gestor_cache() # Obtiene el Singleton
 
             # Usar duración específica del decorador si se provee, sino la global del gestor
             duracion_cache_actual = duracion_minutos if duracion_minutos is not None else gestor_cache.duracion_cache_minutos
@@ -385,18 +785,12 @@ def cache_consulta(duracion_minutos: int = None): # El default vendrá de la con
             # O, el gestor necesitaría un método obtener_desde_cache_con_duracion_especifica.
             # Por ahora, el decorador usará la lógica del gestor.
 
-            resultado_cache = gestor_cache.obtener_desde_cache(consulta_sql, parametros) # Usa la duración global del gestor
-            if resultado_cache is not None:
-                # self_obj.logger.debug(f"Resultado para '{consulta_sql[:30]}...' servido desde cache por decorador.")
-                return resultado_cache
-
-            resultado_real = func(self_obj, consulta_sql, parametros, *args, **kwargs)
-
-            if resultado_real is not None and not resultado_real.empty:
-                # self_obj.logger.debug(f"Resultado para '{consulta_sql[:30]}...' obtenido de BD y guardado en cache por decorador.")
-                gestor_cache.guardar_en_cache(consulta_sql, resultado_real, parametros) # Usa la duración global del gestor
-
-            return resultado_real
+            # Usa la duración global del gestor. Solo se cachean DataFrames materializados;
+            # un iterador de bloques se devuelve sin tocar
+            return gestor_cache.obtener_o_calcular(
+                consulta_sql, parametros,
+                lambda: func(self_obj, consulta_sql, parametros, *args, **kwargs)
+            )
         return wrapper
     return decorador
 
@@ -435,8 +829,7 @@ if __name__ == "__main__":
     # Simular expiración del caché en memoria para forzar lectura de disco
     print("\n4. Forzar 'expiración' de caché en memoria y leer de disco:")
     clave_generada = cache_manager._generar_clave_cache(consulta_test_1, params_test_1)
-    if clave_generada in cache_manager._cache_memoria:
-        del cache_manager._cache_memoria[clave_generada]
+    if cache_manager._quitar_de_memoria(clave_generada) is not None:
         print(f"   Entrada '{clave_generada}' eliminada del caché en memoria.")
 
     res_disco = cache_manager.obtener_desde_cache(consulta_test_1, params_test_1)
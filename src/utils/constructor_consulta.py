@@ -1,10 +1,57 @@
 import sys
 import os
+import re
 from pathlib import Path
 import pandas as pd
 
 from src.utils.sistema_logging import ConfiguradorLogging
 
+# Marcadores con nombre al estilo del driver (%(nombre)s), que es como ConexionBD recibe los parámetros
+_PATRON_PARAMETRO = re.compile(r"%\((\w+)\)s")
+
+
+class ConsultaPreparada:
+    """
+    Consulta ya construida lista para ejecutarse muchas veces con distintos parámetros,
+    al estilo PREPARE/EXECUTE: el texto SQL se arma una sola vez en `ConstructorConsultaSQL.preparar()`.
+    Es inmutable, por lo que puede compartirse entre hilos; cada ejecución obtiene su conexión.
+    """
+    __slots__ = ('_sql', '_parametros')
+
+    def __init__(self, sql: str):
+        self._sql = sql
+        # dict.fromkeys conserva el orden de aparición y descarta repetidos
+        self._parametros = tuple(dict.fromkeys(_PATRON_PARAMETRO.findall(sql)))
+
+    @property
+    def sql(self) -> str:
+        return self._sql
+
+    @property
+    def parametros(self) -> tuple:
+        """Nombres de los parámetros %(nombre)s que espera la consulta."""
+        return self._parametros
+
+    def ejecutar(self, parametros: dict = None, conexion=None) -> pd.DataFrame | None:
+        """
+        Ejecuta la consulta con los parámetros dados.
+        Args:
+            parametros (dict): Valores para los marcadores de la consulta
+            conexion (ConexionBD): Conexión a usar; por defecto el Singleton
+        """
+        if conexion is None:
+            from src.conexion_bd import ConexionBD
+            conexion = ConexionBD()
+        if self._parametros:
+            faltantes = [nombre for nombre in self._parametros if not parametros or nombre not in parametros]
+            if faltantes:
+                raise ValueError(f"Faltan parámetros para la consulta preparada: {faltantes}")
+        return conexion.ejecutar_consulta(self._sql, parametros)
+
+    def __repr__(self) -> str:
+        return f"ConsultaPreparada(sql={self._sql!r})"
+
+
 class ConstructorConsultaSQL:
     """
     Patrón Constructor para crear consultas SQL complejas de manera fluida.
@@ -27,18 +74,24 @@ class ConstructorConsultaSQL:
         self._condiciones_habiendo = []
         self._campos_ordenar_por = []
         self._valor_limite = None
+        # construir() reutiliza la última consulta mientras ningún método la modifique
+        self._modificado = True
+        self._consulta_cache = None
         return self
 
     def seleccionar(self, *campos):
         self._campos_seleccion.extend(campos)
+        self._modificado = True
         return self
 
     def desde_tabla(self, tabla):
         self._tabla_desde = tabla
+        self._modificado = True
         return self
 
     def unir(self, tabla, condicion_union, tipo_union="INNER"):
         self._uniones.append(f"{tipo_union} JOIN {tabla} ON {condicion_union}")
+        self._modificado = True
         return self
 
     def unir_izquierda(self, tabla, condicion_union):
@@ -46,45 +99,60 @@ class ConstructorConsultaSQL:
 
     def donde(self, condicion):
         self._condiciones_donde.append(condicion)
+        self._modificado = True
         return self
 
     def agrupar_por(self, *campos):
         self._campos_agrupar_por.extend(campos)
+        self._modificado = True
         return self
 
     def habiendo(self, condicion):
         self._condiciones_habiendo.append(condicion)
+        self._modificado = True
         return self
 
     def ordenar_por(self, campo, direccion="ASC"):
         self._campos_ordenar_por.append(f"{campo} {direccion}")
+        self._modificado = True
         return self
 
     def limite(self, cantidad):
         self._valor_limite = cantidad
+        self._modificado = True
         return self
 
     def construir(self) -> str:
+        if not self._modificado:
+            return self._consulta_cache
         if not self._campos_seleccion or not self._tabla_desde:
             raise ValueError("SELECT y FROM son obligatorios para construir la consulta.")
 
-        partes_consulta = []
-        partes_consulta.append(f"SELECT {', '.join(self._campos_seleccion)}")
-        partes_consulta.append(f"FROM {self._tabla_desde}")
+        # Ensamblado directo por fragmentos, sin lista intermedia ni join final
+        consulta_sql = f"SELECT {', '.join(self._campos_seleccion)}\nFROM {self._tabla_desde}"
         if self._uniones:
-            partes_consulta.extend(self._uniones)
+            consulta_sql += "\n" + "\n".join(self._uniones)
         if self._condiciones_donde:
-            partes_consulta.append(f"WHERE {' AND '.join(self._condiciones_donde)}")
+            consulta_sql += f"\nWHERE {' AND '.join(self._condiciones_donde)}"
         if self._campos_agrupar_por:
-            partes_consulta.append(f"GROUP BY {', '.join(self._campos_agrupar_por)}")
+            consulta_sql += f"\nGROUP BY {', '.join(self._campos_agrupar_por)}"
         if self._condiciones_habiendo:
-            partes_consulta.append(f"HAVING {' AND '.join(self._condiciones_habiendo)}")
+            consulta_sql += f"\nHAVING {' AND '.join(self._condiciones_habiendo)}"
         if self._campos_ordenar_por:
-            partes_consulta.append(f"ORDER BY {', '.join(self._campos_ordenar_por)}")
+            consulta_sql += f"\nORDER BY {', '.join(self._campos_ordenar_por)}"
         if self._valor_limite is not None: # Comprobar contra None, ya que limite 0 puede ser válido
-            partes_consulta.append(f"LIMIT {self._valor_limite}")
+            consulta_sql += f"\nLIMIT {self._valor_limite}"
+
+        self._consulta_cache = consulta_sql + ";"
+        self._modificado = False
+        return self._consulta_cache
 
-        return "\n".join(partes_consulta) + ";"
+    def preparar(self) -> ConsultaPreparada:
+        """
+        Construye la consulta una sola vez y la devuelve como `ConsultaPreparada` para ejecutarla
+        repetidamente. Los cambios posteriores al constructor no afectan a la consulta preparada.
+        """
+        return ConsultaPreparada(self.construir())
 
     def ejecutar(self, parametros: dict = None) -> pd.DataFrame | None:
         """
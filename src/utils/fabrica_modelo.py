@@ -1,5 +1,6 @@
 import sys
 import os
+import logging
 from pathlib import Path
 
 root_dir = Path(__file__).parent.parent.parent
@@ -7,7 +8,8 @@ sys.path.insert(0, str(root_dir))
 
 from datetime import date, time
 from decimal import Decimal
-from typing import Dict, Any, Type, Union
+from functools import lru_cache
+from typing import Dict, Any, Type, Union, Optional
 import pandas as pd
 
 # Importar sistema de logging
@@ -43,6 +45,85 @@ except ImportError:
         sys.exit(1)
 
 
+# Campos obligatorios por tipo de modelo, armados una sola vez para validar con diferencia de conjuntos
+_CAMPOS_REQUERIDOS = {
+    'cliente': frozenset(('CustomerID', 'FirstName', 'LastName', 'CityID')),
+    'empleado': frozenset(('EmployeeID', 'FirstName', 'LastName', 'CityID')),
+    'producto': frozenset(('ProductID', 'ProductName', 'Price', 'CategoryID')),
+    'venta': frozenset(('SalesID', 'ProductID', 'CustomerID', 'Quantity', 'TotalPrice')),
+    'categoria': frozenset(('CategoryID', 'CategoryName')),
+    'ciudad': frozenset(('CityID', 'CityName', 'CountryID')),
+    'pais': frozenset(('CountryID', 'CountryName')),
+}
+
+
+# === Conversión de columnas completas para la creación masiva ===
+# Los nulos de columnas obligatorias se rellenan solo para que el casteo no falle: esas filas se
+# rechazan antes de usarse.
+
+def _columna_entera(serie: pd.Series) -> list:
+    """Castea la columna a int64 en una sola operación y la devuelve como enteros Python."""
+    return serie.fillna(0).astype('int64').tolist()
+
+
+def _columna_texto(serie: pd.Series) -> list:
+    return serie.astype(str).tolist()
+
+
+def _columna_opcional(df: pd.DataFrame, nombre: str) -> list:
+    """Valores de una columna opcional con None en los nulos (o en todas las filas si la columna falta)."""
+    if nombre not in df.columns:
+        return [None] * len(df)
+    serie = df[nombre]
+    return [None if es_nulo else valor for valor, es_nulo in zip(serie.tolist(), serie.isna().tolist())]
+
+
+def _columna_entera_opcional(df: pd.DataFrame, nombre: str) -> list:
+    """Enteros de una columna opcional; nulos y ceros pasan a None, como en la creación fila a fila."""
+    if nombre not in df.columns:
+        return [None] * len(df)
+    serie = df[nombre]
+    presentes = serie.notna() & (serie != 0)
+    enteros = serie.where(presentes, 0).astype('int64').tolist()
+    return [entero if presente else None for entero, presente in zip(enteros, presentes.tolist())]
+
+
+# Las fechas de contratación y las horas de modificación se repiten mucho entre filas, así que cada
+# texto distinto se interpreta una sola vez. date y time son inmutables, por lo que compartirlos es seguro.
+@lru_cache(maxsize=8192)
+def _parsear_fecha_iso(texto: str) -> date:
+    partes = texto.split(None, 1)
+    if not partes:
+        raise ValueError(f"Fecha vacía: {texto!r}")
+    return date.fromisoformat(partes[0])
+
+
+@lru_cache(maxsize=8192)
+def _parsear_hora_iso(texto: str) -> Optional[time]:
+    try:
+        return time.fromisoformat(texto)
+    except ValueError:
+        return None
+
+
+def _convertir_fecha(valor: Any) -> Optional[date]:
+    """Fecha desde texto ISO (se ignora la parte horaria) o desde un objeto date; None en otro caso."""
+    if isinstance(valor, str):
+        return _parsear_fecha_iso(valor) if valor else None
+    if isinstance(valor, date):
+        return valor
+    return None
+
+
+def _convertir_hora(valor: Any) -> Optional[time]:
+    """Hora desde texto ISO o desde un objeto time; None si falta o no se puede interpretar."""
+    if isinstance(valor, str):
+        return _parsear_hora_iso(valor)
+    if isinstance(valor, time):
+        return valor
+    return None
+
+
 class FabricaModelos:
     """
     Patrón Factory para crear instancias de modelos desde datos.
@@ -88,7 +169,21 @@ class FabricaModelos:
         Raises:
             ValueError: Si el tipo de modelo no es válido
         """
-        self.logger.debug(f"Iniciando creación de modelo tipo '{model_type}' con {len(data)} campos")
+        modelo_creado = self._crear_modelo(model_type, data)
+        
+        # Registrar estadísticas cada 10 objetos (la creación masiva las registra una vez al final)
+        if self.contador_objetos_creados % 10 == 0:
+            self.estadisticas.registrar_metricas_base_datos(0, self.contador_objetos_creados)
+        
+        return modelo_creado
+    
+    def _crear_modelo(self, model_type: str, data: Dict[str, Any]) -> Any:
+        """
+        Valida los datos y crea el modelo, sin el registro de operación ni las métricas periódicas
+        de `create_from_dict`, para usarse fila a fila en la creación masiva.
+        """
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Iniciando creación de modelo tipo '%s' con %d campos", model_type, len(data))
         
         # Validar tipo de modelo
         if model_type not in self._model_types:
@@ -103,22 +198,20 @@ class FabricaModelos:
             # Validar datos de entrada
             self._validar_datos_entrada(model_type, data)
             
-            # Llamar al método específico de creación
-            method_name = f"_create_{model_type}"
-            if hasattr(self, method_name):
-                modelo_creado = getattr(self, method_name)(data)
+            # Llamar al método específico de creación (tabla de despacho armada una sola vez)
+            creator = self._creators.get(model_type)
+            if creator is not None:
+                modelo_creado = creator(self, data)
                 
                 # Incrementar contador y registrar éxito
                 self.contador_objetos_creados += 1
-                self.logger.info(f"Modelo {model_type} creado exitosamente (ID: {getattr(modelo_creado, 'id_' + model_type.replace('categoria', 'categoria'), 'N/A')})")
-                
-                # Registrar estadísticas cada 10 objetos
-                if self.contador_objetos_creados % 10 == 0:
-                    self.estadisticas.registrar_metricas_base_datos(0, self.contador_objetos_creados)
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info("Modelo %s creado exitosamente (ID: %s)", model_type,
+                                     getattr(modelo_creado, 'id_' + model_type, 'N/A'))
                 
                 return modelo_creado
             else:
-                error_msg = f"Método {method_name} no implementado"
+                error_msg = f"Método _create_{model_type} no implementado"
                 self.logger.error(error_msg)
                 raise NotImplementedError(error_msg)
                 
@@ -140,29 +233,24 @@ class FabricaModelos:
         Raises:
             ValueError: Si los datos no son válidos
         """
-        if not isinstance(data, dict):
-            raise ValueError("Los datos deben ser un diccionario")
+        # Se acepta cualquier mapeo (dict, Mapping de solo lectura, ...), no solo dict
+        try:
+            claves = data.keys()
+        except AttributeError:
+            raise ValueError("Los datos deben ser un diccionario") from None
         
         if not data:
             raise ValueError("Los datos no pueden estar vacíos")
         
         # Validaciones específicas por tipo de modelo
-        campos_requeridos = {
-            'cliente': ['CustomerID', 'FirstName', 'LastName', 'CityID'],
-            'empleado': ['EmployeeID', 'FirstName', 'LastName', 'CityID'],
-            'producto': ['ProductID', 'ProductName', 'Price', 'CategoryID'],
-            'venta': ['SalesID', 'ProductID', 'CustomerID', 'Quantity', 'TotalPrice'],
-            'categoria': ['CategoryID', 'CategoryName'],
-            'ciudad': ['CityID', 'CityName', 'CountryID'],
-            'pais': ['CountryID', 'CountryName']
-        }
-        
-        if model_type in campos_requeridos:
-            campos_faltantes = [campo for campo in campos_requeridos[model_type] if campo not in data or data[campo] is None]
-            if campos_faltantes:
+        campos_requeridos = _CAMPOS_REQUERIDOS.get(model_type)
+        if campos_requeridos:
+            # La diferencia de conjuntos descarta en C los campos ausentes; solo si están todos se revisan los None
+            if campos_requeridos - claves or any(data[campo] is None for campo in campos_requeridos):
+                campos_faltantes = sorted(campo for campo in campos_requeridos if data.get(campo) is None)
                 raise ValueError(f"Campos requeridos faltantes para {model_type}: {campos_faltantes}")
         
-        self.logger.debug(f"Validación de datos exitosa para {model_type}")
+        self.logger.debug("Validación de datos exitosa para %s", model_type)
     
     @registrar_operacion("creación de modelo desde fila de DataFrame")
     def create_from_dataframe_row(self, model_type: str, row: pd.Series) -> Any:
@@ -176,7 +264,7 @@ class FabricaModelos:
         Returns:
             Instancia del modelo correspondiente
         """
-        self.logger.debug(f"Convirtiendo fila de DataFrame a {model_type}")
+        self.logger.debug("Convirtiendo fila de DataFrame a %s", model_type)
         
         try:
             # Convertir Series a diccionario, manejando valores NaN
@@ -212,9 +300,42 @@ class FabricaModelos:
         modelos_creados = []
         errores_encontrados = 0
         
-        for indice, row in df.iterrows():
+        columnas_tipadas = self._preparar_columnas(model_type, df)
+        if columnas_tipadas is not None:
+            # Columnas ya convertidas al tipo de cada argumento: el constructor tipado no re-convierte celdas
+            crear_tipado = self._creators_tipados[model_type]
+            campos_requeridos = sorted(_CAMPOS_REQUERIDOS[model_type])
+            nulos_requeridos = df[campos_requeridos].isna()
+            filas_incompletas = nulos_requeridos.any(axis=1).tolist()
+            
+            def crear_fila(posicion, valores_fila):
+                if filas_incompletas[posicion]:
+                    campos_faltantes = [campo for campo in campos_requeridos if nulos_requeridos[campo].iat[posicion]]
+                    raise ValueError(f"Campos requeridos faltantes para {model_type}: {campos_faltantes}")
+                modelo = crear_tipado(self, *valores_fila)
+                self.contador_objetos_creados += 1
+                return modelo
+            
+            filas = zip(*columnas_tipadas)
+        else:
+            # Recorrido por columnas: cada columna se extrae una sola vez como lista de escalares Python
+            # y los nulos se detectan con una única máscara, en lugar de construir una Series por fila
+            # (iterrows) y evaluar pd.isna celda a celda
+            columnas = list(df.columns)
+            mascara_nulos = df.isna().to_numpy()
+            valores_por_columna = [
+                [None if es_nulo else valor for valor, es_nulo in zip(df.iloc[:, j].tolist(), mascara_nulos[:, j])]
+                for j in range(len(columnas))
+            ]
+            
+            def crear_fila(posicion, valores_fila):
+                return self._crear_modelo(model_type, dict(zip(columnas, valores_fila)))
+            
+            filas = zip(*valores_por_columna)
+        
+        for posicion, (indice, valores_fila) in enumerate(zip(df.index, filas)):
             try:
-                modelo = self.create_from_dataframe_row(model_type, row)
+                modelo = crear_fila(posicion, valores_fila)
                 modelos_creados.append(modelo)
             except Exception as e:
                 errores_encontrados += 1
@@ -226,6 +347,9 @@ class FabricaModelos:
                     self.logger.error(error_msg)
                     raise RuntimeError(error_msg)
         
+        if modelos_creados:
+            self.estadisticas.registrar_metricas_base_datos(0, self.contador_objetos_creados)
+        
         exito_rate = (len(modelos_creados) / len(df)) * 100
         self.logger.info(f"Creación masiva completada: {len(modelos_creados)}/{len(df)} modelos ({exito_rate:.1f}% éxito)")
         
@@ -234,23 +358,62 @@ class FabricaModelos:
         
         return modelos_creados
     
+    def _preparar_columnas(self, model_type: str, df: pd.DataFrame) -> Optional[list]:
+        """
+        Convierte de una vez las columnas del DataFrame a los tipos que esperan los constructores
+        tipados, en el orden de sus argumentos. Retorna None si el tipo no tiene constructor tipado,
+        faltan columnas obligatorias o alguna columna no admite el casteo vectorizado; en ese caso
+        se usa la creación genérica fila a fila.
+        """
+        preparar = self._preparadores_columnas.get(model_type)
+        if preparar is None or not _CAMPOS_REQUERIDOS[model_type].issubset(df.columns):
+            return None
+        try:
+            return preparar(self, df)
+        except (ValueError, TypeError, ArithmeticError, IndexError) as e:
+            self.logger.debug("Conversión por columnas no aplicable a %s (%s); se crea fila a fila", model_type, e)
+            return None
+    
+    def _columnas_cliente(self, df: pd.DataFrame) -> list:
+        return [
+            _columna_entera(df['CustomerID']), _columna_texto(df['FirstName']), _columna_texto(df['LastName']),
+            _columna_entera(df['CityID']), _columna_opcional(df, 'MiddleInitial'), _columna_opcional(df, 'Address'),
+        ]
+    
+    def _columnas_empleado(self, df: pd.DataFrame) -> list:
+        return [
+            _columna_entera(df['EmployeeID']), _columna_texto(df['FirstName']), _columna_texto(df['LastName']),
+            _columna_entera(df['CityID']),
+            [_convertir_fecha(valor) for valor in _columna_opcional(df, 'HireDate')],
+            _columna_opcional(df, 'MiddleInitial'),
+            [_convertir_fecha(valor) for valor in _columna_opcional(df, 'BirthDate')],
+            _columna_opcional(df, 'Gender'),
+        ]
+    
+    def _columnas_producto(self, df: pd.DataFrame) -> list:
+        return [
+            _columna_entera(df['ProductID']), _columna_texto(df['ProductName']),
+            list(map(Decimal, df['Price'].astype(str).tolist())),
+            _columna_entera(df['CategoryID']), _columna_opcional(df, 'Class'),
+            [_convertir_hora(valor) for valor in _columna_opcional(df, 'ModifyDate')],
+            _columna_opcional(df, 'Resistant'), _columna_opcional(df, 'IsAllergic'),
+            _columna_entera_opcional(df, 'VitalityDays'),
+        ]
+    
     # === Métodos específicos de creación para cada modelo ===
     
     def _create_cliente(self, data: Dict[str, Any]) -> Cliente:
         """Crea una instancia de Cliente desde datos."""
-        self.logger.debug(f"Creando cliente con ID {data.get('CustomerID')}")
+        self.logger.debug("Creando cliente con ID %s", data.get('CustomerID'))
         
         try:
-            cliente = Cliente(
-                id_cliente=int(data['CustomerID']),
-                primer_nombre=str(data['FirstName']),
-                apellido=str(data['LastName']),
-                id_ciudad=int(data['CityID']),
-                inicial_segundo_nombre=data.get('MiddleInitial'),
-                direccion=data.get('Address')
+            cliente = self._crear_cliente_tipado(
+                int(data['CustomerID']), str(data['FirstName']), str(data['LastName']), int(data['CityID']),
+                data.get('MiddleInitial'), data.get('Address')
             )
             
-            self.logger.debug(f"Cliente creado: {cliente.nombre_completo()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Cliente creado: %s", cliente.nombre_completo())
             return cliente
             
         except Exception as e:
@@ -259,36 +422,17 @@ class FabricaModelos:
     
     def _create_empleado(self, data: Dict[str, Any]) -> Empleado:
         """Crea una instancia de Empleado desde datos."""
-        self.logger.debug(f"Creando empleado con ID {data.get('EmployeeID')}")
+        self.logger.debug("Creando empleado con ID %s", data.get('EmployeeID'))
         
         try:
-            # Convertir fechas si están presentes
-            fecha_nacimiento = None
-            if 'BirthDate' in data and data['BirthDate']:
-                if isinstance(data['BirthDate'], str):
-                    fecha_nacimiento = date.fromisoformat(data['BirthDate'].split()[0])
-                elif isinstance(data['BirthDate'], date):
-                    fecha_nacimiento = data['BirthDate']
-            
-            fecha_contratacion = None
-            if 'HireDate' in data and data['HireDate']:
-                if isinstance(data['HireDate'], str):
-                    fecha_contratacion = date.fromisoformat(data['HireDate'].split()[0])
-                elif isinstance(data['HireDate'], date):
-                    fecha_contratacion = data['HireDate']
-            
-            empleado = Empleado(
-                id_empleado=int(data['EmployeeID']),
-                primer_nombre=str(data['FirstName']),
-                apellido=str(data['LastName']),
-                id_ciudad=int(data['CityID']),
-                fecha_contratacion=fecha_contratacion,
-                inicial_segundo_nombre=data.get('MiddleInitial'),
-                fecha_nacimiento=fecha_nacimiento,
-                genero=data.get('Gender')
+            empleado = self._crear_empleado_tipado(
+                int(data['EmployeeID']), str(data['FirstName']), str(data['LastName']), int(data['CityID']),
+                _convertir_fecha(data.get('HireDate')), data.get('MiddleInitial'),
+                _convertir_fecha(data.get('BirthDate')), data.get('Gender')
             )
             
-            self.logger.debug(f"Empleado creado: {empleado.nombre_completo()}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug("Empleado creado: %s", empleado.nombre_completo())
             return empleado
             
         except Exception as e:
@@ -297,36 +441,24 @@ class FabricaModelos:
     
     def _create_producto(self, data: Dict[str, Any]) -> Producto:
         """Crea una instancia de Producto desde datos."""
-        self.logger.debug(f"Creando producto con ID {data.get('ProductID')}")
+        self.logger.debug("Creando producto con ID %s", data.get('ProductID'))
         
         try:
             # Convertir precio a Decimal
             precio = Decimal(str(data['Price']))
             
             # Convertir tiempo si está presente
-            hora_modificacion = None
-            if 'ModifyDate' in data and data['ModifyDate']:
-                if isinstance(data['ModifyDate'], str):
-                    try:
-                        hora_modificacion = time.fromisoformat(data['ModifyDate'])
-                    except ValueError:
-                        self.logger.debug(f"No se pudo parsear ModifyDate: {data['ModifyDate']}")
-                elif isinstance(data['ModifyDate'], time):
-                    hora_modificacion = data['ModifyDate']
+            hora_modificacion = _convertir_hora(data.get('ModifyDate'))
+            if hora_modificacion is None and data.get('ModifyDate'):
+                self.logger.debug("No se pudo parsear ModifyDate: %s", data['ModifyDate'])
             
-            producto = Producto(
-                id_producto=int(data['ProductID']),
-                nombre_producto=str(data['ProductName']),
-                precio=precio,
-                id_categoria=int(data['CategoryID']),
-                clase_producto=data.get('Class'),
-                hora_modificacion=hora_modificacion,
-                resistente=data.get('Resistant'),
-                es_alergenico=data.get('IsAllergic'),
-                dias_vitalidad=int(data['VitalityDays']) if data.get('VitalityDays') else None
+            producto = self._crear_producto_tipado(
+                int(data['ProductID']), str(data['ProductName']), precio, int(data['CategoryID']),
+                data.get('Class'), hora_modificacion, data.get('Resistant'), data.get('IsAllergic'),
+                int(data['VitalityDays']) if data.get('VitalityDays') else None
             )
             
-            self.logger.debug(f"Producto creado: {producto.nombre_producto} (${precio})")
+            self.logger.debug("Producto creado: %s ($%s)", producto.nombre_producto, precio)
             return producto
             
         except Exception as e:
@@ -335,6 +467,47 @@ class FabricaModelos:
     
     # ... (resto de métodos _create_* con logging similar)
     
+    # === Constructores tipados: reciben los valores ya convertidos, sin coerción por celda ===
+    
+    def _crear_cliente_tipado(self, id_cliente: int, primer_nombre: str, apellido: str, id_ciudad: int,
+                              inicial_segundo_nombre, direccion) -> Cliente:
+        return Cliente(
+            id_cliente=id_cliente,
+            primer_nombre=primer_nombre,
+            apellido=apellido,
+            id_ciudad=id_ciudad,
+            inicial_segundo_nombre=inicial_segundo_nombre,
+            direccion=direccion
+        )
+    
+    def _crear_empleado_tipado(self, id_empleado: int, primer_nombre: str, apellido: str, id_ciudad: int,
+                               fecha_contratacion, inicial_segundo_nombre, fecha_nacimiento, genero) -> Empleado:
+        return Empleado(
+            id_empleado=id_empleado,
+            primer_nombre=primer_nombre,
+            apellido=apellido,
+            id_ciudad=id_ciudad,
+            fecha_contratacion=fecha_contratacion,
+            inicial_segundo_nombre=inicial_segundo_nombre,
+            fecha_nacimiento=fecha_nacimiento,
+            genero=genero
+        )
+    
+    def _crear_producto_tipado(self, id_producto: int, nombre_producto: str, precio: Decimal, id_categoria: int,
+                               clase_producto, hora_modificacion, resistente, es_alergenico,
+                               dias_vitalidad) -> Producto:
+        return Producto(
+            id_producto=id_producto,
+            nombre_producto=nombre_producto,
+            precio=precio,
+            id_categoria=id_categoria,
+            clase_producto=clase_producto,
+            hora_modificacion=hora_modificacion,
+            resistente=resistente,
+            es_alergenico=es_alergenico,
+            dias_vitalidad=dias_vitalidad
+        )
+    
     def obtener_estadisticas(self) -> dict:
         """
         Retorna estadísticas de la fábrica.
@@ -352,6 +525,25 @@ class FabricaModelos:
         return estadisticas
 
 
+# Tabla tipo de modelo -> método de creación; los tipos sin entrada siguen sin implementación
+FabricaModelos._creators = {
+    'cliente': FabricaModelos._create_cliente,
+    'empleado': FabricaModelos._create_empleado,
+    'producto': FabricaModelos._create_producto,
+}
+
+# Creación masiva por columnas: preparador de columnas y constructor tipado por tipo de modelo
+FabricaModelos._preparadores_columnas = {
+    'cliente': FabricaModelos._columnas_cliente,
+    'empleado': FabricaModelos._columnas_empleado,
+    'producto': FabricaModelos._columnas_producto,
+}
+FabricaModelos._creators_tipados = {
+    'cliente': FabricaModelos._crear_cliente_tipado,
+    'empleado': FabricaModelos._crear_empleado_tipado,
+    'producto': FabricaModelos._crear_producto_tipado,
+}
+
 # Ejemplo de uso con logging
 if __name__ == "__main__":
     from src.utils.sistema_logging import log_inicio_aplicacion, log_fin_aplicacion
@@ -0,0 +1,98 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Type
+
+
+class PoolObjetos:
+    """
+    Patrón Object Pool para modelos de vida corta (p. ej. Producto durante una carga CSV).
+
+    Las instancias liberadas se guardan y se reinicializan con `__init__` en el siguiente
+    `adquirir`, evitando crear y recolectar un objeto nuevo por cada fila procesada.
+    Una instancia liberada no debe seguir usándose: su contenido se sobrescribirá.
+    """
+
+    def __init__(self, clase_modelo: Type, capacidad: int = 8192):
+        """
+        Args:
+            clase_modelo (Type): Clase cuyo `__init__` puede volver a invocarse sobre una instancia existente.
+            capacidad (int): Máximo de instancias libres que conserva el pool.
+        """
+        if capacidad <= 0:
+            raise ValueError("La capacidad del pool debe ser un número positivo.")
+        self.clase_modelo = clase_modelo
+        self.capacidad = capacidad
+        # El lock protege la lista de libres y los contadores para que el pool pueda compartirse entre hilos;
+        # la reinicialización con __init__ ocurre fuera del lock
+        self._lock = threading.Lock()
+        self._libres = deque()
+        # ids de las instancias libres: el pool las referencia, así que el id no se reutiliza mientras estén aquí
+        self._ids_libres = set()
+        self.instancias_creadas = 0
+        self.instancias_reutilizadas = 0
+
+    def adquirir(self, *args, **kwargs) -> Any:
+        """Devuelve una instancia inicializada con los argumentos dados, reutilizando una libre si la hay."""
+        with self._lock:
+            if self._libres:
+                instancia = self._libres.pop()
+                self._ids_libres.discard(id(instancia))
+            else:
+                instancia = None
+                self.instancias_creadas += 1
+        if instancia is None:
+            return self.clase_modelo(*args, **kwargs)
+
+        try:
+            instancia.__init__(*args, **kwargs)
+        except Exception:
+            # Si la validación falla, la instancia queda a medio inicializar pero sigue siendo reutilizable
+            self.liberar(instancia)
+            raise
+        with self._lock:
+            self.instancias_reutilizadas += 1
+        return instancia
+
+    def liberar(self, instancia: Any) -> None:
+        """
+        Devuelve una instancia al pool; se descarta si el pool ya está lleno.
+
+        Raises:
+            ValueError: Si la instancia ya está libre en el pool. Liberarla dos veces haría que dos
+                `adquirir` posteriores recibieran el mismo objeto.
+        """
+        with self._lock:
+            if id(instancia) in self._ids_libres:
+                raise ValueError("La instancia ya fue liberada al pool.")
+            if len(self._libres) < self.capacidad:
+                self._libres.append(instancia)
+                self._ids_libres.add(id(instancia))
+
+    @contextmanager
+    def prestado(self, *args, **kwargs):
+        """Adquiere una instancia durante el bloque `with` y la libera al salir."""
+        instancia = self.adquirir(*args, **kwargs)
+        try:
+            yield instancia
+        finally:
+            self.liberar(instancia)
+
+    def __len__(self) -> int:
+        return len(self._libres)
+
+    def obtener_estadisticas(self) -> dict:
+        """
+        Retorna estadísticas de uso del pool.
+
+        Returns:
+            dict: Instancias creadas, reutilizadas y libres
+        """
+        with self._lock:
+            return {
+                'clase': self.clase_modelo.__name__,
+                'instancias_creadas': self.instancias_creadas,
+                'instancias_reutilizadas': self.instancias_reutilizadas,
+                'instancias_libres': len(self._libres),
+                'capacidad': self.capacidad,
+            }
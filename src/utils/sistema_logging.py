@@ -2,10 +2,11 @@ import logging
 import logging.handlers
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
-from functools import wraps
+from functools import lru_cache, wraps
 import traceback
 
 
@@ -155,6 +156,12 @@ class ConfiguradorLogging:
         return logging.getLogger(nombre_completo)
 
 
+@lru_cache(maxsize=None)
+def _obtener_logger_cacheado(nombre: str) -> logging.Logger:
+    """Resuelve una sola vez el logger de cada clase para los decoradores de registro."""
+    return ConfiguradorLogging.obtener_logger(nombre)
+
+
 def registrar_operacion(operacion: str):
     """
     Decorador para registrar automáticamente operaciones en métodos.
@@ -171,18 +178,22 @@ def registrar_operacion(operacion: str):
             else:
                 nombre_clase = func.__module__.split('.')[-1]
             
-            logger = ConfiguradorLogging.obtener_logger(nombre_clase)
+            logger = _obtener_logger_cacheado(nombre_clase)
+            # Con INFO deshabilitado no se mide ni se formatea nada
+            registrar = logger.isEnabledFor(logging.INFO)
             
             # Registrar inicio de operación
-            logger.info(f"INICIANDO: {operacion}")
+            if registrar:
+                logger.info("INICIANDO: %s", operacion)
             
             try:
-                inicio = datetime.now()
+                inicio_ns = time.perf_counter_ns() if registrar else 0
                 resultado = func(*args, **kwargs)
-                duracion = (datetime.now() - inicio).total_seconds()
                 
                 # Registrar éxito
-                logger.info(f"COMPLETADO: {operacion} (duración: {duracion:.3f}s)")
+                if registrar:
+                    duracion = (time.perf_counter_ns() - inicio_ns) * 1e-9
+                    logger.info("COMPLETADO: %s (duración: %.3fs)", operacion, duracion)
                 return resultado
                 
             except Exception as e:
@@ -203,22 +214,24 @@ def registrar_consulta_sql(func):
     """
     @wraps(func)
     def wrapper(self, consulta_sql: str, *args, **kwargs):
-        logger = ConfiguradorLogging.obtener_logger("ConexionBD")
+        logger = _obtener_logger_cacheado("ConexionBD")
         
         # Registrar consulta (truncada para legibilidad)
-        consulta_truncada = consulta_sql[:200] + "..." if len(consulta_sql) > 200 else consulta_sql
-        logger.debug(f"Ejecutando SQL: {consulta_truncada}")
+        if logger.isEnabledFor(logging.DEBUG):
+            consulta_truncada = consulta_sql[:200] + "..." if len(consulta_sql) > 200 else consulta_sql
+            logger.debug("Ejecutando SQL: %s", consulta_truncada)
         
         try:
-            inicio = datetime.now()
+            inicio_ns = time.perf_counter_ns()
             resultado = func(self, consulta_sql, *args, **kwargs)
-            duracion = (datetime.now() - inicio).total_seconds()
+            duracion = (time.perf_counter_ns() - inicio_ns) * 1e-9
             
             if resultado is not None:
-                filas = len(resultado) if hasattr(resultado, '__len__') else 'N/A'
-                logger.info(f"Consulta exitosa: {filas} filas en {duracion:.3f}s")
+                if logger.isEnabledFor(logging.INFO):
+                    filas = len(resultado) if hasattr(resultado, '__len__') else 'N/A'
+                    logger.info("Consulta exitosa: %s filas en %.3fs", filas, duracion)
             else:
-                logger.warning(f"Consulta retornó None en {duracion:.3f}s")
+                logger.warning("Consulta retornó None en %.3fs", duracion)
             
             return resultado
             
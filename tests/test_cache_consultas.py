@@ -0,0 +1,385 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+import pandas as pd
+
+from src.utils.cache_consultas import GestorCacheConsultas, cache_consulta, obtener_gestor_cache, _tablas_de_escritura
+
+
+@pytest.fixture
+def gestor_cache(tmp_path):
+    """
+    Devuelve el Singleton del cache con el directorio persistente redirigido a un directorio temporal
+    y el cache en memoria vacío, para que cada prueba parta de un estado limpio.
+    """
+    gestor = GestorCacheConsultas()
+    directorio_original = gestor.directorio_cache
+    gestor.directorio_cache = tmp_path
+    gestor._cache_memoria.clear()
+    gestor._bytes_en_memoria = 0
+    gestor._claves_por_tabla.clear()
+    gestor._consulta_por_clave.clear()
+    gestor._tablas_invalidadas.clear()
+    yield gestor
+    gestor.esperar_persistencia()
+    gestor._cache_memoria.clear()
+    gestor._bytes_en_memoria = 0
+    gestor._claves_por_tabla.clear()
+    gestor._consulta_por_clave.clear()
+    gestor._tablas_invalidadas.clear()
+    gestor.directorio_cache = directorio_original
+
+
+def test_hit_de_cache_no_altera_resultado_cacheado(gestor_cache):
+    """Verifica que modificar el DataFrame devuelto por un HIT no modifique el resultado cacheado."""
+    consulta = "SELECT id, total FROM ventas"
+    gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1, 2], 'total': [10.0, 20.0]}))
+
+    resultado = gestor_cache.obtener_desde_cache(consulta)
+    resultado.loc[0, 'total'] = -1.0
+    resultado['nueva'] = 0
+
+    resultado_posterior = gestor_cache.obtener_desde_cache(consulta)
+    assert resultado_posterior['total'].tolist() == [10.0, 20.0]
+    assert 'nueva' not in resultado_posterior.columns
+
+
+def test_hit_de_cache_con_copy_on_write(gestor_cache):
+    """Con copy-on-write activo, el HIT sigue aislado del resultado cacheado."""
+    consulta = "SELECT id FROM productos"
+    with pd.option_context("mode.copy_on_write", True):
+        gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1, 2, 3]}))
+        resultado = gestor_cache.obtener_desde_cache(consulta)
+        resultado.loc[0, 'id'] = 99
+
+        assert gestor_cache.obtener_desde_cache(consulta)['id'].tolist() == [1, 2, 3]
+
+
+def test_obtener_o_calcular_consulta_bd_una_sola_vez(gestor_cache):
+    """La segunda llamada con la misma consulta debe servirse desde cache sin invocar el cálculo."""
+    consulta = "SELECT id FROM clientes WHERE id = %(id)s"
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        return pd.DataFrame({'id': [7]})
+
+    primero = gestor_cache.obtener_o_calcular(consulta, {'id': 7}, calcular)
+    segundo = gestor_cache.obtener_o_calcular(consulta, {'id': 7}, calcular)
+
+    assert len(llamadas) == 1
+    assert primero['id'].tolist() == segundo['id'].tolist() == [7]
+
+
+def test_hit_sin_copia_devuelve_objeto_cacheado(gestor_cache, monkeypatch):
+    """Con copia_al_obtener desactivado el HIT entrega el mismo objeto guardado en memoria."""
+    monkeypatch.setattr(gestor_cache, 'copia_al_obtener', False)
+    consulta = "SELECT id FROM categorias"
+    gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1, 2]}))
+
+    assert gestor_cache.obtener_desde_cache(consulta) is gestor_cache.obtener_desde_cache(consulta)
+
+
+def test_invalidar_cache_tabla_solo_afecta_consultas_de_esa_tabla(gestor_cache):
+    """Invalidar 'sales' elimina las consultas que la leen (incluido un JOIN) y conserva las demás."""
+    consulta_ventas = "SELECT SalesID FROM sales"
+    consulta_join = "SELECT p.ProductName FROM products p JOIN sales s ON s.ProductID = p.ProductID"
+    consulta_clientes = "SELECT CustomerID FROM customers"
+    for consulta in (consulta_ventas, consulta_join, consulta_clientes):
+        gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1]}))
+
+    gestor_cache.invalidar_cache_tabla("sales")
+
+    assert gestor_cache.obtener_desde_cache(consulta_ventas) is None
+    assert gestor_cache.obtener_desde_cache(consulta_join) is None
+    assert gestor_cache.obtener_desde_cache(consulta_clientes) is not None
+
+
+def test_guardar_en_cache_aisla_resultado_del_llamador(gestor_cache):
+    """Modificar el DataFrame original después de guardarlo no altera el resultado cacheado."""
+    consulta = "SELECT * FROM productos"
+    resultado = pd.DataFrame({'id': [1, 2], 'precio': [10.0, 20.0]})
+
+    with pd.option_context("mode.copy_on_write", True):
+        gestor_cache.guardar_en_cache(consulta, resultado)
+        resultado.loc[0, 'precio'] = 99.0
+        cacheado = gestor_cache.obtener_desde_cache(consulta)
+
+    assert cacheado['precio'].tolist() == [10.0, 20.0]
+
+
+def test_limpieza_de_expirados_se_dispara_desde_un_acceso(gestor_cache):
+    """Pasado el intervalo de limpieza, el siguiente acceso elimina en segundo plano las entradas expiradas."""
+    gestor_cache.guardar_en_cache("SELECT * FROM ventas", pd.DataFrame({'id': [1]}))
+    clave = gestor_cache._generar_clave_cache("SELECT * FROM ventas")
+    resultado, _, tamaño = gestor_cache._cache_memoria[clave]
+    gestor_cache._cache_memoria[clave] = (resultado, 0, tamaño) # Vencida
+    gestor_cache._proxima_limpieza_ns = 0
+
+    gestor_cache.obtener_desde_cache("SELECT * FROM clientes")
+    for hilo in [h for h in threading.enumerate() if h.name == "LimpiezaCache"]:
+        hilo.join(timeout=5)
+
+    assert clave not in gestor_cache._cache_memoria
+    assert datetime.now() - gestor_cache.ultimo_cleanup < timedelta(minutes=1)
+
+
+def test_cache_desaloja_la_entrada_menos_usada(gestor_cache, monkeypatch):
+    """Al superar el tamaño máximo se desaloja la entrada usada hace más tiempo, no la insertada primero."""
+    monkeypatch.setattr(gestor_cache, 'tamaño_maximo_cache', 2)
+    gestor_cache.guardar_en_cache("SELECT * FROM ventas", pd.DataFrame({'id': [1]}))
+    gestor_cache.guardar_en_cache("SELECT * FROM clientes", pd.DataFrame({'id': [2]}))
+
+    assert gestor_cache.obtener_desde_cache("SELECT * FROM ventas") is not None
+    gestor_cache.guardar_en_cache("SELECT * FROM productos", pd.DataFrame({'id': [3]}))
+
+    claves = set(gestor_cache._cache_memoria)
+    assert gestor_cache._generar_clave_cache("SELECT * FROM ventas") in claves
+    assert gestor_cache._generar_clave_cache("SELECT * FROM clientes") not in claves
+    assert len(claves) == 2
+
+
+def test_invalidar_cache_con_patron_usa_indice_de_tablas(gestor_cache):
+    """El patrón se interpreta como nombre de tabla y solo invalida las consultas que la usan."""
+    gestor_cache.guardar_en_cache("SELECT * FROM ventas v JOIN clientes c ON v.id = c.id", pd.DataFrame({'id': [1]}))
+    gestor_cache.guardar_en_cache("SELECT * FROM productos", pd.DataFrame({'id': [2]}))
+
+    gestor_cache.invalidar_cache("Clientes")
+
+    assert gestor_cache.obtener_desde_cache("SELECT * FROM ventas v JOIN clientes c ON v.id = c.id") is None
+    assert gestor_cache.obtener_desde_cache("SELECT * FROM productos") is not None
+
+
+def test_invalidar_cache_con_patron_que_no_es_nombre_de_tabla(gestor_cache, tmp_path):
+    """
+    Un nombre con esquema y backticks usa el índice; cualquier otro texto se busca en las consultas
+    cacheadas, y los archivos en disco sin consulta conocida se descartan por seguridad.
+    """
+    con_filtro = "SELECT * FROM ventas WHERE CustomerID = 5"
+    sin_filtro = "SELECT * FROM ventas"
+    productos = "SELECT * FROM productos"
+    for consulta in (con_filtro, sin_filtro, productos):
+        gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1]}))
+    gestor_cache.esperar_persistencia()
+    huerfano = tmp_path / "huerfano.pkl"
+    huerfano.write_bytes(b"x")
+
+    gestor_cache.invalidar_cache("customerid  =  5")
+
+    assert gestor_cache.obtener_desde_cache(con_filtro) is None
+    assert gestor_cache.obtener_desde_cache(sin_filtro) is not None
+    assert not huerfano.exists()
+    assert gestor_cache._archivo_cache(gestor_cache._generar_clave_cache(sin_filtro)).exists()
+
+    gestor_cache.invalidar_cache("`ventas_db`.`Ventas`")
+
+    assert gestor_cache.obtener_desde_cache(sin_filtro) is None
+    assert gestor_cache.obtener_desde_cache(productos) is not None
+
+
+def test_decorador_cache_consulta_usa_el_singleton(gestor_cache):
+    """El decorador reutiliza el Singleton existente y solo ejecuta la consulta original en el MISS."""
+    llamadas = []
+
+    class Repositorio:
+        @cache_consulta()
+        def obtener(self, consulta_sql, parametros=None):
+            llamadas.append(consulta_sql)
+            return pd.DataFrame({'id': [1, 2]})
+
+    repositorio = Repositorio()
+    repositorio.obtener("SELECT id FROM ventas")
+    repositorio.obtener("SELECT id FROM ventas")
+
+    assert obtener_gestor_cache() is gestor_cache
+    assert llamadas == ["SELECT id FROM ventas"]
+
+
+def test_contadores_de_cache_registran_hits_y_misses(gestor_cache):
+    """Las estadísticas reflejan los HIT, MISS y almacenamientos realizados."""
+    antes = gestor_cache.obtener_estadisticas_cache()
+
+    gestor_cache.obtener_desde_cache("SELECT * FROM categorias")
+    gestor_cache.guardar_en_cache("SELECT * FROM categorias", pd.DataFrame({'id': [1]}))
+    gestor_cache.obtener_desde_cache("SELECT * FROM categorias")
+    gestor_cache.obtener_desde_cache("SELECT * FROM categorias")
+
+    despues = gestor_cache.obtener_estadisticas_cache()
+    assert despues['hits_cache'] - antes['hits_cache'] == 2
+    assert despues['misses_cache'] - antes['misses_cache'] == 1
+    assert despues['consultas_cacheadas_exitosamente'] - antes['consultas_cacheadas_exitosamente'] == 1
+
+
+def test_limpiar_cache_expirado_elimina_solo_archivos_vencidos(gestor_cache, tmp_path):
+    """Los archivos de cache con mtime anterior a la duración configurada se borran; los recientes se conservan."""
+    vencido = tmp_path / "vencido.pkl"
+    reciente = tmp_path / "reciente.pkl"
+    ajeno = tmp_path / "notas.txt"
+    for archivo in (vencido, reciente, ajeno):
+        archivo.write_bytes(b"x")
+    hace_un_dia = (datetime.now() - timedelta(days=1)).timestamp()
+    os.utime(vencido, (hace_un_dia, hace_un_dia))
+    os.utime(ajeno, (hace_un_dia, hace_un_dia))
+
+    gestor_cache.limpiar_cache_expirado()
+
+    assert not vencido.exists()
+    assert reciente.exists() and ajeno.exists()
+    assert gestor_cache.obtener_estadisticas_cache()['archivos_en_disco'] == 1
+
+
+def test_guardar_en_cache_persiste_en_disco_en_segundo_plano(gestor_cache, tmp_path):
+    """La escritura en disco corre en el hilo 'cache-io' y el archivo queda disponible tras esperarla."""
+    hilos_escritura = []
+    persistir_original = gestor_cache._persistir
+
+    def persistir_registrando(*args):
+        hilos_escritura.append(threading.current_thread().name)
+        persistir_original(*args)
+
+    gestor_cache._persistir = persistir_registrando
+    try:
+        gestor_cache.guardar_en_cache("SELECT * FROM paises", pd.DataFrame({'id': [1, 2]}))
+        gestor_cache.esperar_persistencia()
+    finally:
+        del gestor_cache._persistir
+
+    assert len(hilos_escritura) == 1 and hilos_escritura[0].startswith('cache-io')
+    assert gestor_cache.obtener_estadisticas_cache()['archivos_en_disco'] == 1
+
+
+def test_desalojo_por_presupuesto_de_bytes(gestor_cache, monkeypatch):
+    """Al superar el presupuesto de bytes se desalojan las entradas menos usadas aunque sobren entradas."""
+    monkeypatch.setattr(gestor_cache, '_bytes_max', 250)
+    for nombre in ("a", "b", "c"):
+        gestor_cache._guardar_en_memoria(nombre, pd.DataFrame(), 100)
+        gestor_cache._desalojar_exceso()
+
+    assert list(gestor_cache._cache_memoria) == ["b", "c"]
+    assert gestor_cache._bytes_en_memoria == 200
+
+    gestor_cache._guardar_en_memoria("b", pd.DataFrame(), 40)
+    assert gestor_cache._bytes_en_memoria == 140
+
+
+def test_clave_cache_independiente_del_orden_de_parametros(gestor_cache):
+    """El orden de inserción de los parámetros no cambia la clave, pero sí el tipo de sus valores."""
+    consulta = "SELECT * FROM ventas WHERE CustomerID = :cliente AND SalesPersonID = :empleado"
+    clave = gestor_cache._generar_clave_cache(consulta, {'cliente': 5, 'empleado': 7})
+
+    assert gestor_cache._generar_clave_cache(consulta, {'empleado': 7, 'cliente': 5}) == clave
+    assert gestor_cache._generar_clave_cache(consulta, {'cliente': '5', 'empleado': 7}) != clave
+
+
+def test_accesos_concurrentes_mantienen_consistente_el_total_de_bytes(gestor_cache, monkeypatch):
+    """Inserciones, HITs y desalojos desde varios hilos dejan el total de bytes igual a la suma de entradas."""
+    monkeypatch.setattr(gestor_cache, 'tamaño_maximo_cache', 16)
+
+    def trabajar(indice_hilo):
+        for i in range(200):
+            clave = f"{indice_hilo}-{i % 40}"
+            gestor_cache._guardar_en_memoria(clave, pd.DataFrame(), i + 1)
+            gestor_cache._quitar_de_memoria(f"{indice_hilo}-{(i + 7) % 40}")
+
+    hilos = [threading.Thread(target=trabajar, args=(n,)) for n in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert len(gestor_cache._cache_memoria) <= 16
+    assert gestor_cache._bytes_en_memoria == sum(t for _, _, t in gestor_cache._cache_memoria.values())
+
+
+def test_clave_cache_distingue_tipos_de_claves_y_valores(gestor_cache):
+    """Parámetros que solo difieren en el tipo de una clave o de un valor no comparten clave de cache."""
+    from datetime import date
+    from decimal import Decimal
+
+    consulta = "SELECT * FROM ventas WHERE SalesDate = %(fecha)s"
+    pares = [
+        ({1: 'a'}, {'1': 'a'}),
+        ({'fecha': date(2020, 1, 1)}, {'fecha': '2020-01-01'}),
+        ({'monto': Decimal('5')}, {'monto': "Decimal('5')"}),
+        ({'activo': True}, {'activo': 1}),
+    ]
+    for parametros_a, parametros_b in pares:
+        assert (gestor_cache._generar_clave_cache(consulta, parametros_a)
+                != gestor_cache._generar_clave_cache(consulta, parametros_b))
+
+
+def test_indice_de_tablas_sigue_a_las_entradas_en_memoria(gestor_cache, monkeypatch):
+    """Las claves desalojadas, quitadas o expiradas salen del índice tabla -> claves."""
+    monkeypatch.setattr(gestor_cache, 'tamaño_maximo_cache', 2)
+    for i in range(5):
+        gestor_cache._guardar_en_memoria(f"c{i}", pd.DataFrame(), 1, f"SELECT * FROM ventas v JOIN t{i} x ON 1")
+
+    assert set(gestor_cache._cache_memoria) == {"c3", "c4"}
+    assert gestor_cache._claves_por_tabla == {'ventas': {"c3", "c4"}, 't3': {"c3"}, 't4': {"c4"}}
+
+    gestor_cache._quitar_de_memoria("c3")
+    gestor_cache._cache_memoria["c4"] = (pd.DataFrame(), 0, 1) # vencida
+    gestor_cache.limpiar_cache_expirado()
+
+    assert gestor_cache._claves_por_tabla == {}
+    assert gestor_cache._consulta_por_clave == {}
+
+
+def test_recarga_desde_disco_cobra_el_tamaño_en_memoria(gestor_cache):
+    """Una entrada recargada del disco cuenta en el presupuesto con su tamaño en RAM, no el del archivo."""
+    consulta = "SELECT * FROM clientes"
+    resultado = pd.DataFrame({'nombre': ['x' * 200] * 50})
+    gestor_cache.guardar_en_cache(consulta, resultado)
+    gestor_cache.esperar_persistencia()
+    gestor_cache._quitar_de_memoria(gestor_cache._generar_clave_cache(consulta))
+
+    assert gestor_cache.obtener_desde_cache(consulta) is not None
+    assert gestor_cache._bytes_en_memoria == int(resultado.memory_usage(deep=True).sum())
+
+
+def test_invalidacion_durante_la_escritura_no_deja_archivo_obsoleto(gestor_cache, tmp_path, monkeypatch):
+    """Si la tabla se invalida mientras el hilo de E/S escribe, el archivo no se publica."""
+    consulta = "SELECT * FROM ventas"
+    escribir_original = gestor_cache._escribir_archivo_cache
+
+    def escribir_e_invalidar(*args, **kwargs):
+        escribir_original(*args, **kwargs)
+        gestor_cache.invalidar_cache_tabla("ventas")
+
+    monkeypatch.setattr(gestor_cache, '_escribir_archivo_cache', escribir_e_invalidar)
+    gestor_cache.guardar_en_cache(consulta, pd.DataFrame({'id': [1]}))
+    gestor_cache.esperar_persistencia()
+
+    assert list(tmp_path.iterdir()) == []
+    assert gestor_cache.obtener_desde_cache(consulta) is None
+
+
+def test_contadores_no_pierden_incrementos_entre_hilos(gestor_cache):
+    """Los incrementos concurrentes de estadísticas se cuentan todos."""
+    antes = gestor_cache.hits_cache
+
+    def contar():
+        for _ in range(500):
+            gestor_cache._contar('hits')
+
+    hilos = [threading.Thread(target=contar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+
+    assert gestor_cache.hits_cache - antes == 2000
+
+
+def test_tablas_de_escritura_reconoce_el_destino_de_cada_sentencia():
+    """Las escrituras se resuelven a sus tablas; sin tabla reconocible se devuelve un conjunto vacío."""
+    assert _tablas_de_escritura("UPDATE products SET Price = 1") == {'products'}
+    assert _tablas_de_escritura("INSERT IGNORE INTO `db`.`Sales` (a) VALUES (1)") == {'sales'}
+    assert _tablas_de_escritura("DELETE FROM sales WHERE SalesID = 3") == {'sales'}
+    assert _tablas_de_escritura("TRUNCATE TABLE products") == {'products'}
+    assert _tablas_de_escritura("DROP TABLE IF EXISTS a, b") == {'a', 'b'}
+    assert _tablas_de_escritura("LOAD DATA INFILE 'p.csv' INTO TABLE products") == {'products'}
+    assert _tablas_de_escritura("UPDATE sales s JOIN t USING (id) SET s.Discount = 0") == {'sales', 't'}
+    assert _tablas_de_escritura("DROP VIEW resumen") == frozenset()
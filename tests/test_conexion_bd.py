@@ -1,6 +1,7 @@
 import pytest
 from src.conexion_bd import ConexionBD 
 import pandas as pd 
+from unittest.mock import MagicMock
 
 def test_singleton_conexion_bd():
     """
@@ -29,20 +30,188 @@ def test_singleton_conexion_bd():
         print("Motor de BD no inicializado en test_singleton_conexion_bd, prueba de conexión real omitida.")
         pass
 
-def test_ejecutar_consulta_sin_conexion(mocker):
+@pytest.fixture
+def conector(mocker):
     """
-    Prueba que ejecutar_consulta maneja el caso donde no hay conexión (self.__motor es None).
+    Singleton de ConexionBD con el motor simulado, para probar sin MySQL real.
+    El reseteo del Singleton y del accesor cacheado va tras el yield, así que ocurre aunque la
+    prueba falle y el Timer de métricas de la instancia descartada se detiene solo.
     """
-    # Obtenemos la instancia Singleton. Podría ser una ya existente.
-    conector_para_prueba = ConexionBD()
+    from src.conexion_bd import obtener_conexion
+
+    mocker.patch.dict('os.environ', {
+        'DB_HOST': 'localhost_test',
+        'DB_USER': 'test_user',
+        'DB_PASSWORD': 'test_pass',
+        'DB_NAME': 'test_db'
+    })
+    ConexionBD._ConexionBD__instancia = None
+    obtener_conexion.cache_clear()
+    mocker.patch('src.conexion_bd.create_engine', return_value=MagicMock())
+    yield ConexionBD()
+    ConexionBD._ConexionBD__instancia = None
+    obtener_conexion.cache_clear()
 
+
+def test_ejecutar_consulta_sin_conexion(mocker, conector):
+    """
+    Prueba que ejecutar_consulta maneja el caso donde no hay conexión (self.__motor es None).
+    """
     # Usar mocker para parchear el atributo '__motor' (nombre mangled: _ConexionBD__motor)
-    # de la instancia específica 'conector_para_prueba' para que sea None. Esto simula que la conexión no se estableció o se perdió.
-    mocker.patch.object(conector_para_prueba, '_ConexionBD__motor', None)
+    # de la instancia específica 'conector' para que sea None. Esto simula que la conexión no se estableció o se perdió.
+    mocker.patch.object(conector, '_ConexionBD__motor', None)
     
-    if hasattr(conector_para_prueba, '_ConexionBD__sesion'):
-         mocker.patch.object(conector_para_prueba, '_ConexionBD__sesion', None)
+    if hasattr(conector, '_ConexionBD__sesion'):
+         mocker.patch.object(conector, '_ConexionBD__sesion', None)
 
-    df_resultado = conector_para_prueba.ejecutar_consulta("SELECT 1")
+    df_resultado = conector.ejecutar_consulta("SELECT 1")
     
-    assert df_resultado is None, "Debería retornar None si no hay motor de conexión."
\ No newline at end of file
+    assert df_resultado is None, "Debería retornar None si no hay motor de conexión."
+
+
+def test_sentencia_escritura_invalida_cache(mocker, conector):
+    """
+    Verifica que una sentencia de escritura invalide el cache de consultas y que un SELECT no lo haga.
+    """
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+    from src.conexion_bd import VERBOS_ESCRITURA, _verbo_sql
+
+    motor_sqlite = create_engine("sqlite://", poolclass=StaticPool)
+    with motor_sqlite.begin() as conn:
+        conn.execute(text("CREATE TABLE products (ProductID INTEGER, Price REAL)"))
+        conn.execute(text("INSERT INTO products (ProductID, Price) VALUES (1, 9.5)"))
+    mocker.patch.object(conector, '_ConexionBD__motor', motor_sqlite)
+    mock_invalidar = mocker.patch.object(conector.gestor_cache, 'invalidar_cache')
+    mock_invalidar_tabla = mocker.patch.object(conector.gestor_cache, 'invalidar_cache_tabla')
+
+    df_resultado = conector.ejecutar_consulta("SELECT ProductID, Price FROM products", usar_cache=False)
+    assert df_resultado.to_dict('records') == [{'ProductID': 1, 'Price': 9.5}]
+    mock_invalidar.assert_not_called()
+    mock_invalidar_tabla.assert_not_called()
+
+    # La escritura invalida solo la tabla afectada, sin vaciar el resto del cache
+    conector.ejecutar_consulta("UPDATE products SET Price = 1 WHERE ProductID = 1")
+    mock_invalidar_tabla.assert_called_once_with('products')
+    mock_invalidar.assert_not_called()
+    assert conector.ejecutar_consulta("SELECT Price FROM products", usar_cache=False)['Price'].tolist() == [1.0]
+
+    # SQLite no soporta TRUNCATE; aun si la sentencia falla, el cache se invalida en el finally
+    mock_invalidar_tabla.reset_mock()
+    conector.ejecutar_consulta("TRUNCATE TABLE products")
+    mock_invalidar_tabla.assert_called_once_with('products')
+
+    # Un procedimiento almacenado puede escribir cualquier tabla: se vacía todo el cache
+    conector.ejecutar_consulta("CALL recalcular_precios()")
+    mock_invalidar.assert_called_once_with()
+    for sentencia in ("DROP TABLE products", "ALTER TABLE products ADD Stock INT",
+                      "LOAD DATA INFILE 'p.csv' INTO TABLE products", "CALL recalcular_precios()"):
+        assert _verbo_sql(sentencia) in VERBOS_ESCRITURA
+
+
+def test_literal_con_dos_puntos_no_se_toma_como_parametro(mocker, conector):
+    """
+    Un ':nombre' dentro de un literal no debe interpretarse como parámetro ligado:
+    la consulta se envía cruda al driver y devuelve el literal intacto.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import StaticPool
+
+    mocker.patch.object(conector, '_ConexionBD__motor', create_engine("sqlite://", poolclass=StaticPool))
+
+    df_resultado = conector.ejecutar_consulta("SELECT 'hora :fin' AS h", usar_cache=False)
+    assert df_resultado is not None
+    assert df_resultado['h'].tolist() == ['hora :fin']
+    assert conector._ConexionBD__ejecutar_escalar("SELECT 'a :b'") == 'a :b'
+
+
+def test_ejecutar_consulta_streaming_por_bloques(mocker, conector):
+    """
+    Verifica que la consulta en streaming entregue el resultado en bloques del tamaño pedido.
+    Se usa un motor SQLite en memoria en lugar de MySQL.
+    """
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import StaticPool
+
+    motor_sqlite = create_engine("sqlite://", poolclass=StaticPool)
+    with motor_sqlite.begin() as conn:
+        conn.execute(text("CREATE TABLE ventas (id INTEGER)"))
+        conn.execute(text("INSERT INTO ventas (id) VALUES (1), (2), (3), (4), (5)"))
+    mocker.patch.object(conector, '_ConexionBD__motor', motor_sqlite)
+
+    bloques = list(conector.ejecutar_consulta_streaming("SELECT id FROM ventas ORDER BY id", chunksize=2))
+
+    assert [len(bloque) for bloque in bloques] == [2, 2, 1]
+    assert pd.concat(bloques)['id'].tolist() == [1, 2, 3, 4, 5]
+
+
+def test_obtener_conexion_reutiliza_instancia(conector):
+    """
+    Verifica que el accesor de módulo devuelva siempre la misma instancia Singleton y su motor.
+    """
+    from src.conexion_bd import obtener_conexion, obtener_motor_bd
+
+    assert obtener_conexion() is conector
+    assert obtener_conexion() is obtener_conexion()
+    assert obtener_motor_bd() is conector.obtener_motor()
+
+
+def test_validar_salud_conexion_sin_dataframe(mocker, conector):
+    """
+    Verifica que la validación de salud use un SELECT 1 escalar sin pasar por ejecutar_consulta.
+    """
+    from sqlalchemy import create_engine
+
+    mocker.patch.object(conector, '_ConexionBD__motor', create_engine("sqlite://"))
+    espia_consulta = mocker.spy(conector, 'ejecutar_consulta')
+
+    assert conector.validar_salud_conexion() is True
+    espia_consulta.assert_not_called()
+
+
+def test_ejecutar_consultas_concurrentes_conserva_orden(mocker, conector):
+    """
+    Verifica que las consultas concurrentes devuelvan los resultados en el orden de entrada
+    y que se respeten los parámetros de cada una.
+    """
+    import asyncio
+
+    mocker.patch.object(conector, 'ejecutar_consulta',
+                        side_effect=lambda sql, params=None, usar_cache=True: pd.DataFrame({'sql': [sql], 'params': [params]}))
+
+    resultados = asyncio.run(conector.ejecutar_consultas_concurrentes([
+        "SELECT 1",
+        ("SELECT 2 WHERE x = %(x)s", {'x': 2}),
+    ]))
+
+    assert [df.loc[0, 'sql'] for df in resultados] == ["SELECT 1", "SELECT 2 WHERE x = %(x)s"]
+    assert resultados[1].loc[0, 'params'] == {'x': 2}
+
+
+def test_metricas_sin_psutil_registran_pool_y_consultas(mocker, conector):
+    """
+    Sin psutil (__proceso es None) se omite solo la memoria: las métricas de pool y consultas
+    se siguen registrando y no se emite la advertencia de métricas incompletas.
+    """
+    mocker.patch.object(conector, '_ConexionBD__proceso', None)
+    mock_memoria = mocker.patch.object(conector.estadisticas, 'registrar_uso_memoria')
+    mock_bd = mocker.patch.object(conector.estadisticas, 'registrar_metricas_base_datos')
+    mock_advertencia = mocker.patch.object(conector.logger, 'warning')
+
+    conector._ConexionBD__registrar_metricas_iniciales()
+    conector._ConexionBD__registrar_metricas_sistema()
+
+    mock_memoria.assert_not_called()
+    assert mock_bd.call_count == 2
+    mock_advertencia.assert_not_called()
+    assert conector.obtener_estadisticas_completas(forzar=True)['info_base_datos']['memoria_proceso_mb'] == 'N/A'
+
+
+def test_verbo_sql_reconoce_sentencia_principal_tras_cte():
+    """El verbo de una consulta con WITH es el de la sentencia principal, no el de los CTE."""
+    from src.conexion_bd import _verbo_sql
+
+    assert _verbo_sql("  select * FROM sales") == 'SELECT'
+    assert _verbo_sql("WITH t AS (SELECT id FROM sales) SELECT * FROM t") == 'SELECT'
+    assert _verbo_sql("WITH t AS (SELECT id FROM (SELECT 1 AS id) x) UPDATE sales JOIN t USING (id) SET Discount = 0") == 'UPDATE'
+    assert _verbo_sql("(SELECT 1)") == ''
@@ -33,4 +33,21 @@ def test_empleado_describir_antiguedad_varios_casos():
 
     # Caso 4: Empleado sin fecha de contratación
     empleado_sin_fecha = Empleado(id_empleado=4, primer_nombre="Juan", apellido="Nadie", id_ciudad=1)
-    assert empleado_sin_fecha.describir_antiguedad() == "Fecha de contratación no especificada."
\ No newline at end of file
+    assert empleado_sin_fecha.describir_antiguedad() == "Fecha de contratación no especificada."
+
+def test_calcular_antiguedades_anos_vectorizado_coincide_con_escalar():
+    """
+    La versión vectorizada debe coincidir con el cálculo por empleado para una fecha de referencia fija,
+    incluido el día previo al aniversario y las fechas faltantes.
+    """
+    hoy = date(2025, 5, 30)
+    fechas = [date(2022, 3, 15), date(2024, 5, 31), date(2024, 5, 30), date(2025, 1, 10), None]
+
+    esperadas = [
+        Empleado(id_empleado=i, primer_nombre="Ana", apellido="Perez", id_ciudad=1,
+                 fecha_contratacion=fecha).calcular_antiguedad_anos(hoy)
+        for i, fecha in enumerate(fechas, start=1)
+    ]
+
+    assert esperadas == [3, 0, 1, 0, None]
+    assert Empleado.calcular_antiguedades_anos(fechas, hoy).tolist() == [3, 0, 1, 0, -1]
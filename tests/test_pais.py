@@ -0,0 +1,47 @@
+import copy
+import pickle
+
+import pytest
+
+from src.modelos.pais import Pais
+
+
+def test_pais_inmutable_y_utilizable_como_clave():
+    """Los países iguales comparten hash y los cambios producen un país nuevo."""
+    pais = Pais.crear(1, " Argentina ", "ar ")
+
+    assert (pais.nombre_pais, pais.codigo_pais) == ("Argentina", "ar")
+    assert {pais: "ventas"}[Pais(1, "Argentina", "ar")] == "ventas"
+
+    renombrado = pais.reemplazar(nombre_pais="Chile")
+    assert renombrado.nombre_pais == "Chile"
+    assert pais.nombre_pais == "Argentina"
+
+    with pytest.raises(AttributeError):
+        pais.nombre_pais = "Uruguay"
+    with pytest.raises(AttributeError):
+        pais._id_pais = 9
+    with pytest.raises(AttributeError):
+        del pais._codigo_pais
+    assert pais.id_pais == 1
+    with pytest.raises(ValueError):
+        pais.reemplazar(codigo_pais="ARG")
+
+
+def test_pais_sobrevive_pickle_y_copia():
+    """La protección contra asignación no impide serializar ni copiar países."""
+    pais = Pais.crear(2, "Chile", "CL")
+    assert pickle.loads(pickle.dumps(pais)) == pais
+    assert copy.deepcopy(pais) == pais
+
+
+class PaisConRegion(Pais):
+    __slots__ = ()
+
+
+def test_subclase_de_pais_se_conserva_al_copiar_y_reemplazar():
+    """pickle y reemplazar devuelven la misma subclase, no un Pais plano."""
+    pais = PaisConRegion.crear(3, "Perú", "PE")
+
+    assert type(pickle.loads(pickle.dumps(pais))) is PaisConRegion
+    assert type(pais.reemplazar(nombre_pais="Peru")) is PaisConRegion
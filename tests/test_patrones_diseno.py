@@ -205,6 +205,60 @@ class TestPatronFactory:
         assert clientes[0].inicial_segundo_nombre == 'B'
         assert clientes[1].inicial_segundo_nombre is None
 
+    def test_fabrica_desde_dataframe_convierte_nulos_numericos(self):
+        """Los NaN de columnas numéricas llegan como None y los enteros conservan su tipo."""
+        datos_df = pd.DataFrame({
+            'ProductID': [1, 2], 'ProductName': ['Pan', 'Leche'], 'Price': [1.5, 2.25],
+            'CategoryID': [1, 2], 'VitalityDays': [30.0, float('nan')]
+        })
+        productos = self.fabrica.create_multiple_from_dataframe('producto', datos_df)
+
+        assert [producto.id_producto for producto in productos] == [1, 2]
+        assert productos[0].dias_vitalidad == 30
+        assert productos[1].dias_vitalidad is None
+
+    def test_fabrica_desde_dataframe_omite_filas_con_requeridos_nulos(self):
+        """Con columnas convertidas en bloque, las filas con obligatorios nulos se rechazan una a una."""
+        datos_df = pd.DataFrame({
+            'CustomerID': [float(i) for i in range(1, 12)],
+            'FirstName': ['Ana'] * 10 + [None],
+            'LastName': ['López'] * 11,
+            'CityID': [1] * 11,
+        })
+        clientes = self.fabrica.create_multiple_from_dataframe('cliente', datos_df)
+
+        assert [cliente.id_cliente for cliente in clientes] == list(range(1, 11))
+        assert all(type(cliente.id_cliente) is int for cliente in clientes)
+
+    def test_fabrica_empleados_con_fechas_repetidas(self):
+        """Fechas de texto repetidas se interpretan igual en cada fila, con o sin parte horaria."""
+        datos_df = pd.DataFrame({
+            'EmployeeID': [1, 2, 3], 'FirstName': ['Ana', 'Luis', 'Eva'], 'LastName': ['Ruiz', 'Gil', 'Paz'],
+            'CityID': [1, 1, 2],
+            'HireDate': ['2018-03-01 00:00:00.000', '2018-03-01 00:00:00.000', '2018-03-01'],
+        })
+        empleados = self.fabrica.create_multiple_from_dataframe('empleado', datos_df)
+
+        assert [empleado.fecha_contratacion for empleado in empleados] == [date(2018, 3, 1)] * 3
+
+    def test_fabrica_empleado_con_fecha_en_blanco_es_error_de_validacion(self):
+        """Una fecha de texto en blanco se rechaza con ValueError, igual que cualquier fecha inválida."""
+        datos_empleado = {
+            'EmployeeID': 1, 'FirstName': 'Ana', 'LastName': 'Ruiz', 'CityID': 1, 'HireDate': '   '
+        }
+        with pytest.raises(ValueError):
+            self.fabrica.create_from_dict('empleado', datos_empleado)
+
+    def test_fabrica_lote_con_fecha_en_blanco_cuenta_como_error_de_fila(self):
+        """Una celda de fecha en blanco rechaza solo su fila; el resto del lote se crea."""
+        datos_df = pd.DataFrame({
+            'EmployeeID': list(range(1, 12)), 'FirstName': ['Ana'] * 11, 'LastName': ['Ruiz'] * 11,
+            'CityID': [1] * 11, 'HireDate': ['2018-03-01'] * 10 + ['  '],
+        })
+        empleados = self.fabrica.create_multiple_from_dataframe('empleado', datos_df)
+
+        assert [empleado.id_empleado for empleado in empleados] == list(range(1, 11))
+
 
     def test_fabrica_tipo_modelo_invalido(self):
         """Verifica manejo de errores para tipos de modelo no soportados."""
@@ -216,6 +270,14 @@ class TestPatronFactory:
         assert 'modelo_inexistente' in str(excinfo.value)
         assert 'no soportado' in str(excinfo.value).lower() or 'no implementado' in str(excinfo.value).lower()
 
+    def test_fabrica_campos_requeridos_ausentes_o_nulos(self):
+        """Los campos obligatorios ausentes y los presentes con None se reportan juntos."""
+        datos = {'CustomerID': 1, 'FirstName': None, 'LastName': 'Gómez'}
+        with pytest.raises(ValueError) as excinfo:
+            self.fabrica.create_from_dict('cliente', datos)
+
+        assert "['CityID', 'FirstName']" in str(excinfo.value)
+
 
 class TestPatronBuilder:
     """
@@ -287,6 +349,38 @@ class TestPatronBuilder:
         assert "LIMIT 5" in consulta2
         assert "clientes" not in consulta2
 
+    def test_constructor_reutiliza_consulta_sin_cambios(self):
+        constructor = ConstructorConsultaSQL().seleccionar("nombre").desde_tabla("clientes")
+        consulta1 = constructor.construir()
+        assert constructor.construir() is consulta1
+
+        consulta2 = constructor.donde("activo = 1").construir()
+        assert consulta2 is not consulta1
+        assert "WHERE activo = 1" in consulta2
+
+    def test_constructor_preparar_reutiliza_sql(self):
+        constructor = (ConstructorConsultaSQL()
+                       .seleccionar("nombre")
+                       .desde_tabla("clientes")
+                       .donde("id_ciudad = %(ciudad)s")
+                       .donde("activo = %(activo)s OR id_ciudad = %(ciudad)s"))
+        preparada = constructor.preparar()
+        constructor.limite(5)
+
+        assert "LIMIT" not in preparada.sql
+        assert preparada.parametros == ('ciudad', 'activo')
+        with pytest.raises(AttributeError):
+            preparada.sql = "SELECT 1;"
+
+        conexion = Mock()
+        preparada.ejecutar({'ciudad': 1, 'activo': 1}, conexion=conexion)
+        preparada.ejecutar({'ciudad': 2, 'activo': 0}, conexion=conexion)
+        assert conexion.ejecutar_consulta.call_count == 2
+        assert {llamada.args[0] for llamada in conexion.ejecutar_consulta.call_args_list} == {preparada.sql}
+
+        with pytest.raises(ValueError):
+            preparada.ejecutar({'ciudad': 1}, conexion=conexion)
+
     def test_constructor_validacion_campos_obligatorios(self):
         constructor = ConstructorConsultaSQL()
         with pytest.raises(ValueError) as excinfo:
@@ -0,0 +1,136 @@
+from datetime import time
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.modelos.producto import Producto, ESCALA_PRECIO
+from src.utils.pool_objetos import PoolObjetos
+
+
+def test_producto_arreglo_estructurado_ida_y_vuelta():
+    """
+    Verifica que los productos se conviertan a un arreglo estructurado que permite agregar por columna
+    y que cada registro reconstruya el producto original.
+    """
+    producto1 = Producto(id_producto=1, nombre_producto="Flour - Whole Wheat", precio="74.2988", id_categoria=3,
+                         clase_producto="Medium", hora_modificacion=time(0, 21, 49, 200000),
+                         resistente="Durable", es_alergenico=None, dias_vitalidad=0)
+    producto2 = Producto(id_producto=5, nombre_producto="Artichokes - Jerusalem", precio=Decimal("65.4771"),
+                         id_categoria=2, clase_producto="Low", es_alergenico=True, dias_vitalidad=27)
+
+    arreglo = Producto.a_arreglo([producto1, producto2])
+
+    assert arreglo['precio_escalado'].sum() == 742988 + 654771
+    assert arreglo['precio_escalado'].sum() / ESCALA_PRECIO == 139.7759
+    assert arreglo[arreglo['id_categoria'] == 2]['id_producto'].tolist() == [5]
+
+    reconstruido = Producto.desde_registro(arreglo[0], producto1.nombre_producto)
+    assert repr(reconstruido) == repr(producto1)
+    assert repr(Producto.desde_registro(arreglo[1], producto2.nombre_producto)) == repr(producto2)
+
+
+def test_producto_precio_escalado_conserva_valor_decimal():
+    """El precio se guarda como entero escalado sin perder precisión respecto del Decimal original."""
+    producto = Producto(id_producto=7, nombre_producto="Sugar", precio="0.0001", id_categoria=1)
+
+    assert producto.precio_escalado == 1
+    assert producto.precio == Decimal("0.0001")
+
+    producto.precio = 25.5
+    assert producto.precio_escalado == 255000
+    assert producto.precio == Decimal("25.50")
+
+
+def test_parsear_horas_modificacion_coincide_con_parser_por_fila():
+    """La versión vectorizada produce los mismos microsegundos que el parser de una sola cadena."""
+    valores = ["21:49.2", "05:07", "13:35.4", "59:59.123456"]
+    resultado = Producto.parsear_horas_modificacion(pd.Series(valores + [None, ""]))
+
+    esperados = []
+    for valor in valores:
+        hora = Producto._parse_modify_date_str(valor)
+        esperados.append((hora.minute * 60 + hora.second) * 1_000_000 + hora.microsecond)
+    assert resultado.tolist() == esperados + [-1, -1]
+
+    with pytest.raises(ValueError):
+        Producto._parse_modify_date_str("60:00.0")
+    with pytest.raises(ValueError):
+        Producto.parsear_horas_modificacion(pd.Series(["21:49.2", "12-30"]))
+
+
+def test_parsear_hora_modificacion_acepta_fraccion_vacia():
+    """'MM:SS.' (punto sin dígitos) se acepta como cero microsegundos, igual que antes."""
+    assert Producto._parse_modify_date_str("21:49.") == time(0, 21, 49)
+    resultado = Producto.parsear_horas_modificacion(pd.Series(["21:49.", "21:49"]))
+    assert resultado.tolist() == [(21 * 60 + 49) * 1_000_000] * 2
+
+
+def test_parsear_es_alergenico_acepta_mismas_grafias_que_parser_por_fila():
+    """La columna vectorizada interpreta los textos igual que el parser individual e informa los inválidos."""
+    valores = ["TRUE", "False", " unknown ", "", "tRuE"]
+    resultado = Producto.parsear_es_alergenico(pd.Series(valores + [None]))
+
+    esperados = [Producto._parse_es_alergenico_str(valor) for valor in valores] + [None]
+    assert [None if pd.isna(valor) else valor for valor in resultado] == esperados
+
+    with pytest.raises(ValueError):
+        Producto._parse_es_alergenico_str("maybe")
+    with pytest.raises(ValueError):
+        Producto.parsear_es_alergenico(pd.Series(["TRUE", "maybe"]))
+
+
+def test_validar_lote_marca_filas_fuera_de_rango():
+    """La máscara del lote rechaza las mismas filas que rechazarían los setters individuales."""
+    id_categoria = [3, 0, 12, 5, 5, 5, 5]
+    dias_vitalidad = [-1, 10, 10, 3651, -2, 3650, 0]
+    precio_escalado = [742988, 1, 1, 1, 1, -1, 9_999_999_900]
+
+    mascara = Producto.validar_lote(id_categoria, dias_vitalidad, precio_escalado)
+
+    assert mascara.tolist() == [True, False, False, False, False, False, True]
+
+
+def test_pool_objetos_reutiliza_instancias_de_producto():
+    """El pool reinicializa la instancia liberada en lugar de crear una nueva."""
+    pool = PoolObjetos(Producto, capacidad=1)
+
+    with pool.prestado(id_producto=1, nombre_producto="Sugar", precio="1.5", id_categoria=1) as producto:
+        primero = producto
+        assert producto.precio == Decimal("1.5")
+
+    segundo = pool.adquirir(id_producto=2, nombre_producto="Salt", precio="2.25", id_categoria=3, dias_vitalidad=5)
+    assert segundo is primero
+    assert (segundo.id_producto, segundo.nombre_producto, segundo.dias_vitalidad) == (2, "Salt", 5)
+
+    pool.liberar(segundo)
+    pool.liberar(Producto(id_producto=3, nombre_producto="Rice", precio="1", id_categoria=1))
+    assert len(pool) == 1
+    assert pool.obtener_estadisticas()['instancias_reutilizadas'] == 1
+
+
+def test_pool_objetos_rechaza_doble_liberacion():
+    """Liberar dos veces la misma instancia no debe permitir que dos adquisiciones la compartan."""
+    pool = PoolObjetos(Producto, capacidad=4)
+    producto = pool.adquirir(id_producto=1, nombre_producto="Sugar", precio="1.5", id_categoria=1)
+
+    pool.liberar(producto)
+    with pytest.raises(ValueError):
+        pool.liberar(producto)
+    assert len(pool) == 1
+
+    primero = pool.adquirir(id_producto=2, nombre_producto="Salt", precio="2", id_categoria=1)
+    segundo = pool.adquirir(id_producto=3, nombre_producto="Rice", precio="3", id_categoria=1)
+    assert primero is not segundo
+    pool.liberar(primero)
+
+
+def test_productos_con_mismo_id_se_deduplican():
+    """La igualdad y el hash se basan en id_producto."""
+    original = Producto(id_producto=1, nombre_producto="Sugar", precio="1.5", id_categoria=1)
+    actualizado = Producto(id_producto=1, nombre_producto="Sugar", precio="1.75", id_categoria=1)
+    otro = Producto(id_producto=2, nombre_producto="Salt", precio="1.5", id_categoria=1)
+
+    assert original == actualizado
+    assert original != otro
+    assert len({original, actualizado, otro}) == 2
@@ -0,0 +1,58 @@
+from decimal import Decimal
+
+import pandas as pd
+import pytest
+
+from src.modelos.venta import Venta
+
+
+def test_venta_desde_dataframe_equivale_al_constructor():
+    """La carga por columnas produce las mismas ventas que el constructor fila a fila."""
+    df = pd.DataFrame({
+        'SalesID': [1, 2],
+        'SalesPersonID': [7, None],
+        'ProductID': [10, 11],
+        'CustomerID': [100, 101],
+        'Quantity': [3, 1],
+        'Discount': [Decimal('0.10'), None],
+        'TotalPrice': [Decimal('30.50'), Decimal('5.00')],
+        'TransactionNumber': ['T1', None],
+    })
+
+    ventas = Venta.desde_dataframe(df)
+
+    esperadas = [
+        Venta(1, 10, 100, 3, Decimal('30.50'), id_empleado_vendedor=7, descuento=Decimal('0.10'), numero_transaccion='T1'),
+        Venta(2, 11, 101, 1, Decimal('5.00')),
+    ]
+    assert [repr(venta) for venta in ventas] == [repr(venta) for venta in esperadas]
+    assert type(ventas[0].id_empleado_vendedor) is int and ventas[1].id_empleado_vendedor is None
+    assert ventas[0].descuento == Decimal('0.10') and ventas[1].descuento is None
+
+
+def test_venta_desde_dataframe_rechaza_cantidades_no_positivas():
+    df = pd.DataFrame({'SalesID': [1], 'ProductID': [10], 'CustomerID': [100],
+                       'Quantity': [0], 'TotalPrice': [Decimal('1.00')]})
+
+    with pytest.raises(ValueError):
+        Venta.desde_dataframe(df)
+
+
+def test_venta_desde_dataframe_acepta_cantidades_enteras_en_columna_object():
+    """Quantity como ints de Python o Decimal (columna object, como devuelve MySQL) se convierte a int."""
+    columnas = [pd.Series([3, 1], dtype=object), pd.Series([Decimal('3'), Decimal('1.0')]),
+                pd.Series([3, 1], dtype='Int64')]
+    for cantidades in columnas:
+        df = pd.DataFrame({'SalesID': [1, 2], 'ProductID': [10, 11], 'CustomerID': [100, 101],
+                           'Quantity': cantidades, 'TotalPrice': [Decimal('3.00'), Decimal('1.00')]})
+
+        ventas = Venta.desde_dataframe(df)
+
+        assert [venta.cantidad for venta in ventas] == [3, 1]
+        assert all(type(venta.cantidad) is int for venta in ventas)
+
+    for invalidas in ([Decimal('2.5')], [None], ['x'], [True]):
+        df = pd.DataFrame({'SalesID': [1], 'ProductID': [10], 'CustomerID': [100],
+                           'Quantity': pd.Series(invalidas, dtype=object), 'TotalPrice': [Decimal('1.00')]})
+        with pytest.raises(ValueError):
+            Venta.desde_dataframe(df)